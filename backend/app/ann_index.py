@@ -0,0 +1,180 @@
+"""
+In-memory nearest-neighbour index over embedding vectors.
+
+Vectors are L2-normalized and stored in a single contiguous matrix so a query is one
+matrix-vector product plus a partial sort. When faiss is installed and the index grows
+past HNSW_MIN_SIZE, an approximate HNSW graph is built lazily and used instead.
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import logging
+import numpy as np
+
+# faiss is optional: without it the index falls back to exact numpy search
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+logger = logging.getLogger("job_search_app.ann_index")
+
+# Below this many vectors an exact dot-product scan is faster than maintaining a graph
+HNSW_MIN_SIZE = 50000
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize embedding vectors row-wise, leaving zero vectors untouched
+
+    Args:
+        vectors: 1-D or 2-D array of embeddings
+
+    Returns:
+        2-D float32 array of unit-length rows
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+class VectorIndex:
+    """
+    A cosine-similarity index mapping arbitrary hashable ids to embedding vectors
+    """
+
+    def __init__(self, hnsw_min_size: int = HNSW_MIN_SIZE):
+        """
+        Initialize the VectorIndex
+
+        Args:
+            hnsw_min_size: Number of vectors from which a faiss HNSW graph is used, if faiss is installed
+        """
+        self.ids: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._pending: List[np.ndarray] = []
+        self.hnsw_min_size = hnsw_min_size
+        self._hnsw = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self._positions
+
+    def _consolidate(self) -> np.ndarray:
+        """Fold vectors added since the last search into the contiguous matrix"""
+        if self._pending:
+            blocks = ([self._matrix] if self._matrix.size else []) + self._pending
+            self._matrix = np.vstack(blocks)
+            self._pending = []
+            self._hnsw = None
+        return self._matrix
+
+    def add(self, ids: Sequence[Hashable], vectors: np.ndarray) -> None:
+        """
+        Add or replace vectors
+
+        Args:
+            ids: Identifier for each vector
+            vectors: Array of shape (len(ids), dim)
+        """
+        if len(ids) == 0:
+            return
+        vectors = normalize_rows(vectors)
+        replaced = [item_id for item_id in ids if item_id in self._positions]
+        if replaced:
+            self.remove(replaced)
+        for item_id in ids:
+            self._positions[item_id] = len(self.ids)
+            self.ids.append(item_id)
+        self._pending.append(vectors)
+
+    def remove(self, ids: Sequence[Hashable]) -> None:
+        """
+        Remove vectors by id, ignoring unknown ids
+
+        Args:
+            ids: Identifiers to remove
+        """
+        drop = {self._positions[item_id] for item_id in ids if item_id in self._positions}
+        if not drop:
+            return
+        matrix = self._consolidate()
+        keep = [i for i in range(len(self.ids)) if i not in drop]
+        self._matrix = matrix[keep] if keep else np.zeros((0, matrix.shape[1]), dtype=np.float32)
+        self.ids = [self.ids[i] for i in keep]
+        self._positions = {item_id: i for i, item_id in enumerate(self.ids)}
+        self._hnsw = None
+
+    def get(self, item_id: Hashable) -> Optional[np.ndarray]:
+        """
+        Get the normalized vector stored for an id
+
+        Args:
+            item_id: Identifier of the vector
+
+        Returns:
+            The vector or None if the id is unknown
+        """
+        if item_id not in self._positions:
+            return None
+        return self._consolidate()[self._positions[item_id]]
+
+    def _get_hnsw(self, matrix: np.ndarray):
+        """Build the faiss HNSW graph on demand when the index is large enough"""
+        if faiss is None or len(matrix) < self.hnsw_min_size:
+            return None
+        if self._hnsw is None:
+            logger.info(f"Building HNSW index over {len(matrix)} vectors")
+            index = faiss.IndexHNSWFlat(matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+            index.add(matrix)
+            self._hnsw = index
+        return self._hnsw
+
+    def search(self, query: np.ndarray, top_k: int = 5) -> List[Tuple[Hashable, float]]:
+        """
+        Find the vectors most similar to a query
+
+        Args:
+            query: Query embedding
+            top_k: Number of results to return
+
+        Returns:
+            List of (id, cosine similarity) tuples sorted by similarity
+        """
+        return self.search_many(np.atleast_2d(query), top_k)[0]
+
+    def search_many(self, queries: np.ndarray, top_k: int = 5) -> List[List[Tuple[Hashable, float]]]:
+        """
+        Find the vectors most similar to each of several queries
+
+        Args:
+            queries: Array of query embeddings, one per row
+            top_k: Number of results to return per query
+
+        Returns:
+            One list of (id, cosine similarity) tuples per query
+        """
+        matrix = self._consolidate()
+        queries = normalize_rows(queries)
+        top_k = min(top_k, len(self.ids))
+        if top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        hnsw = self._get_hnsw(matrix)
+        if hnsw is not None:
+            scores, positions = hnsw.search(queries, top_k)
+            return [
+                [(self.ids[p], float(s)) for s, p in zip(row_scores, row_positions) if p >= 0]
+                for row_scores, row_positions in zip(scores, positions)
+            ]
+
+        scores = queries @ matrix.T
+        if top_k < len(self.ids):
+            positions = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            positions = np.tile(np.arange(len(self.ids)), (len(queries), 1))
+        results = []
+        for row, row_positions in enumerate(positions):
+            ordered = sorted(row_positions, key=lambda p: scores[row, p], reverse=True)
+            results.append([(self.ids[p], float(scores[row, p])) for p in ordered])
+        return results
@@ -0,0 +1,209 @@
+"""
+Bulk resume ingestion.
+
+A batch upload is a mix of ZIP archives and individual resume files. Archive members are read
+straight from the uploaded archive, without extracting it to disk first, and every resume is
+stored content-addressed, so a resume appearing twice in a batch (or uploaded before) is
+recognised by its hash. Resumes are then parsed in a pool of worker processes, which is
+where the time goes for large batches: text extraction and spaCy skill extraction are CPU-bound.
+"""
+
+import os
+import zipfile
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .upload_store import store_bytes, MAX_UPLOAD_BYTES
+from .extractors import supported_extensions
+
+logger = logging.getLogger("job_search_app.batch_ingest")
+
+# Resumes accepted per batch
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "1000"))
+# Largest accepted batch request, all files together; rejected while it is received
+BATCH_MAX_UPLOAD_BYTES = int(os.getenv("BATCH_MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+BATCH_PARSE_WORKERS = int(os.getenv("BATCH_PARSE_WORKERS", str(os.cpu_count() or 1)))
+RESUME_EXTENSIONS = set(supported_extensions())
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+class BatchTooLargeError(Exception):
+    """Raised when a batch exceeds the number of resumes accepted"""
+
+def is_zip(fileobj: BinaryIO) -> bool:
+    """
+    Check whether a file is a ZIP archive by its magic bytes, leaving its position unchanged
+
+    Args:
+        fileobj: Seekable binary file
+
+    Returns:
+        True if the file starts with a ZIP local file header
+    """
+    position = fileobj.tell()
+    try:
+        return fileobj.read(4) == b"PK\x03\x04"
+    finally:
+        fileobj.seek(position)
+
+def _read_capped(fileobj: BinaryIO, max_bytes: int) -> Optional[bytes]:
+    """Read a file, or return None if it is larger than max_bytes (declared sizes are not trusted)."""
+    data = fileobj.read(max_bytes + 1)
+    return None if len(data) > max_bytes else data
+
+def iter_upload_members(
+    filename: str,
+    fileobj: BinaryIO,
+    max_member_bytes: int = MAX_UPLOAD_BYTES
+) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Resume files of one uploaded file: the members of a ZIP archive, or the file itself
+
+    Args:
+        filename: Name of the uploaded file
+        fileobj: Seekable binary file with its content
+        max_member_bytes: Largest accepted resume
+
+    Yields:
+        Tuples of (file name, content, None), or (file name, None, reason) for skipped files
+    """
+    if not is_zip(fileobj):
+        if Path(filename or "").suffix.lower() not in RESUME_EXTENSIONS:
+            yield filename, None, "unsupported file type"
+            return
+        data = _read_capped(fileobj, max_member_bytes)
+        yield (filename, data, None) if data is not None else (filename, None, "file too large")
+        return
+
+    with zipfile.ZipFile(fileobj) as archive:
+        for info in archive.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                continue
+            if Path(name).suffix.lower() not in RESUME_EXTENSIONS:
+                yield name, None, "unsupported file type"
+                continue
+            if info.file_size > max_member_bytes:
+                yield name, None, "file too large"
+                continue
+            with archive.open(info) as member:
+                data = _read_capped(member, max_member_bytes)
+            yield (name, data, None) if data is not None else (name, None, "file too large")
+
+def collect_resumes(
+    uploads: List[Tuple[str, BinaryIO]],
+    upload_dir: Path,
+    max_member_bytes: int = MAX_UPLOAD_BYTES,
+    max_resumes: int = BATCH_MAX_RESUMES
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Store the resumes of a batch upload, one copy per distinct content
+
+    Args:
+        uploads: (file name, binary file) of every uploaded file
+        upload_dir: Directory resumes are stored in
+        max_member_bytes: Largest accepted resume
+        max_resumes: Largest number of distinct resumes accepted
+
+    Returns:
+        Dictionary with 'resumes' (the stored distinct resumes, see store_bytes), 'duplicates'
+        (file name and hash of resumes whose content appeared earlier in the batch) and
+        'skipped' (file name and reason)
+
+    Raises:
+        BatchTooLargeError: If the batch holds more than max_resumes distinct resumes
+        zipfile.BadZipFile: If an archive is corrupted
+    """
+    collected: Dict[str, List[Dict[str, Any]]] = {"resumes": [], "duplicates": [], "skipped": []}
+    hashes = set()
+    for upload_name, fileobj in uploads:
+        for name, data, reason in iter_upload_members(upload_name, fileobj, max_member_bytes):
+            if data is None:
+                collected["skipped"].append({"filename": name, "reason": reason})
+                continue
+            stored = store_bytes(data, name, upload_dir)
+            if stored["sha256"] in hashes:
+                collected["duplicates"].append({"filename": name, "sha256": stored["sha256"]})
+                continue
+            if len(hashes) >= max_resumes:
+                raise BatchTooLargeError(f"A batch may contain at most {max_resumes} resumes")
+            hashes.add(stored["sha256"])
+            collected["resumes"].append(stored)
+    logger.info(
+        f"Collected {len(collected['resumes'])} resumes, {len(collected['duplicates'])} duplicates, "
+        f"{len(collected['skipped'])} skipped"
+    )
+    return collected
+
+def _init_worker() -> None:
+    # Documents are already parsed in parallel; don't fan out again per PDF
+    from . import pdf_extraction
+    pdf_extraction.PDF_EXTRACT_WORKERS = 1
+
+def parse_resume(file_path: str) -> Dict[str, Any]:
+    """
+    Extract the text and skills of a stored resume (runs in a worker process)
+
+    Args:
+        file_path: Path of the resume
+
+    Returns:
+        Dictionary with 'text' and 'skills', or 'error' if parsing failed
+    """
+    from .resume_parser import extract_text, extract_skills
+    try:
+        text = extract_text(file_path)
+        if not text:
+            return {"error": "No text could be extracted. The file may be empty or corrupted."}
+        return {"text": text, "skills": extract_skills(text)}
+    except Exception as e:
+        return {"error": str(e)}
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Workers start from a fresh interpreter, not a fork of the app with its models and threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker)
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Shut down a broken pool without waiting for it, so the next batch starts a new one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def parse_resumes(file_paths: List[str], workers: int = BATCH_PARSE_WORKERS) -> List[Dict[str, Any]]:
+    """
+    Parse resumes in parallel worker processes
+
+    Args:
+        file_paths: Paths of the resumes
+        workers: Worker processes; 1 parses in the calling process
+
+    Returns:
+        One parse_resume result per path, in order
+
+    Raises:
+        BrokenProcessPool: If a worker process died (e.g. killed for running out of memory);
+            the pool is replaced for the next call
+    """
+    if workers <= 1 or len(file_paths) <= 1:
+        return [parse_resume(path) for path in file_paths]
+    pool = _get_pool(workers)
+    try:
+        return list(pool.map(parse_resume, file_paths, chunksize=max(1, len(file_paths) // (workers * 4))))
+    except BrokenProcessPool:
+        logger.error("A resume parsing worker died, replacing the pool")
+        _discard_pool(pool)
+        raise
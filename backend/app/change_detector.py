@@ -0,0 +1,218 @@
+"""
+Change detection for re-scraped job boards.
+
+Every listing of a board (the source, e.g. a search results URL) is fingerprinted by its URL
+and a hash of its content and stored in SQLite together with its embedding. Re-scraping the
+board is then diffed against the stored fingerprints: only new or changed listings need to be
+embedded, feature-extracted and written to the vector store, unchanged listings reuse their
+stored embedding, and listings that disappeared are marked expired.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .paths import data_path
+from .utils import normalize_url
+
+logger = logging.getLogger("job_search_app.change_detector")
+
+CHANGE_DETECTOR_PATH = os.getenv("CHANGE_DETECTOR_PATH", data_path("listings.sqlite3"))
+
+def listing_fingerprint(job: Dict[str, Any], source: str = "") -> Tuple[str, str]:
+    """
+    Fingerprint a scraped listing
+
+    Args:
+        job: Job dictionary with 'url', 'title', 'company', 'location' and 'description'
+        source: URL of the board the listing was scraped from
+
+    Returns:
+        Tuple of (listing key, content hash). The key is the normalized listing URL, or a hash
+        of title, company and location when the parser only had the board URL to offer.
+    """
+    url = job.get("url") or ""
+    key = normalize_url(url) if url else ""
+    if not key or (source and key == normalize_url(source)):
+        identity = "|".join(" ".join(str(job.get(field) or "").lower().split()) for field in ("title", "company", "location"))
+        key = "listing:" + hashlib.sha1(identity.encode("utf-8")).hexdigest()
+    content = "\n".join(" ".join(str(job.get(field) or "").split()) for field in ("title", "company", "location", "description"))
+    return key, hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+class ChangeDetector:
+    """
+    Per-source fingerprints, embeddings and expiry state of scraped listings, persisted in SQLite
+    """
+
+    def __init__(self, path: str = CHANGE_DETECTOR_PATH):
+        """
+        Initialize the ChangeDetector
+
+        Args:
+            path: Path of the SQLite file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS listings ("
+                " source TEXT, listing_key TEXT, content_hash TEXT, job TEXT,"
+                " embedding BLOB, embedding_signature TEXT, first_seen REAL, last_seen REAL,"
+                " expired INTEGER DEFAULT 0, PRIMARY KEY (source, listing_key))"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def apply(self, source: str, jobs: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """
+        Diff a fresh scrape of a source against the stored fingerprints and record it
+
+        New and changed listings are stored (changed ones lose their stale embedding),
+        unchanged ones are touched, and stored listings missing from the scrape are marked expired.
+
+        Args:
+            source: URL of the scraped board
+            jobs: The listings scraped from it
+
+        Returns:
+            Dictionary with 'new', 'changed' and 'unchanged' lists of jobs and a 'removed' list
+            of the stored job dictionaries that expired
+        """
+        source_key = normalize_url(source)
+        now = time.time()
+        changes: Dict[str, List[Any]] = {"new": [], "changed": [], "unchanged": [], "removed": []}
+        with self._lock, self._connect() as conn:
+            stored = {
+                key: (content_hash, expired)
+                for key, content_hash, expired in conn.execute(
+                    "SELECT listing_key, content_hash, expired FROM listings WHERE source = ?", (source_key,)
+                )
+            }
+            seen = set()
+            for job in jobs:
+                key, content_hash = listing_fingerprint(job, source)
+                if key in seen:
+                    continue
+                seen.add(key)
+                previous = stored.get(key)
+                if previous is None:
+                    changes["new"].append(job)
+                    conn.execute(
+                        "INSERT INTO listings (source, listing_key, content_hash, job, first_seen, last_seen, expired)"
+                        " VALUES (?, ?, ?, ?, ?, ?, 0)",
+                        (source_key, key, content_hash, json.dumps(job), now, now)
+                    )
+                elif previous[0] != content_hash:
+                    changes["changed"].append(job)
+                    conn.execute(
+                        "UPDATE listings SET content_hash = ?, job = ?, embedding = NULL, embedding_signature = NULL,"
+                        " last_seen = ?, expired = 0 WHERE source = ? AND listing_key = ?",
+                        (content_hash, json.dumps(job), now, source_key, key)
+                    )
+                else:
+                    changes["unchanged"].append(job)
+                    conn.execute(
+                        "UPDATE listings SET last_seen = ?, expired = 0 WHERE source = ? AND listing_key = ?",
+                        (now, source_key, key)
+                    )
+
+            removed_keys = [key for key, (_, expired) in stored.items() if key not in seen and not expired]
+            for key in removed_keys:
+                row = conn.execute(
+                    "SELECT job FROM listings WHERE source = ? AND listing_key = ?", (source_key, key)
+                ).fetchone()
+                changes["removed"].append(json.loads(row[0]))
+                conn.execute(
+                    "UPDATE listings SET expired = 1 WHERE source = ? AND listing_key = ?", (source_key, key)
+                )
+
+        logger.info(
+            f"Changes for {source_key}: {len(changes['new'])} new, {len(changes['changed'])} changed, "
+            f"{len(changes['unchanged'])} unchanged, {len(changes['removed'])} removed"
+        )
+        return changes
+
+    def get_embeddings(self, source: str, jobs: List[Dict[str, Any]], signature: str) -> List[Optional[np.ndarray]]:
+        """
+        Stored embeddings of listings, for reuse when their content is unchanged
+
+        Args:
+            source: URL of the scraped board
+            jobs: The listings
+            signature: Identifies the embedding model and pooling; other signatures are ignored
+
+        Returns:
+            One embedding or None per job
+        """
+        source_key = normalize_url(source)
+        keys = [listing_fingerprint(job, source) for job in jobs]
+        with self._lock, self._connect() as conn:
+            rows = {
+                key: (content_hash, embedding)
+                for key, content_hash, embedding in conn.execute(
+                    "SELECT listing_key, content_hash, embedding FROM listings"
+                    " WHERE source = ? AND embedding IS NOT NULL AND embedding_signature = ?",
+                    (source_key, signature)
+                )
+            }
+        embeddings = []
+        for key, content_hash in keys:
+            row = rows.get(key)
+            if row is None or row[0] != content_hash:
+                embeddings.append(None)
+            else:
+                embeddings.append(np.frombuffer(row[1], dtype=np.float32))
+        return embeddings
+
+    def store_embeddings(self, source: str, jobs: List[Dict[str, Any]], embeddings: np.ndarray, signature: str) -> None:
+        """
+        Store the embeddings computed for listings
+
+        Args:
+            source: URL of the scraped board
+            jobs: The listings
+            embeddings: One embedding per job
+            signature: Identifies the embedding model and pooling
+        """
+        source_key = normalize_url(source)
+        with self._lock, self._connect() as conn:
+            for job, embedding in zip(jobs, embeddings):
+                key, content_hash = listing_fingerprint(job, source)
+                conn.execute(
+                    "UPDATE listings SET embedding = ?, embedding_signature = ?"
+                    " WHERE source = ? AND listing_key = ? AND content_hash = ?",
+                    (np.asarray(embedding, dtype=np.float32).tobytes(), signature, source_key, key, content_hash)
+                )
+
+    def active_jobs(self, source: str) -> List[Dict[str, Any]]:
+        """
+        Listings of a source that were present in its latest scrape
+
+        Args:
+            source: URL of the scraped board
+
+        Returns:
+            List of job dictionaries
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job FROM listings WHERE source = ? AND expired = 0 ORDER BY first_seen",
+                (normalize_url(source),)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
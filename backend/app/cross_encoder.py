@@ -1,10 +1,7 @@
-from sentence_transformers import CrossEncoder
 import numpy as np
+from .models import get_model
 
-# Load a cross-encoder model for re-ranking, always using GPU if available
-import torch
-device = "cuda" if torch.cuda.is_available() else "cpu"
-cross_encoder = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2', device=device)
+# The cross-encoder model for re-ranking is loaded on first use, on GPU if available (see models.py)
 
 def rerank_with_cross_encoder(query: str, jobs: list, top_k: int = 5):
     """
@@ -17,7 +14,7 @@ def rerank_with_cross_encoder(query: str, jobs: list, top_k: int = 5):
         List of (score, job) tuples, sorted by score descending.
     """
     pairs = [(query, job['description']) for job in jobs]
-    scores = cross_encoder.predict(pairs)
+    scores = get_model("cross_encoder").predict(pairs)
     scored_jobs = list(zip(scores, jobs))
     scored_jobs.sort(reverse=True, key=lambda x: x[0])
     return scored_jobs[:top_k]
@@ -0,0 +1,419 @@
+"""
+Cross-source deduplication of job listings.
+
+The same posting scraped from LinkedIn, Indeed and the company career page is recognised
+before embedding and collapsed into one record whose sources are merged. Exact matches
+short-circuit on the normalized URL or a canonical job ID parsed from it (LinkedIn
+/jobs/view/<id>, Indeed jk, Greenhouse gh_jid, Lever posting ID); everything else goes
+through MinHash signatures over word shingles of title, company and description, bucketed
+with LSH so a lookup only compares against a handful of candidates. Two listings carrying
+different job IDs of the same board, titles of different seniority or different cities are
+never merged. The index is persisted one posting per row in SQLite, so a posting keeps the
+same dedup_id across scrapes, boards and worker processes; postings not seen for
+DEDUP_INDEX_TTL_DAYS are evicted, and at most DEDUP_INDEX_MAX_ENTRIES are kept.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import zlib
+import heapq
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .paths import data_path
+from .utils import normalize_url
+
+logger = logging.getLogger("job_search_app.dedup")
+
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", data_path("dedup_index.sqlite3"))
+# JSON index of earlier versions, imported once into an empty SQLite index
+LEGACY_DEDUP_INDEX_FILE = data_path("dedup_index.json")
+# Estimated Jaccard similarity of shingles above which two listings are the same posting
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+# Postings not scraped again for this long are forgotten, and the index keeps at most
+# DEDUP_INDEX_MAX_ENTRIES postings (least recently seen evicted first), on disk and in memory
+DEDUP_INDEX_TTL_DAYS = float(os.getenv("DEDUP_INDEX_TTL_DAYS", "30"))
+DEDUP_INDEX_MAX_ENTRIES = int(os.getenv("DEDUP_INDEX_MAX_ENTRIES", "100000"))
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs above ~0.5 similarity become candidates with high probability
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+# Minimum word overlap of the titles, so boilerplate-heavy postings of one company stay apart
+TITLE_THRESHOLD = 0.5
+# Title words that make otherwise identical postings different roles
+SENIORITY_WORDS = {"intern", "junior", "jr", "associate", "senior", "sr", "staff", "principal", "lead", "head", "i", "ii", "iii", "iv"}
+
+_MERSENNE_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 2**32 - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 2**32 - 1, size=NUM_PERM, dtype=np.uint64)
+
+_CANONICAL_PATTERNS = [
+    ("linkedin", re.compile(r"linkedin\.com/jobs/view/(?:[^/]*-)?(\d+)")),
+    ("greenhouse", re.compile(r"greenhouse\.io/[^/]+/jobs/(\d+)")),
+    ("lever", re.compile(r"jobs\.lever\.co/[^/]+/([0-9a-f-]{36})")),
+]
+_CANONICAL_PARAMS = [("linkedin", "currentjobid"), ("indeed", "jk"), ("indeed", "vjk"), ("greenhouse", "gh_jid")]
+
+def canonical_job_id(url: str) -> Optional[str]:
+    """
+    Extract a board-specific job ID from a listing URL
+
+    Args:
+        url: URL of the listing
+
+    Returns:
+        ID such as "linkedin:123456" or None if the URL has no recognised ID
+    """
+    if not url:
+        return None
+    lowered = url.lower()
+    for board, pattern in _CANONICAL_PATTERNS:
+        match = pattern.search(lowered)
+        if match:
+            return f"{board}:{match.group(1)}"
+    params = {key.lower(): values for key, values in parse_qs(urlsplit(url).query).items()}
+    for board, param in _CANONICAL_PARAMS:
+        if params.get(param):
+            return f"{board}:{params[param][0]}"
+    return None
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+def job_shingles(job: Dict[str, Any]) -> Set[str]:
+    """
+    Word shingles of a listing's title, company and description
+
+    Args:
+        job: Job dictionary
+
+    Returns:
+        Set of space-joined SHINGLE_SIZE-word shingles
+    """
+    words = _words(f"{job.get('title', '')} {job.get('company', '')} {job.get('description', '')}")
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minhash_signature(shingles: Set[str]) -> np.ndarray:
+    """
+    MinHash signature of a set of shingles
+
+    Args:
+        shingles: Set of shingles
+
+    Returns:
+        Array of NUM_PERM uint64 minimum hash values
+    """
+    if not shingles:
+        return np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    hashes = np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64)
+    # (a * x + b) mod p for every permutation and shingle; a * x + b stays below 2**64
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+def _title_similarity(a: str, b: str) -> float:
+    words_a, words_b = set(_words(a)), set(_words(b))
+    if not words_a or not words_b:
+        return 1.0
+    if words_a & SENIORITY_WORDS != words_b & SENIORITY_WORDS:
+        # "Senior Backend Engineer" and "Backend Engineer" are two openings
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+def _city(location: Optional[str]) -> str:
+    """Normalized city of a location ("Austin, TX" -> "austin"), or "" if unknown"""
+    return " ".join(_words((location or "").split(",")[0]))
+
+def _conflicting_locations(city: str, other_city: Optional[str]) -> bool:
+    """Whether two listings are in different cities; unknown locations never conflict"""
+    # The same role posted for two cities is two openings, however similar their text
+    return bool(city and other_city and city != other_city)
+
+def _conflicting_ids(canonical_id: Optional[str], canonical_ids: List[str]) -> bool:
+    """Whether a record already holds a different job ID of the same board"""
+    if not canonical_id:
+        return False
+    board = canonical_id.split(":", 1)[0]
+    return any(other != canonical_id and other.split(":", 1)[0] == board for other in canonical_ids)
+
+class DedupIndex:
+    """
+    A persistent index of job postings seen across sources, assigning each posting a stable dedup_id
+    """
+
+    def __init__(self, path: str = DEDUP_INDEX_PATH, threshold: float = DEDUP_THRESHOLD,
+                 legacy_file: Optional[str] = LEGACY_DEDUP_INDEX_FILE,
+                 ttl_days: float = DEDUP_INDEX_TTL_DAYS, max_entries: int = DEDUP_INDEX_MAX_ENTRIES):
+        """
+        Initialize the DedupIndex
+
+        Args:
+            path: Path of the SQLite file shared by every worker
+            threshold: Estimated Jaccard similarity above which listings are duplicates
+            legacy_file: JSON index to import if the SQLite index is empty
+            ttl_days: Days after which a posting that was not seen again is evicted
+            max_entries: Maximum number of postings kept
+        """
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self._last_seen: Dict[str, float] = {}
+        self._by_url: Dict[str, str] = {}
+        self._by_canonical: Dict[str, str] = {}
+        self._buckets: Dict[tuple, List[str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._dirty: Set[str] = set()
+        self._last_rowid = 0
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS postings (dedup_id TEXT PRIMARY KEY, record TEXT, last_seen REAL)")
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(postings)")]
+                if "last_seen" not in columns:
+                    # Index written before eviction: its postings count as seen now
+                    conn.execute("ALTER TABLE postings ADD COLUMN last_seen REAL")
+                    conn.execute("UPDATE postings SET last_seen = ?", (time.time(),))
+                conn.execute("CREATE INDEX IF NOT EXISTS postings_last_seen ON postings (last_seen)")
+        except Exception as e:
+            logger.error(f"Error opening dedup index: {str(e)}")
+
+        # Load the postings indexed so far
+        with self._lock:
+            self._refresh()
+            if not self.records and legacy_file and os.path.exists(legacy_file):
+                self._import_legacy(legacy_file)
+            self._evict()
+
+        logger.info(f"DedupIndex initialized with {len(self.records)} postings")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps the index safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _refresh(self) -> None:
+        """Load the postings written since the last refresh, including other workers'; call with the lock held"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT rowid, dedup_id, record, last_seen FROM postings WHERE rowid > ? AND last_seen >= ? ORDER BY rowid",
+                    (self._last_rowid, time.time() - self.ttl)
+                ).fetchall()
+            for rowid, dedup_id, record, last_seen in rows:
+                record = json.loads(record)
+                self._last_seen[dedup_id] = max(last_seen, self._last_seen.get(dedup_id, 0.0))
+                known = self.records.get(dedup_id)
+                if known is not None:
+                    # Keep the URLs and IDs this worker added but has not saved yet
+                    record["urls"] = list(dict.fromkeys(record["urls"] + known["urls"]))
+                    record["canonical_ids"] = list(dict.fromkeys(record["canonical_ids"] + known["canonical_ids"]))
+                self._index_record(dedup_id, record, np.array(record["signature"], dtype=np.uint64))
+                self._last_rowid = max(self._last_rowid, rowid)
+        except Exception as e:
+            logger.error(f"Error loading dedup index: {str(e)}")
+
+    def _import_legacy(self, legacy_file: str) -> None:
+        """Import the postings of a JSON index written by earlier versions; call with the lock held"""
+        try:
+            with open(legacy_file, 'r') as f:
+                records = json.load(f)
+            for dedup_id, record in records.items():
+                self._index_record(dedup_id, record, np.array(record["signature"], dtype=np.uint64))
+                self._last_seen[dedup_id] = time.time()
+                self._dirty.add(dedup_id)
+            self._save_dirty()
+            logger.info(f"Imported {len(records)} postings from {legacy_file}")
+        except Exception as e:
+            logger.error(f"Error importing dedup index from {legacy_file}: {str(e)}")
+
+    def _save_dirty(self) -> None:
+        """Write the postings changed or seen since the last save, then evict old ones; call with the lock held"""
+        if not self._dirty:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO postings VALUES (?, ?, ?)",
+                    [(dedup_id, json.dumps(self.records[dedup_id]), self._last_seen[dedup_id])
+                     for dedup_id in self._dirty if dedup_id in self.records]
+                )
+                conn.execute("DELETE FROM postings WHERE last_seen < ?", (time.time() - self.ttl,))
+                conn.execute(
+                    "DELETE FROM postings WHERE dedup_id IN ("
+                    " SELECT dedup_id FROM postings ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._dirty.clear()
+        except Exception as e:
+            logger.error(f"Error saving dedup index: {str(e)}")
+
+    def _evict(self) -> None:
+        """Drop expired and least recently seen postings from memory; call with the lock held"""
+        cutoff = time.time() - self.ttl
+        expired = [dedup_id for dedup_id, last_seen in self._last_seen.items() if last_seen < cutoff]
+        excess = len(self._last_seen) - len(expired) - self.max_entries
+        if excess > 0:
+            kept = ((last_seen, dedup_id) for dedup_id, last_seen in self._last_seen.items() if last_seen >= cutoff)
+            expired += [dedup_id for _, dedup_id in heapq.nsmallest(excess, kept)]
+        for dedup_id in expired:
+            self._unindex_record(dedup_id)
+
+    def _unindex_record(self, dedup_id: str) -> None:
+        record = self.records.pop(dedup_id)
+        signature = self._signatures.pop(dedup_id)
+        self._last_seen.pop(dedup_id, None)
+        self._dirty.discard(dedup_id)
+        for url_key in record["urls"]:
+            if self._by_url.get(url_key) == dedup_id:
+                del self._by_url[url_key]
+        for canonical_id in record["canonical_ids"]:
+            if self._by_canonical.get(canonical_id) == dedup_id:
+                del self._by_canonical[canonical_id]
+        for band in range(LSH_BANDS):
+            key = (band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+            bucket = self._buckets.get(key)
+            if bucket and dedup_id in bucket:
+                bucket.remove(dedup_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _index_record(self, dedup_id: str, record: Dict[str, Any], signature: np.ndarray) -> None:
+        self.records[dedup_id] = record
+        self._signatures[dedup_id] = signature
+        for url_key in record["urls"]:
+            self._by_url[url_key] = dedup_id
+        for canonical_id in record["canonical_ids"]:
+            self._by_canonical[canonical_id] = dedup_id
+        for band in range(LSH_BANDS):
+            key = (band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+            bucket = self._buckets.setdefault(key, [])
+            if dedup_id not in bucket:
+                bucket.append(dedup_id)
+
+    def _find(self, url_key: Optional[str], canonical_id: Optional[str], title: str, city: str,
+              signature: np.ndarray) -> Optional[str]:
+        if url_key and url_key in self._by_url:
+            return self._by_url[url_key]
+        if canonical_id and canonical_id in self._by_canonical:
+            return self._by_canonical[canonical_id]
+        if signature[0] == np.iinfo(np.uint64).max:
+            # Listings without any text only match exactly
+            return None
+        candidates = set()
+        for band in range(LSH_BANDS):
+            candidates.update(self._buckets.get((band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()), []))
+        best_id, best_similarity = None, self.threshold
+        for dedup_id in candidates:
+            record = self.records[dedup_id]
+            if _conflicting_ids(canonical_id, record["canonical_ids"]):
+                # Two job IDs of one board are two postings, however similar their text
+                continue
+            if _conflicting_locations(city, record.get("city")):
+                continue
+            similarity = float(np.mean(self._signatures[dedup_id] == signature))
+            if similarity >= best_similarity and _title_similarity(title, record["title"]) >= TITLE_THRESHOLD:
+                best_id, best_similarity = dedup_id, similarity
+        return best_id
+
+    def assign(self, job: Dict[str, Any], source_url: Optional[str] = None) -> str:
+        """
+        Get the dedup_id of a listing, adding it to the index (call save() to persist)
+
+        Args:
+            job: Job dictionary with 'url', 'title', 'company' and 'description'
+            source_url: URL of the board the listing was scraped from; parsers fall back to it
+                when a listing has no link of its own, so it never identifies a posting
+
+        Returns:
+            The dedup_id shared by every listing of the same posting
+        """
+        url = job.get("url") or ""
+        url_key = normalize_url(url) if url else None
+        if url_key and source_url and url_key == normalize_url(source_url):
+            url, url_key = "", None
+        canonical_id = canonical_job_id(url)
+        title = job.get("title") or ""
+        city = _city(job.get("location"))
+        signature = minhash_signature(job_shingles(job))
+
+        dedup_id = self._find(url_key, canonical_id, title, city, signature)
+        if dedup_id is None:
+            dedup_id = uuid.uuid4().hex[:16]
+            record = {"title": title, "city": city, "urls": [], "canonical_ids": [], "signature": signature.tolist()}
+        else:
+            record = self.records[dedup_id]
+            signature = self._signatures[dedup_id]
+        if url_key and url_key not in record["urls"]:
+            record["urls"].append(url_key)
+        if canonical_id and canonical_id not in record["canonical_ids"]:
+            record["canonical_ids"].append(canonical_id)
+        if city and not record.get("city"):
+            record["city"] = city
+        self._index_record(dedup_id, record, signature)
+        self._last_seen[dedup_id] = time.time()
+        self._dirty.add(dedup_id)
+        return dedup_id
+
+    def save(self) -> None:
+        """Persist the postings changed since the last save"""
+        with self._lock:
+            self._save_dirty()
+
+    def deduplicate(self, jobs: List[Dict[str, Any]], source_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Collapse listings of the same posting into one record
+
+        The record keeps the fields of the listing with the longest description and gains
+        'dedup_id' and 'sources' (the URL and host of every collapsed listing).
+
+        Args:
+            jobs: Scraped job dictionaries, possibly from several boards
+            source_url: URL of the board the jobs were scraped from, if there is a single one
+
+        Returns:
+            One job dictionary per distinct posting, in order of first appearance
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            # Postings other workers indexed since the last call keep their dedup_id here too
+            self._refresh()
+            for job in jobs:
+                groups.setdefault(self.assign(job, source_url), []).append(job)
+            self._save_dirty()
+            self._evict()
+
+        unique = []
+        for dedup_id, group in groups.items():
+            best = max(group, key=lambda job: len(job.get("description") or ""))
+            merged = dict(best, dedup_id=dedup_id)
+            sources = []
+            for job in group:
+                for source in job.get("sources") or [{"url": job.get("url"), "site": urlsplit(job.get("url") or "").hostname}]:
+                    if source not in sources:
+                        sources.append(source)
+            merged["sources"] = sources
+            unique.append(merged)
+
+        if len(unique) < len(jobs):
+            logger.info(f"Collapsed {len(jobs)} listings into {len(unique)} distinct postings")
+        return unique
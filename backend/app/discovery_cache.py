@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, Any, Optional
+import logging
+
+from .paths import data_path
+
+logger = logging.getLogger("job_search_app.discovery_cache")
+
+# How long a discovered career page is trusted before discovery runs again for the company
+DISCOVERY_CACHE_TTL = int(os.getenv("DISCOVERY_CACHE_TTL", str(7 * 24 * 3600)))
+# Failed discoveries are retried sooner: the company may have published a career page since
+DISCOVERY_NEGATIVE_TTL = int(os.getenv("DISCOVERY_NEGATIVE_TTL", str(24 * 3600)))
+DISCOVERY_CACHE_FILE = os.getenv("DISCOVERY_CACHE_FILE", data_path("discovery_cache.json"))
+# Cache file of earlier versions, relative to the working directory; read if DISCOVERY_CACHE_FILE is missing
+LEGACY_DISCOVERY_CACHE_FILE = "./discovery_cache.json"
+
+def company_key(company_name: str) -> str:
+    """
+    Cache key of a company, insensitive to case and surrounding whitespace
+
+    Args:
+        company_name: Name of the company
+
+    Returns:
+        The normalized key
+    """
+    return " ".join((company_name or "").lower().split())
+
+class DiscoveryCache:
+    """
+    A persistent map from company to its discovered career page URL, so reruns of the
+    discovery pipeline skip the search and crawl steps for companies seen recently.
+
+    Each entry records the URL, how it was found (source), a confidence in [0, 1] and when.
+    Companies for which no career page was found get a negative entry (url None) with a
+    shorter TTL, so they are not searched again on every run either.
+    """
+
+    def __init__(
+        self,
+        storage_file: str = DISCOVERY_CACHE_FILE,
+        ttl: int = DISCOVERY_CACHE_TTL,
+        negative_ttl: int = DISCOVERY_NEGATIVE_TTL,
+        legacy_file: Optional[str] = LEGACY_DISCOVERY_CACHE_FILE
+    ):
+        """
+        Initialize the DiscoveryCache
+
+        Args:
+            storage_file: Path to a JSON file for persisting discovered career pages
+            ttl: Seconds a cached career page stays valid
+            negative_ttl: Seconds a failed discovery stays cached
+            legacy_file: Cache file loaded instead when storage_file does not exist yet
+        """
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.storage_file = storage_file
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+
+        # Try to load existing entries if the storage file exists
+        self._load_from_disk(legacy_file)
+
+        logger.info(f"DiscoveryCache initialized with {len(self.entries)} companies")
+
+    def _load_from_disk(self, legacy_file: Optional[str] = None) -> None:
+        """Load cached career pages from disk if the storage file (or else the legacy file) exists"""
+        try:
+            for path in (self.storage_file, legacy_file):
+                if path and os.path.exists(path):
+                    with open(path, 'r') as f:
+                        self.entries = json.load(f)
+                    logger.info(f"Loaded {len(self.entries)} career pages from {path}")
+                    break
+        except Exception as e:
+            logger.error(f"Error loading discovery cache from disk: {str(e)}")
+
+    def save(self) -> None:
+        """Save cached career pages to disk"""
+        try:
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(os.path.abspath(self.storage_file)), exist_ok=True)
+
+            # Write to a temporary file of our own first, so an interrupted run never leaves a
+            # truncated cache and concurrent saves never interleave
+            with self._lock:
+                tmp_file = f"{self.storage_file}.{os.getpid()}.tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(dict(self.entries), f)
+                os.replace(tmp_file, self.storage_file)
+        except Exception as e:
+            logger.error(f"Error saving discovery cache to disk: {str(e)}")
+
+    def get(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached discovery result of a company if it has not expired
+
+        Args:
+            company_name: Name of the company
+
+        Returns:
+            Entry with url (None for a negative entry), source, confidence and timestamp,
+            or None on a miss or expired entry
+        """
+        entry = self.entries.get(company_key(company_name))
+        if not entry:
+            return None
+        ttl = self.ttl if entry.get("url") else self.negative_ttl
+        if time.time() - entry["timestamp"] > ttl:
+            return None
+        return entry
+
+    def set(self, company_name: str, career_url: str, source: str, confidence: float = 1.0) -> None:
+        """
+        Cache the career page of a company. Call save() to persist.
+
+        Args:
+            company_name: Name of the company
+            career_url: The discovered career page URL
+            source: How the URL was found, e.g. "google" or "crawl"
+            confidence: Confidence in [0, 1] that the URL is the company's career page
+        """
+        self.entries[company_key(company_name)] = {
+            "url": career_url,
+            "source": source,
+            "confidence": round(confidence, 3),
+            "timestamp": time.time()
+        }
+
+    def set_negative(self, company_name: str) -> None:
+        """
+        Record that no career page could be found for a company. Call save() to persist.
+
+        Args:
+            company_name: Name of the company
+        """
+        self.entries[company_key(company_name)] = {
+            "url": None,
+            "source": None,
+            "confidence": 0.0,
+            "timestamp": time.time()
+        }
+
+    def invalidate(self, company_name: str) -> None:
+        """
+        Drop the cached result of a company, e.g. when its cached career page stops returning jobs.
+        Call save() to persist.
+
+        Args:
+            company_name: Name of the company
+        """
+        if self.entries.pop(company_key(company_name), None) is not None:
+            logger.info(f"Invalidated cached career page of {company_name}")
@@ -0,0 +1,147 @@
+"""
+In-process micro-batching embedding service.
+
+Concurrent tasks submit their texts to one request queue instead of running the model from
+their own threads. A dedicated thread takes the first pending request, waits up to
+max_wait_ms for more to arrive (up to max_batch_size texts), encodes them all in a single
+model call and resolves each caller's future with its own rows. Under concurrent load the model
+sees a few large batches, close to the throughput of one big batch, rather than many small
+batches that compete for the same cores.
+"""
+
+import os
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("job_search_app.embedding_service")
+
+# Texts coalesced into one model call (a single larger request is never split)
+EMBEDDING_BATCH_MAX_TEXTS = int(os.getenv("EMBEDDING_BATCH_MAX_TEXTS", "256"))
+# How long the first request of a micro-batch waits for others to join it
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+
+class EmbeddingService:
+    """
+    A request queue and worker thread that coalesces concurrent encode requests into micro-batches
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = EMBEDDING_BATCH_MAX_TEXTS,
+        max_wait_ms: float = EMBEDDING_BATCH_MAX_WAIT_MS
+    ):
+        """
+        Initialize the EmbeddingService; its thread starts with the first request
+
+        Args:
+            encode_fn: Function encoding a list of texts into one row per text
+            max_batch_size: Maximum number of texts coalesced into one call of encode_fn
+            max_wait_ms: Maximum time a request waits for others to join its batch
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[List[str], Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "texts": 0}
+        if hasattr(os, "register_at_fork"):
+            # A forked worker does not inherit the thread, it starts its own on first use
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-service", daemon=True)
+                self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Queue texts for encoding
+
+        Args:
+            texts: List of text strings
+
+        Returns:
+            Future resolving to the array of embeddings, one row per text
+        """
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.array([]))
+            return future
+        self._ensure_thread()
+        self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts, batched together with whatever other requests are pending
+
+        Args:
+            texts: List of text strings
+
+        Returns:
+            Numpy array of embeddings, one row per text
+        """
+        if threading.current_thread() is self._thread:
+            # Called from inside encode_fn: queueing would wait on ourselves
+            return self.encode_fn(texts)
+        return self.submit(texts).result()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters of the service
+
+        Returns:
+            Dictionary with the number of 'requests', model 'batches' and 'texts' encoded
+        """
+        return dict(self._stats)
+
+    def _collect(self) -> List[Tuple[List[str], Future]]:
+        """Block for the first request, then gather more until the batch is full or the wait is over."""
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                embeddings = np.asarray(self.encode_fn(texts))
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"Encoder returned {len(embeddings)} embeddings for {len(texts)} texts")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["texts"] += len(texts)
+            if len(batch) > 1:
+                logger.debug(f"Encoded {len(batch)} requests ({len(texts)} texts) in one batch")
+            start = 0
+            for request_texts, future in batch:
+                future.set_result(embeddings[start:start + len(request_texts)])
+                start += len(request_texts)
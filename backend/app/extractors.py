@@ -0,0 +1,344 @@
+"""
+Text extractors for resume files, keyed by MIME type.
+
+The MIME type of a file is sniffed from its first bytes (PDF, RTF, legacy Word, and the ZIP
+containers of DOCX and ODT are told apart by their content), so a resume with a wrong or
+missing extension is still read correctly; the extension only decides between text formats
+that look alike, such as Markdown and plain text. Extractors register themselves with
+register_extractor and import their libraries on first use, so adding a format costs nothing
+at startup. Text formats are read up to EXTRACT_MAX_CHARS characters.
+"""
+
+import os
+import re
+import codecs
+import zipfile
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List
+
+logger = logging.getLogger("job_search_app.extractors")
+
+# Text formats are read up to this many characters (PDFs have their own limits)
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "200000"))
+# RTF markup read per document: formatting and embedded pictures take far more room than the text
+EXTRACT_MAX_RTF_BYTES = int(os.getenv("EXTRACT_MAX_RTF_BYTES", str(20 * EXTRACT_MAX_CHARS)))
+SNIFF_BYTES = 8192
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+ODT = "application/vnd.oasis.opendocument.text"
+RTF = "application/rtf"
+HTML = "text/html"
+MARKDOWN = "text/markdown"
+TEXT = "text/plain"
+MSWORD = "application/msword"
+ZIP = "application/zip"
+BINARY = "application/octet-stream"
+
+# MIME type of each extension, used when the content alone is not conclusive
+EXTENSION_TYPES = {
+    ".pdf": PDF, ".docx": DOCX, ".odt": ODT, ".rtf": RTF, ".html": HTML, ".htm": HTML,
+    ".md": MARKDOWN, ".markdown": MARKDOWN, ".txt": TEXT, ".text": TEXT, ".doc": MSWORD
+}
+_TEXT_TYPES = {HTML, MARKDOWN, TEXT}
+
+_EXTRACTORS: Dict[str, Callable[[str], str]] = {}
+
+def register_extractor(mime_type: str) -> Callable:
+    """
+    Decorator registering a function as the text extractor of a MIME type
+
+    Args:
+        mime_type: The MIME type handled by the function, which takes a file path and returns text
+    """
+    def decorator(func: Callable[[str], str]) -> Callable[[str], str]:
+        _EXTRACTORS[mime_type] = func
+        return func
+    return decorator
+
+def supported_types() -> List[str]:
+    """MIME types with a registered extractor"""
+    return sorted(_EXTRACTORS)
+
+def supported_extensions() -> List[str]:
+    """File extensions of the MIME types with a registered extractor"""
+    return sorted(ext for ext, mime_type in EXTENSION_TYPES.items() if mime_type in _EXTRACTORS)
+
+def sniff_mime_type(file_path: str) -> str:
+    """
+    Determine the MIME type of a file from its content, using its extension for text formats
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        The MIME type, BINARY if it could not be determined
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+    ext_type = EXTENSION_TYPES.get(Path(file_path).suffix.lower())
+
+    if head.startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(b"{\\rtf"):
+        return RTF
+    if head.startswith(b"\xd0\xcf\x11\xe0"):
+        return MSWORD
+    if head.startswith(b"PK\x03\x04"):
+        return _sniff_zip(file_path)
+
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        head = head.decode("utf-16", errors="ignore").encode("utf-8")
+    if b"\x00" in head:
+        return BINARY
+    lowered = head.lstrip(codecs.BOM_UTF8).lstrip().lower()
+    if lowered.startswith((b"<!doctype html", b"<html")) or b"<body" in lowered:
+        return HTML
+    return ext_type if ext_type in _TEXT_TYPES else TEXT
+
+def _sniff_zip(file_path: str) -> str:
+    """Tell the ZIP-based document formats apart by their members."""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            if "mimetype" in names:
+                return archive.read("mimetype").decode("ascii", errors="ignore").strip()
+            if "word/document.xml" in names:
+                return DOCX
+    except zipfile.BadZipFile:
+        return BINARY
+    return ZIP
+
+def extract_text_from_file(file_path: str) -> str:
+    """
+    Extract text from a resume file of any supported format
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Extracted text
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    mime_type = sniff_mime_type(file_path)
+    extractor = _EXTRACTORS.get(mime_type)
+    if extractor is None:
+        raise ValueError(f"Unsupported file format: {mime_type} ({Path(file_path).suffix.lower() or 'no extension'})")
+    logger.info(f"Detected {mime_type} for {Path(file_path).name}")
+    return extractor(file_path)
+
+def _read_text(file_path: str, max_chars: int = EXTRACT_MAX_CHARS) -> str:
+    """Read up to max_chars characters of a text file, detecting a UTF-16 or UTF-8 BOM."""
+    with open(file_path, 'rb') as f:
+        head = f.read(4)
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = "utf-16"
+    else:
+        encoding = "utf-8-sig"
+    with open(file_path, 'r', encoding=encoding, errors="replace") as f:
+        return f.read(max_chars)
+
+@register_extractor(PDF)
+def extract_pdf(file_path: str) -> str:
+    from .pdf_extraction import extract_pdf_text
+    return extract_pdf_text(file_path)
+
+def _docx_block_text(block, paragraph_cls, table_cls, parent) -> List[str]:
+    """Text of a body element (paragraph or table) of a DOCX document, in document order."""
+    if block.tag.endswith("}p"):
+        return [paragraph_cls(block, parent).text]
+    if block.tag.endswith("}tbl"):
+        lines = []
+        for row in table_cls(block, parent).rows:
+            cells = []
+            for cell in row.cells:
+                # Merged cells repeat the same cell for every grid column they span
+                if not cells or cell._tc is not cells[-1]._tc:
+                    cells.append(cell)
+            lines.append("\t".join(cell.text.strip() for cell in cells))
+        return lines
+    return []
+
+@register_extractor(DOCX)
+def extract_docx(file_path: str) -> str:
+    import docx
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = docx.Document(file_path)
+    seen_parts = set()
+
+    def part_lines(parts) -> List[str]:
+        # Headers and footers are shared between sections unless redefined; read each part once
+        lines = []
+        for part in parts:
+            if not part.is_linked_to_previous and id(part.part) not in seen_parts:
+                seen_parts.add(id(part.part))
+                for block in part._element.iterchildren():
+                    lines.extend(_docx_block_text(block, Paragraph, Table, part))
+        return lines
+
+    lines = part_lines(
+        part for section in document.sections
+        for part in (section.first_page_header, section.header, section.even_page_header)
+    )
+    for block in document.element.body.iterchildren():
+        lines.extend(_docx_block_text(block, Paragraph, Table, document._body))
+    lines.extend(part_lines(
+        part for section in document.sections
+        for part in (section.first_page_footer, section.footer, section.even_page_footer)
+    ))
+    return "\n".join(line for line in lines if line.strip())
+
+_ODF_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+
+def _odf_inline_text(element) -> str:
+    """Text of an ODF paragraph, expanding spaces, tabs and line breaks."""
+    parts = [element.text or ""]
+    for child in element:
+        tag = child.tag.rsplit("}", 1)[-1]
+        if tag == "s":
+            parts.append(" " * int(child.get(f"{{{_ODF_TEXT_NS}}}c", "1")))
+        elif tag == "tab":
+            parts.append("\t")
+        elif tag == "line-break":
+            parts.append("\n")
+        elif tag != "note":
+            parts.append(_odf_inline_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+@register_extractor(ODT)
+def extract_odt(file_path: str) -> str:
+    from xml.etree.ElementTree import iterparse
+
+    paragraph_tags = {f"{{{_ODF_TEXT_NS}}}p", f"{{{_ODF_TEXT_NS}}}h"}
+    lines = []
+    chars = 0
+    with zipfile.ZipFile(file_path) as archive, archive.open("content.xml") as content:
+        depth = 0
+        for event, element in iterparse(content, events=("start", "end")):
+            if element.tag not in paragraph_tags:
+                continue
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 0:
+                # Only outermost paragraphs; nested ones (e.g. in frames) are part of their text
+                text = _odf_inline_text(element)
+                element.clear()
+                if text.strip():
+                    lines.append(text)
+                    chars += len(text)
+                    if chars >= EXTRACT_MAX_CHARS:
+                        break
+    return "\n".join(lines)[:EXTRACT_MAX_CHARS]
+
+# RTF destinations whose content is not document text
+_RTF_SKIP_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "themedata",
+    "colorschememapping", "datastore", "latentstyles", "listtable", "listoverridetable",
+    "rsidtbl", "generator", "xmlnstbl", "object", "fldinst"
+}
+_RTF_TOKEN = re.compile(r"\\([a-z]+)(-?\d+)? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.IGNORECASE)
+_RTF_BREAKS = {"par": "\n", "line": "\n", "sect": "\n", "page": "\n", "row": "\n", "tab": "\t", "cell": "\t"}
+
+def _strip_rtf(rtf: str) -> str:
+    """Plain text of an RTF document: control words, groups and non-text destinations removed."""
+    out = []
+    stack = []
+    skipping = False
+    unicode_skip = 1
+    pending_skip = 0
+    for match in _RTF_TOKEN.finditer(rtf):
+        word, arg, hex_code, symbol, brace, text = match.groups()
+        if brace == "{":
+            stack.append((skipping, unicode_skip))
+            continue
+        if brace == "}":
+            skipping, unicode_skip = stack.pop() if stack else (False, 1)
+            continue
+        if word:
+            word = word.lower()
+            if word in _RTF_SKIP_DESTINATIONS:
+                skipping = True
+            elif word == "uc" and arg:
+                unicode_skip = int(arg)
+            elif skipping:
+                continue
+            elif word == "u" and arg:
+                out.append(chr(int(arg) % 65536))
+                pending_skip = unicode_skip
+            elif word in _RTF_BREAKS:
+                out.append(_RTF_BREAKS[word])
+            continue
+        if symbol:
+            if symbol == "*":
+                skipping = True
+            elif not skipping and symbol in "\\{}":
+                out.append(symbol)
+            elif not skipping and symbol == "~":
+                out.append(" ")
+            continue
+        if skipping:
+            continue
+        if hex_code:
+            if pending_skip:
+                pending_skip -= 1
+                continue
+            out.append(bytes([int(hex_code, 16)]).decode("cp1252", errors="replace"))
+        elif text:
+            if pending_skip:
+                skipped = min(pending_skip, len(text))
+                text, pending_skip = text[skipped:], pending_skip - skipped
+            out.append(text)
+    return "".join(out)
+
+@register_extractor(RTF)
+def extract_rtf(file_path: str) -> str:
+    # RTF is 7-bit; characters outside ASCII are escaped in the markup itself
+    with open(file_path, 'r', encoding="latin-1") as f:
+        rtf = f.read(EXTRACT_MAX_RTF_BYTES)
+    try:
+        from striprtf.striprtf import rtf_to_text
+        text = rtf_to_text(rtf)
+    except ImportError:
+        text = _strip_rtf(rtf)
+    return text[:EXTRACT_MAX_CHARS]
+
+@register_extractor(HTML)
+def extract_html(file_path: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(_read_text(file_path), "html.parser")
+    for element in soup(["script", "style", "noscript", "template"]):
+        element.decompose()
+    lines = (line.strip() for line in soup.get_text("\n").splitlines())
+    return "\n".join(line for line in lines if line)
+
+_MARKDOWN_RULES = [
+    (re.compile(r"^```.*$|^~~~.*$", re.MULTILINE), ""),                 # code fences
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),                   # images
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),                    # links
+    (re.compile(r"^\s{0,3}#{1,6}\s*", re.MULTILINE), ""),              # headings
+    (re.compile(r"^\s{0,3}>\s?", re.MULTILINE), ""),                   # block quotes
+    (re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$", re.MULTILINE), ""),     # horizontal rules
+    (re.compile(r"(\*\*|__)(.+?)\1"), r"\2"),                          # bold
+    (re.compile(r"(?<![\w*])([*_])(?!\s)(.+?)(?<!\s)\1(?![\w*])"), r"\2"),  # italics
+    (re.compile(r"`([^`]*)`"), r"\1"),                                 # inline code
+]
+
+@register_extractor(MARKDOWN)
+def extract_markdown(file_path: str) -> str:
+    text = _read_text(file_path)
+    for pattern, replacement in _MARKDOWN_RULES:
+        text = pattern.sub(replacement, text)
+    return text
+
+@register_extractor(TEXT)
+def extract_plain_text(file_path: str) -> str:
+    return _read_text(file_path)
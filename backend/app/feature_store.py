@@ -0,0 +1,206 @@
+"""
+Store of precomputed job requirement features.
+
+Features are kept in a SQLite file keyed by job content, so every worker process shares
+them and each upload only writes the jobs it extracted. Rows produced by another
+EXTRACTOR_VERSION are ignored and purged, and the number of rows is capped with LRU eviction.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+from .matcher import extract_job_requirements, job_feature_key, EXTRACTOR_VERSION
+from .paths import data_path
+
+logger = logging.getLogger("job_search_app.feature_store")
+
+JOB_FEATURE_STORE_PATH = os.getenv("JOB_FEATURE_STORE_PATH", data_path("job_features.sqlite3"))
+# Maximum number of jobs kept; the least recently used are evicted beyond it
+JOB_FEATURE_STORE_MAX_ENTRIES = int(os.getenv("JOB_FEATURE_STORE_MAX_ENTRIES", "100000"))
+# Keys looked up per query, below SQLite's limit on bound parameters
+_LOOKUP_CHUNK = 500
+
+class JobFeatureStore:
+    """
+    A cache of precomputed job requirement features (skills, experience range, level,
+    degree flag, quality counts) keyed by job content and versioned by EXTRACTOR_VERSION,
+    persisted in SQLite
+    """
+
+    def __init__(self, path: str = JOB_FEATURE_STORE_PATH, max_entries: int = JOB_FEATURE_STORE_MAX_ENTRIES):
+        """
+        Initialize the JobFeatureStore
+
+        Args:
+            path: Path of the SQLite file shared by every worker
+            max_entries: Maximum number of jobs kept
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        count = 0
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS features ("
+                    " key TEXT PRIMARY KEY, version TEXT, features TEXT, last_access REAL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS features_last_access ON features (last_access)")
+                purged = conn.execute("DELETE FROM features WHERE version != ?", (EXTRACTOR_VERSION,)).rowcount
+                if purged:
+                    logger.info(f"Discarded {purged} job features from other extractor versions")
+                count = conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error opening job feature store: {str(e)}")
+
+        logger.info(f"JobFeatureStore initialized with {count} jobs (extractor version {EXTRACTOR_VERSION})")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps the store safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Features stored for the given keys, marking them as recently used"""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        try:
+            with self._lock, self._connect() as conn:
+                for start in range(0, len(unique), _LOOKUP_CHUNK):
+                    chunk = unique[start:start + _LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT key, features FROM features WHERE version = ? AND key IN ({placeholders})",
+                        (EXTRACTOR_VERSION, *chunk)
+                    ).fetchall()
+                    for key, features in rows:
+                        found[key] = json.loads(features)
+                    if rows:
+                        conn.execute(
+                            f"UPDATE features SET last_access = ? WHERE key IN ({','.join('?' * len(rows))})",
+                            (time.time(), *(key for key, _ in rows))
+                        )
+        except Exception as e:
+            logger.error(f"Error reading job features: {str(e)}")
+        return found
+
+    def _store(self, features_by_key: Dict[str, Dict[str, Any]]) -> None:
+        """Write newly extracted features, evicting least recently used jobs beyond the cap"""
+        try:
+            now = time.time()
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?)",
+                    [(key, EXTRACTOR_VERSION, json.dumps(features), now) for key, features in features_by_key.items()]
+                )
+                excess = conn.execute("SELECT COUNT(*) FROM features").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM features WHERE key IN (SELECT key FROM features ORDER BY last_access LIMIT ?)",
+                        (excess,)
+                    )
+                    logger.info(f"Evicted {excess} job features")
+        except Exception as e:
+            logger.error(f"Error saving job features: {str(e)}")
+
+    def get(self, job_text: str, job_title: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Get the cached features for a job
+
+        Args:
+            job_text: The full text of the job description
+            job_title: The job title if available separately
+
+        Returns:
+            The features dictionary or None if the job has not been processed yet
+        """
+        key = job_feature_key(job_text, job_title)
+        return self._lookup([key]).get(key)
+
+    def get_or_compute(self, job_text: str, job_title: str = "") -> Dict[str, Any]:
+        """
+        Get the features for a job, extracting and persisting them on a cache miss
+
+        Args:
+            job_text: The full text of the job description
+            job_title: The job title if available separately
+
+        Returns:
+            The features dictionary
+        """
+        return self.get_or_compute_many([job_text], [job_title])[0]
+
+    def get_or_compute_many(self, job_texts: List[str], job_titles: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get the features for a list of jobs, extracting only the ones not seen before.
+        The store is read and written at most once per call.
+
+        Args:
+            job_texts: List of job description texts
+            job_titles: Optional list of job titles
+
+        Returns:
+            List of features dictionaries in the same order as job_texts
+        """
+        keys = [
+            job_feature_key(job_text, job_titles[i] if job_titles and i < len(job_titles) else "")
+            for i, job_text in enumerate(job_texts)
+        ]
+        known = self._lookup(keys)
+        computed = {}
+        results = []
+        for i, (job_text, key) in enumerate(zip(job_texts, keys)):
+            features = known.get(key, computed.get(key))
+            if features is None:
+                job_title = job_titles[i] if job_titles and i < len(job_titles) else ""
+                features = computed[key] = extract_job_requirements(job_text, job_title)
+            results.append(features)
+
+        if computed:
+            self._store(computed)
+        logger.info(f"Job features: {len(job_texts) - len(computed)} cached, {len(computed)} extracted")
+        return results
+
+    def attach_features(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Attach versioned features to job dictionaries in place so they travel with the job
+
+        Args:
+            jobs: List of job dictionaries with 'description' and 'title'
+
+        Returns:
+            The same list of jobs, each with 'features' and 'features_version' set
+        """
+        job_texts = [job.get("description") or job.get("title") or "" for job in jobs]
+        job_titles = [job.get("title", "") for job in jobs]
+        for job, features in zip(jobs, self.get_or_compute_many(job_texts, job_titles)):
+            job["features"] = features
+            job["features_version"] = EXTRACTOR_VERSION
+        return jobs
+
+
+def stored_features(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Return the features persisted with a job if they were produced by the current extractor
+
+    Args:
+        job: Job dictionary, e.g. as returned by the vector store
+
+    Returns:
+        The features dictionary or None if missing or stale
+    """
+    if job.get("features_version") == EXTRACTOR_VERSION:
+        return job.get("features")
+    return None
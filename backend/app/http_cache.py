@@ -0,0 +1,194 @@
+"""
+On-disk HTTP response cache for scraped pages.
+
+Bodies are stored zlib-compressed in a SQLite file keyed by normalized URL (and a namespace,
+so fetched HTML and browser-rendered HTML are cached separately). Entries are fresh for a
+per-domain TTL; stale entries keep their ETag/Last-Modified validators so the client can
+revalidate them with a conditional GET. The total size is capped with LRU eviction.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from . import utils
+from .paths import data_path
+
+logger = logging.getLogger("job_search_app.http_cache")
+
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", data_path("http_cache.sqlite3"))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+HTTP_CACHE_DEFAULT_TTL = int(os.getenv("HTTP_CACHE_DEFAULT_TTL", "3600"))
+
+# Seconds a cached page stays fresh per domain (matched on the host suffix); search result
+# pages change quickly, company career pages rarely. Extend or override with a JSON object
+# in HTTP_CACHE_TTLS, e.g. {"greenhouse.io": 7200}.
+DOMAIN_TTLS = {
+    "linkedin.com": 900,
+    "indeed.com": 900,
+    "googleapis.com": 86400,
+}
+DOMAIN_TTLS.update(json.loads(os.getenv("HTTP_CACHE_TTLS", "{}")))
+
+class HttpCache:
+    """
+    A size-capped, compressed response cache persisted in SQLite
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        """
+        Initialize the HttpCache
+
+        Args:
+            path: Path of the SQLite file
+            max_bytes: Maximum total size of the compressed bodies
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, body BLOB,"
+                " etag TEXT, last_modified TEXT, stored_at REAL, last_access REAL, size INTEGER)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps the cache safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def key(url: str, namespace: str = "http") -> str:
+        """Cache key of a URL within a namespace"""
+        return f"{namespace}:{utils.normalize_url(url)}"
+
+    @staticmethod
+    def ttl_for(url: str) -> int:
+        """
+        Freshness lifetime for a URL, from the most specific matching domain
+
+        Args:
+            url: URL of the cached page
+
+        Returns:
+            TTL in seconds
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        matches = [domain for domain in DOMAIN_TTLS if host == domain or host.endswith("." + domain)]
+        if not matches:
+            return HTTP_CACHE_DEFAULT_TTL
+        return DOMAIN_TTLS[max(matches, key=len)]
+
+    def get(self, url: str, namespace: str = "http") -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Args:
+            url: URL of the page
+            namespace: Cache namespace, e.g. "http" or "rendered"
+
+        Returns:
+            Dictionary with status, headers, body (str), etag, last_modified and fresh, or None
+        """
+        try:
+            key = self.key(url, namespace)
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            status, headers, body, etag, last_modified, stored_at = row
+            return {
+                "status": status,
+                "headers": json.loads(headers),
+                "body": zlib.decompress(body).decode("utf-8"),
+                "etag": etag,
+                "last_modified": last_modified,
+                "fresh": time.time() - stored_at < self.ttl_for(url)
+            }
+        except Exception as e:
+            logger.error(f"Error reading HTTP cache for {url}: {str(e)}")
+            return None
+
+    def put(self, url: str, body: str, status: int = 200, headers: Optional[Dict[str, str]] = None,
+            namespace: str = "http") -> None:
+        """
+        Store a response, evicting least recently used entries beyond the size cap
+
+        Args:
+            url: URL of the page
+            body: Response text
+            status: HTTP status code
+            headers: Response headers worth keeping (validators, content type)
+            namespace: Cache namespace
+        """
+        try:
+            headers = {k.lower(): v for k, v in (headers or {}).items()}
+            compressed = zlib.compress(body.encode("utf-8"), 6)
+            now = time.time()
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.key(url, namespace), url, status, json.dumps(headers), compressed,
+                     headers.get("etag"), headers.get("last-modified"), now, now, len(compressed))
+                )
+                self._evict(conn)
+        except Exception as e:
+            logger.error(f"Error writing HTTP cache for {url}: {str(e)}")
+
+    def refresh(self, url: str, namespace: str = "http") -> None:
+        """Mark a cached response as fresh again, e.g. after a 304 Not Modified"""
+        try:
+            now = time.time()
+            with self._lock, self._connect() as conn:
+                conn.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?",
+                             (now, now, self.key(url, namespace)))
+        except Exception as e:
+            logger.error(f"Error refreshing HTTP cache for {url}: {str(e)}")
+
+    def delete(self, url: str, namespace: str = "http") -> None:
+        """Remove a cached response"""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (self.key(url, namespace),))
+        except Exception as e:
+            logger.error(f"Error deleting {url} from HTTP cache: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} responses from HTTP cache")
+
+_cache: Optional[HttpCache] = None
+
+def get_http_cache() -> HttpCache:
+    """Get the process-wide HTTP cache, created on first use"""
+    global _cache
+    if _cache is None:
+        _cache = HttpCache()
+    return _cache
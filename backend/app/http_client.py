@@ -0,0 +1,272 @@
+"""
+Shared HTTP client for the scraper, discovery and utils modules.
+
+All requests run on one background event loop through pooled httpx.AsyncClient instances
+(one per proxy), so connections, TLS sessions and HTTP/2 streams are reused across callers.
+Async code awaits fetch() from any event loop; legacy synchronous code calls get().
+Transient failures are retried with the same tenacity policy the scraper has always used.
+GET requests made with cache=True go through the on-disk HTTP cache with conditional revalidation.
+Every request waits for its domain's adaptive rate limit, see rate_limiter. The SQLite work of the
+cache and the limiter runs on a dedicated thread pool, so a locked database never stalls the loop.
+"""
+
+import asyncio
+import functools
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception_type, retry_if_result, stop_after_attempt, wait_exponential
+
+from . import http_cache as response_cache
+from .rate_limiter import get_rate_limiter, is_block_page, is_limited, parse_retry_after
+
+logger = logging.getLogger("job_search_app.http_client")
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# Threads running the blocking cache and rate limiter calls of in-flight requests
+HTTP_STORAGE_WORKERS = int(os.getenv("HTTP_STORAGE_WORKERS", "8"))
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Responses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 502, 503, 504}
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_clients: Dict[Optional[str], httpx.AsyncClient] = {}
+_storage_executor: Optional[ThreadPoolExecutor] = None
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop that owns every client, on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="http-client-loop", daemon=True)
+            thread.start()
+            _loop = loop
+            logger.info(f"Started shared HTTP client loop (HTTP/2 {'enabled' if HTTP2_AVAILABLE else 'unavailable'})")
+        return _loop
+
+def _reset_after_fork() -> None:
+    """A forked worker does not inherit the loop thread; it starts its own loop and clients on first use"""
+    global _loop, _loop_lock, _storage_executor
+    _loop = None
+    _loop_lock = threading.Lock()
+    _clients.clear()
+    _storage_executor = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+async def _offload(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking storage call (SQLite, compression) on the storage threads; runs on the background loop"""
+    global _storage_executor
+    if _storage_executor is None:
+        _storage_executor = ThreadPoolExecutor(max_workers=HTTP_STORAGE_WORKERS, thread_name_prefix="http-storage")
+    return await asyncio.get_running_loop().run_in_executor(_storage_executor, functools.partial(fn, *args, **kwargs))
+
+def _get_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """Get the pooled client for a proxy (None for direct connections); runs on the background loop"""
+    client = _clients.get(proxy)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            proxy=proxy,
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        _clients[proxy] = client
+    return client
+
+async def _limited_request(client: httpx.AsyncClient, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send one request once the domain's rate limit allows it, and adapt the limit to the response"""
+    if not is_limited(url):
+        return await client.request(method, url, **kwargs)
+    limiter = await _offload(get_rate_limiter)
+    delay = await _offload(limiter.reserve, url)
+    if delay > 0:
+        await asyncio.sleep(delay)
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    await _offload(
+        limiter.record,
+        url,
+        response.status_code,
+        time.perf_counter() - start,
+        blocked="html" in response.headers.get("content-type", "") and is_block_page(response.text),
+        retry_after=parse_retry_after(response.headers.get("retry-after"))
+    )
+    return response
+
+async def _send(method: str, url: str, proxy: Optional[str] = None, retry: bool = True, **kwargs: Any) -> httpx.Response:
+    """Send a request with the shared retry policy; runs on the background loop"""
+    client = _get_client(proxy)
+    if not retry:
+        return await _limited_request(client, method, url, **kwargs)
+    retrying = AsyncRetrying(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=(retry_if_exception_type(httpx.TransportError) |
+               retry_if_result(lambda response: response.status_code in RETRY_STATUSES)),
+        # Once retries are exhausted, hand back the last response or raise the last error
+        retry_error_callback=lambda retry_state: retry_state.outcome.result()
+    )
+    return await retrying(_limited_request, client, method, url, **kwargs)
+
+def _cached_response(url: str, cached: Dict[str, Any]) -> httpx.Response:
+    return httpx.Response(
+        status_code=cached["status"],
+        headers=cached["headers"],
+        content=cached["body"].encode("utf-8"),
+        request=httpx.Request("GET", url)
+    )
+
+async def _request(method: str, url: str, proxy: Optional[str] = None, retry: bool = True,
+                   cache: bool = False, bypass_cache: bool = False, **kwargs: Any) -> httpx.Response:
+    """Send a request, serving and revalidating GETs from the HTTP cache when enabled"""
+    if not cache or method != "GET":
+        return await _send(method, url, proxy=proxy, retry=retry, **kwargs)
+
+    # Query parameters are part of the cache key
+    if kwargs.get("params"):
+        url = str(httpx.URL(url, params=kwargs.pop("params")))
+    http_cache = await _offload(response_cache.get_http_cache)
+    cached = None if bypass_cache else await _offload(http_cache.get, url)
+    if cached and cached["fresh"]:
+        logger.info(f"HTTP cache hit for {url}")
+        return _cached_response(url, cached)
+
+    # Revalidate a stale entry with a conditional GET
+    headers = dict(kwargs.pop("headers", None) or {})
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
+    response = await _send(method, url, proxy=proxy, retry=retry, headers=headers, **kwargs)
+
+    if response.status_code == 304 and cached:
+        logger.info(f"HTTP cache revalidated {url}")
+        await _offload(http_cache.refresh, url)
+        return _cached_response(url, cached)
+    if response.status_code == 200 and "no-store" not in response.headers.get("cache-control", ""):
+        keep = {name: response.headers[name] for name in ("etag", "last-modified", "content-type") if name in response.headers}
+        await _offload(http_cache.put, url, response.text, 200, keep)
+    return response
+
+def _submit(coro) -> "asyncio.Future":
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+def _wait(coro, caller: str, instead: str) -> Any:
+    """Run a coroutine on the background loop and block until it is done, unless we are that loop"""
+    loop = _get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Blocking here would wait on a future only this thread can complete
+        coro.close()
+        raise RuntimeError(f"http_client.{caller} cannot be called from the shared client loop; {instead} instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+def run(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine that uses the shared client to completion from synchronous code
+
+    Unlike asyncio.run, this also works while the calling thread runs an event loop of its own
+    (the caller blocks until the coroutine is done).
+
+    Args:
+        coro: Coroutine to run on the background loop
+
+    Returns:
+        The result of the coroutine
+    """
+    return _wait(coro, "run()", "await the coroutine")
+
+async def fetch(url: str, method: str = "GET", proxy: Optional[str] = None, retry: bool = True,
+                cache: bool = False, bypass_cache: bool = False, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request through the shared client from any event loop
+
+    Args:
+        url: URL to request
+        method: HTTP method
+        proxy: Optional proxy URL; each proxy gets its own connection pool
+        retry: Whether to retry transport errors and 429/5xx responses
+        cache: Whether to serve and store GET responses through the on-disk HTTP cache
+        bypass_cache: Skip cached responses for this request (the fresh response is still stored)
+        **kwargs: Passed to httpx.AsyncClient.request (headers, params, timeout, follow_redirects, ...)
+
+    Returns:
+        The httpx response with its body loaded
+    """
+    return await asyncio.wrap_future(_submit(_request(
+        method, url, proxy=proxy, retry=retry, cache=cache, bypass_cache=bypass_cache, **kwargs
+    )))
+
+def request(method: str, url: str, proxy: Optional[str] = None, retry: bool = True,
+            cache: bool = False, bypass_cache: bool = False, **kwargs: Any) -> httpx.Response:
+    """
+    Synchronous facade over fetch() for legacy callers
+
+    Args:
+        method: HTTP method
+        url: URL to request
+        proxy: Optional proxy URL
+        retry: Whether to retry transport errors and 429/5xx responses
+        cache: Whether to serve and store GET responses through the on-disk HTTP cache
+        bypass_cache: Skip cached responses for this request (the fresh response is still stored)
+        **kwargs: Passed to httpx.AsyncClient.request
+
+    Returns:
+        The httpx response with its body loaded
+
+    Raises:
+        RuntimeError: If called from the shared client loop, where it would deadlock
+    """
+    return _wait(_request(
+        method, url, proxy=proxy, retry=retry, cache=cache, bypass_cache=bypass_cache, **kwargs
+    ), "request()", "await fetch()")
+
+def get(url: str, **kwargs: Any) -> httpx.Response:
+    """Synchronous GET through the shared client, see request()"""
+    return request("GET", url, **kwargs)
+
+async def _close_clients() -> None:
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+
+def close() -> None:
+    """Close every pooled connection, e.g. on application shutdown"""
+    global _storage_executor
+    if _loop is not None and not _loop.is_closed():
+        _submit(_close_clients()).result()
+    if _storage_executor is not None:
+        _storage_executor.shutdown(wait=False)
+        _storage_executor = None
@@ -5,8 +5,13 @@ from .matcher import (
     compute_embeddings, 
     extract_structured_resume, 
     extract_job_requirements, 
-    calculate_advanced_match_score
+    calculate_advanced_match_score,
+    advanced_match_score_matrix,
+    SHORTLIST_K,
+    RERANK_M
 )
+from .feature_store import JobFeatureStore
+from .models import get_model
 
 logger = logging.getLogger("job_search_app.job_matcher")
 
@@ -15,26 +20,33 @@ class JobMatcher:
     symbolic matching and embedding-based semantic similarity.
     """
     
-    def __init__(self, use_cross_encoder: bool = True):
+    def __init__(
+        self,
+        use_cross_encoder: bool = True,
+        feature_store: Optional[JobFeatureStore] = None,
+        shortlist_k: int = SHORTLIST_K,
+        rerank_m: int = RERANK_M
+    ):
         """
         Initialize the JobMatcher
         
         Args:
             use_cross_encoder: Whether to use a cross-encoder model for reranking (optional)
+            feature_store: Optional cache of precomputed job features shared across calls
+            shortlist_k: Number of jobs, selected by embedding similarity, that get symbolic
+                scoring (0 scores every job)
+            rerank_m: Number of top matches reranked by the cross-encoder
         """
         self.use_cross_encoder = use_cross_encoder
         self.cross_encoder = None
+        self.feature_store = feature_store
+        self.shortlist_k = shortlist_k
+        self.rerank_m = rerank_m
         
-        # Load cross-encoder model if requested
+        # Load cross-encoder model if requested (shared with every other matcher, see models.py)
         if use_cross_encoder:
-            try:
-                from sentence_transformers import CrossEncoder
-                import torch
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                self.cross_encoder = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2', device=device)
-                logger.info(f"Successfully loaded CrossEncoder model on device: {device}")
-            except Exception as e:
-                logger.error(f"Error loading CrossEncoder model: {str(e)}")
+            self.cross_encoder = get_model("cross_encoder")
+            if self.cross_encoder is None:
                 self.use_cross_encoder = False
     
     def match_resume_to_jobs(
@@ -42,7 +54,8 @@ class JobMatcher:
         resume_text: str, 
         job_texts: List[str],
         job_titles: Optional[List[str]] = None,
-        limit: int = 10
+        limit: int = 10,
+        job_features: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Match a resume to multiple job descriptions
@@ -52,6 +65,7 @@ class JobMatcher:
             job_texts: List of job description texts
             job_titles: Optional list of job titles
             limit: Maximum number of matches to return
+            job_features: Optional precomputed extract_job_requirements output per job
             
         Returns:
             List of job match results with scores and metadata
@@ -72,27 +86,44 @@ class JobMatcher:
             resume_embedding = embeddings[0]
             job_embeddings = embeddings[1:]
         
-        # Process each job and compute match scores
+        # Cosine similarity of the resume against every job in one matrix-vector product
+        similarities = np.zeros(len(job_texts))
+        if resume_embedding.size > 0 and len(job_embeddings) == len(job_texts):
+            resume_norm = resume_embedding / np.linalg.norm(resume_embedding)
+            job_norms = job_embeddings / np.linalg.norm(job_embeddings, axis=1, keepdims=True)
+            similarities = job_norms @ resume_norm
+        
+        # Stage 1: shortlist the top shortlist_k jobs by embedding similarity
+        candidates = list(range(len(job_texts)))
+        if self.shortlist_k and resume_embedding.size > 0 and self.shortlist_k < len(job_texts):
+            candidates = [int(i) for i in np.argsort(-similarities)[:self.shortlist_k]]
+            logger.info(f"Shortlisted {len(candidates)} of {len(job_texts)} jobs by embedding similarity")
+        
+        # Job features are computed once per job and reused across resumes when a store is available
+        if job_features is None and self.feature_store is not None:
+            candidate_features = self.feature_store.get_or_compute_many(
+                [job_texts[i] for i in candidates],
+                [job_titles[i] if job_titles and i < len(job_titles) else "" for i in candidates]
+            )
+            job_features = [None] * len(job_texts)
+            for i, features in zip(candidates, candidate_features):
+                job_features[i] = features
+        
+        # Stage 2: symbolic scoring of the shortlisted jobs
         matches = []
-        for i, job_text in enumerate(job_texts):
+        for i in candidates:
+            job_text = job_texts[i]
             job_title = job_titles[i] if job_titles and i < len(job_titles) else ""
-            job_data = extract_job_requirements(job_text, job_title)
+            if job_features and i < len(job_features) and job_features[i]:
+                job_data = job_features[i]
+            else:
+                job_data = extract_job_requirements(job_text, job_title)
             
             # Calculate structured match score
             match_data = calculate_advanced_match_score(resume_data, job_data)
             
-            # Calculate embedding similarity if available
-            embedding_sim = 0.0
-            if resume_embedding.size > 0 and i < len(job_embeddings):
-                job_emb = job_embeddings[i]
-                
-                # Normalize vectors for cosine similarity
-                resume_norm = resume_embedding / np.linalg.norm(resume_embedding)
-                job_norm = job_emb / np.linalg.norm(job_emb)
-                
-                # Compute cosine similarity
-                embedding_sim = float(np.dot(resume_norm, job_norm))
-              # Combined score: 80% symbolic score + 20% embedding similarity
+            embedding_sim = float(similarities[i])
+            # Combined score: 80% symbolic score + 20% embedding similarity
             # Giving more weight to structural scoring which includes the new_grad_friendly component
             combined_score = (match_data["overall_score"] * 0.8) + (embedding_sim * 100 * 0.2)
             combined_score = round(combined_score, 2)
@@ -117,9 +148,9 @@ class JobMatcher:
         # Sort by combined score (highest first)
         sorted_matches = sorted(matches, key=lambda x: x["final_score"], reverse=True)
         
-        # Rerank top 5 results with cross-encoder if enabled
-        if self.use_cross_encoder and self.cross_encoder and len(sorted_matches) > 1:
-            top_n = min(5, len(sorted_matches))
+        # Stage 3: rerank the top rerank_m results with cross-encoder if enabled
+        if self.use_cross_encoder and self.cross_encoder and self.rerank_m and len(sorted_matches) > 1:
+            top_n = min(self.rerank_m, len(sorted_matches))
             top_matches = sorted_matches[:top_n]
             
             # Prepare sentence pairs for cross-encoder
@@ -175,3 +206,110 @@ class JobMatcher:
         job_titles = [job[1] for job in job_batches]
         
         return self.match_resume_to_jobs(resume_text, job_texts, job_titles, limit)
+
+    def match_resumes_to_jobs(
+        self,
+        resume_texts: List[str],
+        job_texts: List[str],
+        job_titles: Optional[List[str]] = None,
+        limit: int = 10,
+        job_features: Optional[List[Dict[str, Any]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Match many resumes against the same pool of jobs.
+        
+        All resumes and jobs are embedded in one pass, similarities and symbolic scores are
+        computed as resume x job matrices, and only each resume's top matches are expanded
+        into full match results.
+        
+        Args:
+            resume_texts: List of full resume texts
+            job_texts: List of job description texts
+            job_titles: Optional list of job titles
+            limit: Maximum number of matches to return per resume
+            job_features: Optional precomputed extract_job_requirements output per job
+            
+        Returns:
+            One list of job match results per resume, in the order of resume_texts
+        """
+        if not resume_texts or not job_texts:
+            return [[] for _ in resume_texts]
+        
+        resume_datas = [extract_structured_resume(text) for text in resume_texts]
+        
+        # Job features are extracted once and shared by every resume
+        if job_features is None and self.feature_store is not None:
+            job_features = self.feature_store.get_or_compute_many(job_texts, job_titles)
+        job_datas = []
+        for i, job_text in enumerate(job_texts):
+            if job_features and i < len(job_features) and job_features[i]:
+                job_datas.append(job_features[i])
+            else:
+                job_title = job_titles[i] if job_titles and i < len(job_titles) else ""
+                job_datas.append(extract_job_requirements(job_text, job_title))
+        
+        # Embed resumes and jobs together, then score every pair with one matrix multiply
+        embeddings = compute_embeddings(resume_texts + job_texts)
+        if len(embeddings) != len(resume_texts) + len(job_texts):
+            logger.warning("Failed to compute embeddings, falling back to symbolic match only")
+            similarity = np.zeros((len(resume_texts), len(job_texts)))
+        else:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            normalized = embeddings / np.where(norms > 0, norms, 1)
+            similarity = normalized[:len(resume_texts)] @ normalized[len(resume_texts):].T
+        
+        symbolic = advanced_match_score_matrix(resume_datas, job_datas)
+        combined = np.round((symbolic * 0.8) + (similarity * 100 * 0.2), 2)
+        
+        # Keep enough candidates per resume for the cross-encoder to rerank its top rerank_m
+        rerank_n = self.rerank_m if self.use_cross_encoder and self.cross_encoder else 0
+        top_n = min(max(limit, rerank_n), len(job_texts))
+        if top_n < len(job_texts):
+            candidates = np.argpartition(-combined, top_n - 1, axis=1)[:, :top_n]
+        else:
+            candidates = np.tile(np.arange(len(job_texts)), (len(resume_texts), 1))
+        
+        all_matches = []
+        for r, resume_data in enumerate(resume_datas):
+            order = sorted(candidates[r], key=lambda j: combined[r, j], reverse=True)
+            matches = []
+            for j in order:
+                match_data = calculate_advanced_match_score(resume_data, job_datas[j])
+                matches.append({
+                    "job_index": int(j),
+                    "job_title": job_titles[j] if job_titles and j < len(job_titles) else "",
+                    "final_score": float(combined[r, j]),
+                    "symbolic_score": match_data["overall_score"],
+                    "embedding_similarity": float(similarity[r, j]),
+                    "matched_skills": match_data["matched_skills"],
+                    "matched_preferred": match_data["matched_preferred"],
+                    "missing_skills": match_data["missing_skills"],
+                    "experience_match": match_data["experience_match"],
+                    "new_grad_friendly": match_data["new_grad_friendly"],
+                    "score_breakdown": match_data["score_breakdown"]
+                })
+            all_matches.append(matches)
+        
+        # Rerank every resume's top rerank_m with a single batched cross-encoder call
+        if rerank_n:
+            sentence_pairs = []
+            reranked = []
+            for r, matches in enumerate(all_matches):
+                if len(matches) > 1:
+                    for match in matches[:rerank_n]:
+                        sentence_pairs.append([resume_texts[r], job_texts[match["job_index"]]])
+                        reranked.append(match)
+            try:
+                if sentence_pairs:
+                    cross_scores = self.cross_encoder.predict(sentence_pairs)
+                    for match, cross_score in zip(reranked, cross_scores):
+                        match["final_score"] = round((match["final_score"] * 0.5) + (float(cross_score) * 0.5), 2)
+                        match["cross_encoder_score"] = float(cross_score)
+                    for r, matches in enumerate(all_matches):
+                        all_matches[r] = sorted(matches[:rerank_n], key=lambda x: x["final_score"], reverse=True) + matches[rerank_n:]
+                    logger.info(f"Reranked {len(sentence_pairs)} matches with CrossEncoder")
+            except Exception as e:
+                logger.error(f"Error using CrossEncoder for reranking: {str(e)}")
+        
+        logger.info(f"Matched {len(resume_texts)} resumes against {len(job_texts)} jobs")
+        return [matches[:limit] for matches in all_matches]
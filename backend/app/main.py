@@ -1,13 +1,14 @@
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import os
 import uuid
-import shutil
+import zipfile
 from pathlib import Path
 import asyncio
 import logging
+import numpy as np
 
 # Import our task storage class
 from .task_storage import TaskStorage
@@ -33,12 +34,29 @@ logger.info(f"Starting application. Logging to {log_file}")
 
 
 # Local semantic search and vector store
-from .vector_store import add_job_local, search_jobs_local
+from .vector_store import add_job_local, search_jobs_local, expire_jobs_local
 # from .vector_store import add_job_gcp, search_jobs_gcp  # Uncomment for GCP
 from .resume_parser import extract_text, extract_skills
 from .scraper_no_retry import scrape_jobs
-from .matcher import compute_embeddings, rank_jobs
-from .utils import export_to_csv
+from .scrape_coordinator import ScrapeCoordinator
+from .matcher import (
+    compute_document_embeddings, compute_chunk_embeddings, max_sim_scores,
+    rank_jobs, extract_structured_resume, EMBEDDING_POOLING, EMBEDDING_SIGNATURE, MATCHER_VERSION
+)
+from .change_detector import ChangeDetector, listing_fingerprint
+from .dedup import DedupIndex
+from .saved_searches import SavedSearchStore, apply_filters, SAVED_SEARCH_INTERVAL_MINUTES
+from . import http_client
+from . import models
+from .feature_store import JobFeatureStore
+from .job_matcher import JobMatcher
+from .resume_store import ResumeStore, resume_text_hash
+from .result_cache import ResultCache, result_key
+from .upload_store import (
+    save_upload, find_upload, UploadTooLargeError, RequestSizeLimitMiddleware, MAX_UPLOAD_BYTES, MULTIPART_OVERHEAD_BYTES
+)
+from .batch_ingest import collect_resumes, parse_resumes, BatchTooLargeError, BATCH_MAX_UPLOAD_BYTES
+from .utils import export_to_csv, normalize_url, is_public_url
 
 app = FastAPI(title="Job Search Resume Matcher")
 
@@ -51,6 +69,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Oversized uploads are refused while they are received, before they are spooled to disk
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    limits={
+        "/upload": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/upload/batch": BATCH_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+    }
+)
+
 # Create a directory for uploaded files if it doesn't exist
 UPLOAD_DIR = Path("./uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
@@ -60,11 +87,10 @@ RESULTS_DIR = Path("./results")
 RESULTS_DIR.mkdir(exist_ok=True)
 
 task_storage = TaskStorage()
-tasks = task_storage.get_all()
+tasks = task_storage
 
 # Helper function to add and persist a task
 def add_task(task_id, task_data):
-    tasks[task_id] = task_data
     task_storage.add(task_id, task_data)
 
 # --- API endpoints for local semantic search ---
@@ -121,9 +147,64 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 RESULTS_DIR = Path("./results")
 RESULTS_DIR.mkdir(exist_ok=True)
 
-# Initialize persistent task storage from our imported module
+# Initialize persistent task storage from our imported module; reads go to the shared
+# store, so a task can be polled through any worker
 task_storage = TaskStorage()
-tasks = task_storage.get_all()
+tasks = task_storage
+
+# Job requirement features are extracted once per job and reused across resumes
+feature_store = JobFeatureStore()
+
+# Matcher used for scoring many resumes against one job pool
+job_matcher = JobMatcher(use_cross_encoder=False, feature_store=feature_store)
+
+# Fingerprints and embeddings of scraped listings per board, so a re-scrape only embeds what changed
+change_detector = ChangeDetector()
+# Whether new, changed and removed listings are also written to the MongoDB vector store
+SYNC_VECTOR_STORE = os.getenv("SYNC_VECTOR_STORE", "false").lower() == "true"
+
+# Concurrent tasks scraping the same board share one scrape, also across worker processes
+scrape_coordinator = ScrapeCoordinator(scrape_jobs)
+
+# Listings of the same posting on several boards are collapsed before embedding
+dedup_index = DedupIndex()
+
+# Saved searches re-run in the background; only listings they have not reported yet are scored
+saved_searches = SavedSearchStore()
+# Seconds between two checks for due saved searches (0 disables the scheduler)
+SAVED_SEARCH_POLL_SECONDS = int(os.getenv("SAVED_SEARCH_POLL_SECONDS", "60"))
+
+# Parsed resumes and their embeddings, indexed for ranking candidates against a job
+resume_store = ResumeStore()
+
+# Uploads of the same resume against the same board reuse the task that ran (or is running) the match
+result_cache = ResultCache()
+
+# Models load in a background thread after startup, so the app answers /health right away;
+# /ready reports when they are usable. Set MODEL_WARMUP=false to load them on first use only.
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+
+
+@app.on_event("startup")
+async def warm_up_models():
+    if MODEL_WARMUP:
+        app.state.model_warmup = asyncio.create_task(asyncio.to_thread(models.warmup))
+
+
+@app.get("/health")
+async def health():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def readiness():
+    """Readiness: the models needed for matching are loaded, with the load state of each model"""
+    is_ready = models.ready()
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, "models": models.model_states()}
+    )
 
 
 @app.post("/upload")
@@ -134,20 +215,39 @@ async def upload_resume(
     # Generate a unique task ID
     task_id = str(uuid.uuid4())
     
-    # Save the uploaded file
-    file_path = UPLOAD_DIR / f"{task_id}_{resume.filename}"
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(resume.file, buffer)
+    # Stream the uploaded file to content-addressed storage
+    try:
+        upload = await save_upload(resume, UPLOAD_DIR, MAX_UPLOAD_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    # The same resume against the same board is answered by the task that already ran it,
+    # or attaches to the task still running it
+    cache_key = result_key(upload["sha256"], job_url, MATCHER_VERSION)
+    cached_task_id = result_cache.lookup(cache_key)
+    if cached_task_id in tasks and tasks[cached_task_id]["status"] in ("processing", "completed"):
+        logger.info(f"Upload {upload['sha256']} for {job_url} answered by task {cached_task_id}")
+        return {"task_id": cached_task_id, "status": tasks[cached_task_id]["status"], "cached": True}
+    if cached_task_id:
+        result_cache.invalidate(cache_key, cached_task_id)
     
     # Store task information
     task_data = {
         "status": "processing",
-        "file_path": str(file_path),
+        "file_path": upload["path"],
+        "file_sha256": upload["sha256"],
+        "filename": upload["filename"],
         "job_url": job_url,
+        "result_key": cache_key,
         "results": None,
         "csv_path": None
     }
     add_task(task_id, task_data)
+    owner_task_id = result_cache.begin(cache_key, task_id)
+    if owner_task_id != task_id:
+        # Another worker started the same request since the lookup
+        task_storage.delete(task_id)
+        return {"task_id": owner_task_id, "status": "processing", "cached": True}
     
     # Start processing in the background
     asyncio.create_task(process_resume_and_jobs(task_id))
@@ -155,19 +255,268 @@ async def upload_resume(
     return {"task_id": task_id, "status": "processing"}
 
 
+@app.post("/upload/batch")
+async def upload_resume_batch(
+    resumes: List[UploadFile] = File(...),
+    job_url: str = Form(...)
+):
+    """
+    Match many resumes against one job board.
+    
+    Accepts ZIP archives of resumes and/or individual resume files. Every distinct resume gets
+    its own task (poll /results/{task_id}); the batch task lists them and their status.
+    """
+    try:
+        collected = await asyncio.to_thread(
+            collect_resumes, [(upload.filename, upload.file) for upload in resumes], UPLOAD_DIR
+        )
+    except zipfile.BadZipFile as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {str(e)}")
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if not collected["resumes"]:
+        raise HTTPException(status_code=400, detail="No resumes in a supported format found in the upload")
+    
+    batch_id = str(uuid.uuid4())
+    handles = []
+    for stored in collected["resumes"]:
+        task_id = str(uuid.uuid4())
+        add_task(task_id, {
+            "status": "processing",
+            "file_path": stored["path"],
+            "file_sha256": stored["sha256"],
+            "filename": stored["filename"],
+            "job_url": job_url,
+            "batch_id": batch_id,
+            "results": None,
+            "csv_path": None
+        })
+        handles.append({"task_id": task_id, "filename": stored["filename"], "sha256": stored["sha256"]})
+    
+    add_task(batch_id, {
+        "status": "processing",
+        "file_path": None,
+        "job_url": job_url,
+        "resumes": handles,
+        "duplicates": collected["duplicates"],
+        "skipped": collected["skipped"],
+        "results": None,
+        "csv_path": None
+    })
+    
+    # Start processing in the background
+    asyncio.create_task(asyncio.to_thread(process_resume_batch, batch_id))
+    
+    return {
+        "batch_id": batch_id,
+        "status": "processing",
+        "resumes": handles,
+        "duplicates": collected["duplicates"],
+        "skipped": collected["skipped"]
+    }
+
+
+def record_board_scrape(job_url: str, job_listings: list) -> dict:
+    """
+    Diff a fresh scrape of a board against its previous scrape
+
+    Args:
+        job_url: URL of the scraped board
+        job_listings: Listings scraped from it
+
+    Returns:
+        The changes, see ChangeDetector.apply
+    """
+    changes = change_detector.apply(job_url, job_listings)
+    if SYNC_VECTOR_STORE and changes["removed"]:
+        try:
+            expire_jobs_local([job["url"] for job in changes["removed"] if job.get("url")])
+        except Exception as e:
+            logger.error(f"Error expiring listings in the vector store: {str(e)}")
+    return changes
+
+
+def embed_board_listings(job_url: str, job_listings: list, job_texts: list):
+    """
+    Embed listings of a scraped board, reusing the embeddings of listings that did not change
+    since they were last embedded
+
+    Args:
+        job_url: URL of the scraped board
+        job_listings: Listings scraped from it, recorded with record_board_scrape
+        job_texts: Text to embed for each listing
+
+    Returns:
+        Array of job embeddings in the order of job_listings
+    """
+    embeddings = change_detector.get_embeddings(job_url, job_listings, EMBEDDING_SIGNATURE)
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        new_embs = compute_document_embeddings([job_texts[i] for i in missing])
+        if new_embs.size == 0:
+            return new_embs
+        change_detector.store_embeddings(job_url, [job_listings[i] for i in missing], new_embs, EMBEDDING_SIGNATURE)
+        for i, embedding in zip(missing, new_embs):
+            embeddings[i] = embedding
+    logger.info(f"Embedded {len(missing)} of {len(job_listings)} listings, reused the rest")
+
+    if SYNC_VECTOR_STORE and missing:
+        try:
+            for i in missing:
+                add_job_local(dict(job_listings[i], description=job_texts[i]), embeddings[i])
+        except Exception as e:
+            logger.error(f"Error syncing listings to the vector store: {str(e)}")
+    return np.vstack(embeddings) if embeddings else np.array([])
+
+
+def complete_resume_task(
+    task_id: str,
+    resume_text: str,
+    resume_emb: np.ndarray,
+    resume_hash: str,
+    job_listings: list,
+    job_texts: list,
+    job_titles: list,
+    job_embs: np.ndarray
+) -> None:
+    """
+    Rank scraped listings for a parsed resume and store the results on its task
+
+    Args:
+        task_id: ID of the resume's task
+        resume_text: Text of the resume
+        resume_emb: Embedding of the resume
+        resume_hash: Identifier of the resume in the ResumeStore
+        job_listings: Deduplicated listings
+        job_texts: Text of each listing
+        job_titles: Title of each listing
+        job_embs: Embedding of each listing
+    """
+    # Max-sim scoring compares every resume chunk with every job chunk (chunks are cached)
+    job_similarities = None
+    if EMBEDDING_POOLING == "maxsim":
+        chunk_embeddings = compute_chunk_embeddings([resume_text] + job_texts)
+        if chunk_embeddings:
+            job_similarities = max_sim_scores(chunk_embeddings[0], chunk_embeddings[1:])
+    
+    # Rank jobs based on advanced similarity algorithms
+    logger.info("Using enhanced job matching algorithm")
+    top_matches = rank_jobs(
+        resume_embedding=resume_emb, 
+        job_embeddings=job_embs, 
+        resume_text=resume_text, 
+        job_texts=job_texts,
+        job_titles=job_titles,
+        limit=len(job_listings),
+        similarity_scores=job_similarities,
+        # Requirements are extracted (or read from the store) for the shortlisted listings only
+        feature_lookup=feature_store.get_or_compute_many
+    )
+    
+    # Create results with scores
+    results = []
+    for idx, score in top_matches:
+        job = job_listings[idx].copy()
+        job["match_score"] = float(score)
+        results.append(job)
+    
+    # Export to CSV
+    csv_path = RESULTS_DIR / f"{task_id}_results.csv"
+    export_to_csv(results, str(csv_path))
+    
+    # Update task with results
+    task_data = tasks[task_id]
+    task_data["status"] = "completed"
+    task_data["resume_hash"] = resume_hash
+    task_data["results"] = results
+    task_data["csv_path"] = str(csv_path)
+    add_task(task_id, task_data)
+
+
+def match_scraped_listings(
+    task_id: str,
+    resume_text: str,
+    resume_skills: list,
+    resume_cached: bool,
+    job_listings: list
+) -> None:
+    """
+    Deduplicate and embed the listings scraped for an upload, embed its resume unless stored
+    already, then rank the listings and store the results on the task
+
+    Args:
+        task_id: ID of the upload's task
+        resume_text: Text of the resume
+        resume_skills: Skills extracted from the resume
+        resume_cached: Whether the resume was found in the resume store
+        job_listings: Listings scraped from the task's job board
+    """
+    task = tasks[task_id]
+    file_path = task["file_path"]
+    file_sha256 = task.get("file_sha256")
+    job_url = task["job_url"]
+    job_listings = dedup_index.deduplicate(job_listings, job_url)
+
+    # Compute embeddings for resume
+    resume_hash = resume_text_hash(resume_text)
+    resume_emb = resume_store.get_embedding(resume_hash) if resume_cached else None
+    if resume_emb is None:
+        resume_embs = compute_document_embeddings([resume_text])
+        if resume_embs.size == 0:
+            raise ValueError("Failed to compute embeddings for resume")
+
+        resume_emb = resume_embs[0]
+
+        # Keep the parsed resume so it can be found again by /resumes/search
+        resume_store.add(
+            resume_hash,
+            resume_text,
+            extract_structured_resume(resume_text),
+            resume_emb,
+            {
+                "filename": task.get("filename") or Path(file_path).name,
+                "task_id": task_id,
+                "file_sha256": file_sha256,
+                "skills": resume_skills
+            }
+        )
+
+    # Compute embeddings for jobs (robust to missing description)
+    job_texts = [job.get("description") or job.get("title") or "" for job in job_listings]
+    job_titles = [job.get("title", "") for job in job_listings]
+    record_board_scrape(job_url, job_listings)
+    job_embs = embed_board_listings(job_url, job_listings, job_texts)
+    if job_embs.size == 0:
+        raise ValueError("Failed to compute embeddings for job descriptions")
+
+    complete_resume_task(
+        task_id, resume_text, resume_emb, resume_hash,
+        job_listings, job_texts, job_titles, job_embs
+    )
+
+
 async def process_resume_and_jobs(task_id: str):
     try:
         task = tasks[task_id]
         file_path = task["file_path"]
         job_url = task["job_url"]
         
-        # Extract text from resume
-        resume_text = extract_text(file_path)
-        if not resume_text:
-            raise ValueError("Failed to extract text from resume. The file may be empty or corrupted.")
-
-        # Extract skills from resume
-        resume_skills = extract_skills(resume_text)
+        # A file uploaded before is not parsed again
+        file_sha256 = task.get("file_sha256")
+        cached_hash = resume_store.find_by_file_hash(file_sha256) if file_sha256 else None
+        cached_resume = resume_store.get(cached_hash) if cached_hash else None
+        if cached_resume and "skills" in cached_resume:
+            logger.info(f"Reusing parsed resume {cached_hash} for upload {file_sha256}")
+            resume_text = cached_resume["text"]
+            resume_skills = cached_resume["skills"]
+        else:
+            # Extract text from resume
+            resume_text = await asyncio.to_thread(extract_text, file_path)
+            if not resume_text:
+                raise ValueError("Failed to extract text from resume. The file may be empty or corrupted.")
+
+            # Extract skills from resume
+            resume_skills = extract_skills(resume_text)
         
         # Store resume skills for potential use in advanced matching
         import sys
@@ -176,7 +525,7 @@ async def process_resume_and_jobs(task_id: str):
         
         # Scrape job listings with enhanced retry mechanisms
         logger.info(f"Initiating job scraping from URL: {job_url} with enhanced retry and anti-detection")
-        job_listings = scrape_jobs(job_url)
+        job_listings = await asyncio.to_thread(scrape_coordinator.scrape, job_url)
         
         # Check if we have valid job listings - our enhanced scraper should handle all cases
         if not job_listings:
@@ -185,56 +534,366 @@ async def process_resume_and_jobs(task_id: str):
         
         # Log scraping results
         logger.info(f"Successfully scraped {len(job_listings)} valid job listings from {job_url}")
+        # Embedding and ranking block on the model: run them off the event loop, so concurrent
+        # uploads reach the embedding service together and are batched
+        await asyncio.to_thread(
+            match_scraped_listings, task_id, resume_text, resume_skills, bool(cached_resume), job_listings
+        )
         
-        # Compute embeddings for resume
-        resume_embs = compute_embeddings([resume_text])
-        if resume_embs.size == 0:
-            raise ValueError("Failed to compute embeddings for resume")
-        
-        resume_emb = resume_embs[0]
+    except Exception as e:
+        logger.error(f"Error processing task {task_id}: {str(e)}", exc_info=True)
+        task_data = tasks[task_id]
+        task_data["status"] = "failed"
+        task_data["error"] = str(e)
+        add_task(task_id, task_data)
+    
+    task_data = tasks[task_id]
+    if task_data.get("result_key"):
+        result_cache.finish(task_data["result_key"], task_id, task_data["status"] == "completed")
+
+
+def fail_task(task_id: str, error: str) -> None:
+    task_data = tasks[task_id]
+    task_data["status"] = "failed"
+    task_data["error"] = error
+    add_task(task_id, task_data)
+
+
+def process_resume_batch(batch_id: str) -> None:
+    """
+    Process a batch upload: parse its resumes in parallel, scrape and embed the job board once,
+    then rank the listings for every resume
+
+    Args:
+        batch_id: ID of the batch task
+    """
+    batch = tasks[batch_id]
+    job_url = batch["job_url"]
+    task_ids = [handle["task_id"] for handle in batch["resumes"]]
+    parsed = {}
+    try:
+        # Resumes parsed before are reused, the rest are parsed in worker processes
+        to_parse = []
+        for task_id in task_ids:
+            cached_hash = resume_store.find_by_file_hash(tasks[task_id]["file_sha256"])
+            cached_resume = resume_store.get(cached_hash) if cached_hash else None
+            if cached_resume and "skills" in cached_resume:
+                parsed[task_id] = {"text": cached_resume["text"], "skills": cached_resume["skills"]}
+            else:
+                to_parse.append(task_id)
+        logger.info(f"Batch {batch_id}: parsing {len(to_parse)} of {len(task_ids)} resumes")
+        for task_id, result in zip(to_parse, parse_resumes([tasks[task_id]["file_path"] for task_id in to_parse])):
+            if "error" in result:
+                fail_task(task_id, f"Failed to extract text from resume: {result['error']}")
+            else:
+                parsed[task_id] = result
+        if not parsed:
+            raise ValueError("None of the resumes could be parsed")
         
-        # Compute embeddings for jobs (robust to missing description)
+        # One scrape and one embedding pass of the job board for the whole batch
+        job_listings = scrape_coordinator.scrape(job_url)
+        if not job_listings:
+            raise ValueError(f"Could not extract any job listings from URL: {job_url}. Please check if the URL is valid and accessible or try a different job search site.")
+        job_listings = dedup_index.deduplicate(job_listings, job_url)
         job_texts = [job.get("description") or job.get("title") or "" for job in job_listings]
         job_titles = [job.get("title", "") for job in job_listings]
-        job_embs = compute_embeddings(job_texts)
+        record_board_scrape(job_url, job_listings)
+        job_embs = embed_board_listings(job_url, job_listings, job_texts)
         if job_embs.size == 0:
             raise ValueError("Failed to compute embeddings for job descriptions")
         
-        # Rank jobs based on advanced similarity algorithms
-        logger.info("Using enhanced job matching algorithm")
-        top_matches = rank_jobs(
-            resume_embedding=resume_emb, 
-            job_embeddings=job_embs, 
-            resume_text=resume_text, 
-            job_texts=job_texts,
-            job_titles=job_titles,
-            limit=len(job_listings)
-        )
-        
-        # Create results with scores
-        results = []
-        for idx, score in top_matches:
-            job = job_listings[idx].copy()
-            job["match_score"] = float(score)
-            results.append(job)
-        
-        # Export to CSV
-        csv_path = RESULTS_DIR / f"{task_id}_results.csv"
-        export_to_csv(results, str(csv_path))
-        
-        # Update task with results
-        task_data = tasks[task_id]
-        task_data["status"] = "completed"
-        task_data["results"] = results
-        task_data["csv_path"] = str(csv_path)
-        add_task(task_id, task_data)
+        # Embed the resumes not already in the resume store in one pass
+        resume_hashes = {task_id: resume_text_hash(parsed[task_id]["text"]) for task_id in parsed}
+        resume_embs = {task_id: resume_store.get_embedding(resume_hashes[task_id]) for task_id in parsed}
+        missing = [task_id for task_id, embedding in resume_embs.items() if embedding is None]
+        if missing:
+            new_embs = compute_document_embeddings([parsed[task_id]["text"] for task_id in missing])
+            if new_embs.size == 0:
+                raise ValueError("Failed to compute embeddings for resumes")
+            for task_id, embedding in zip(missing, new_embs):
+                resume_embs[task_id] = embedding
+                resume_store.add(
+                    resume_hashes[task_id],
+                    parsed[task_id]["text"],
+                    extract_structured_resume(parsed[task_id]["text"]),
+                    embedding,
+                    {
+                        "filename": tasks[task_id]["filename"],
+                        "task_id": task_id,
+                        "file_sha256": tasks[task_id]["file_sha256"],
+                        "skills": parsed[task_id]["skills"]
+                    },
+                    save=False
+                )
+            resume_store.save()
         
+        for task_id in parsed:
+            try:
+                complete_resume_task(
+                    task_id, parsed[task_id]["text"], resume_embs[task_id], resume_hashes[task_id],
+                    job_listings, job_texts, job_titles, job_embs
+                )
+            except Exception as e:
+                logger.error(f"Error processing task {task_id} of batch {batch_id}: {str(e)}", exc_info=True)
+                fail_task(task_id, str(e))
+        batch["status"] = "completed"
     except Exception as e:
-        logger.error(f"Error processing task {task_id}: {str(e)}", exc_info=True)
-        task_data = tasks[task_id]
-        task_data["status"] = "failed"
-        task_data["error"] = str(e)
-        add_task(task_id, task_data)
+        logger.error(f"Error processing batch {batch_id}: {str(e)}", exc_info=True)
+        for task_id in task_ids:
+            if tasks[task_id]["status"] == "processing":
+                fail_task(task_id, str(e))
+        batch["status"] = "failed"
+        batch["error"] = str(e)
+    
+    batch["results"] = [
+        dict(handle, status=tasks[handle["task_id"]]["status"], error=tasks[handle["task_id"]].get("error"))
+        for handle in batch["resumes"]
+    ]
+    add_task(batch_id, batch)
+    logger.info(f"Batch {batch_id} {batch['status']}: {len(parsed)} of {len(task_ids)} resumes parsed")
+
+
+@app.post("/match/batch")
+async def match_batch(request: Dict[str, Any]):
+    """
+    Score many resumes against the same job pool.
+    
+    Expects {"resumes": [resume text, ...], "jobs": [{"title": ..., "description": ...}, ...], "top_k": 10}
+    and returns the top_k matches for every resume.
+    """
+    resumes = request.get("resumes") or []
+    jobs = request.get("jobs") or []
+    top_k = int(request.get("top_k", 10))
+    if not resumes or not jobs:
+        raise HTTPException(status_code=400, detail="Both 'resumes' and 'jobs' must be non-empty lists")
+    
+    job_texts = [job.get("description") or job.get("title") or "" for job in jobs]
+    job_titles = [job.get("title", "") for job in jobs]
+    matches = await asyncio.to_thread(
+        job_matcher.match_resumes_to_jobs, resumes, job_texts, job_titles, top_k
+    )
+    return {
+        "results": [
+            {"resume_index": i, "matches": resume_matches}
+            for i, resume_matches in enumerate(matches)
+        ]
+    }
+
+
+@app.post("/resumes/search")
+async def search_resumes(request: Dict[str, Any]):
+    """
+    Rank previously uploaded resumes for a job.
+    
+    Expects {"description": job description, "title": optional job title, "top_k": 10}.
+    """
+    description = request.get("description") or ""
+    title = request.get("title") or ""
+    top_k = int(request.get("top_k", 10))
+    if not description and not title:
+        raise HTTPException(status_code=400, detail="A job 'description' or 'title' is required")
+    
+    results = await asyncio.to_thread(resume_store.search_for_job, description, title, top_k)
+    return {"results": results}
+
+
+def run_saved_search(search_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Run a saved search once: re-scrape its boards and score only the listings it has not
+    reported before (new or changed since), using the stored resume
+
+    Args:
+        search_id: The ID of the saved search
+
+    Returns:
+        The delta of new matches, or None if there were none, the run failed, or another run
+        of the search is in progress
+    """
+    # Claimed before scraping, so two runs never report the same listings from the same seen set
+    search = saved_searches.claim(search_id)
+    if not search:
+        logger.info(f"Saved search {search_id} is missing or already running, skipping")
+        return None
+    seen = dict(search.get("seen") or {})
+    filters = search.get("filters") or {}
+    matches = []
+    reported = set()
+    try:
+        resume = resume_store.get(search["resume_hash"])
+        resume_emb = resume_store.get_embedding(search["resume_hash"])
+        if not resume or resume_emb is None:
+            raise ValueError(f"Resume {search['resume_hash']} is not in the resume store, upload it again")
+
+        for job_url in search["job_urls"]:
+            job_listings = scrape_coordinator.scrape(job_url)
+            if not job_listings:
+                logger.warning(f"Saved search {search_id}: no listings scraped from {job_url}")
+                continue
+            job_listings = dedup_index.deduplicate(job_listings, job_url)
+            record_board_scrape(job_url, job_listings)
+
+            board_key = normalize_url(job_url)
+            board_seen = seen.get(board_key, {})
+            fingerprints = [listing_fingerprint(job, job_url) for job in job_listings]
+            fresh = [
+                job for job, (key, content_hash) in zip(job_listings, fingerprints)
+                if board_seen.get(key) != content_hash
+            ]
+
+            fresh = apply_filters(fresh, filters)
+            if not fresh:
+                seen[board_key] = dict(fingerprints)
+                continue
+            job_texts = [job.get("description") or job.get("title") or "" for job in fresh]
+            job_titles = [job.get("title", "") for job in fresh]
+            job_embs = embed_board_listings(job_url, fresh, job_texts)
+            if job_embs.size == 0:
+                # Not marked as seen, so the listings are scored again on the next run
+                logger.warning(f"Saved search {search_id}: failed to embed the listings of {job_url}")
+                continue
+            top_matches = rank_jobs(
+                resume_embedding=resume_emb,
+                job_embeddings=job_embs,
+                resume_text=resume["text"],
+                job_texts=job_texts,
+                job_titles=job_titles,
+                limit=len(fresh),
+                feature_lookup=feature_store.get_or_compute_many
+            )
+            if not top_matches:
+                logger.warning(f"Saved search {search_id}: failed to score the listings of {job_url}")
+                continue
+            # Listings gone from the board are forgotten, so the seen set stays board-sized
+            seen[board_key] = dict(fingerprints)
+            for idx, score in top_matches:
+                # A posting listed on several monitored boards is reported once
+                if score >= float(filters.get("min_score", 0)) and fresh[idx]["dedup_id"] not in reported:
+                    reported.add(fresh[idx]["dedup_id"])
+                    matches.append(dict(fresh[idx], match_score=float(score), board_url=job_url))
+
+        matches.sort(key=lambda job: job["match_score"], reverse=True)
+        if filters.get("limit"):
+            matches = matches[:int(filters["limit"])]
+        delta = saved_searches.record_run(search_id, seen, matches)
+    except Exception as e:
+        logger.error(f"Error running saved search {search_id}: {str(e)}", exc_info=True)
+        saved_searches.record_run(search_id, search.get("seen") or {}, [], error=str(e))
+        return None
+
+    logger.info(f"Saved search {search_id}: {len(matches)} new matches")
+    if delta and search.get("webhook_url"):
+        notify_webhook(search, delta)
+    return delta
+
+
+def notify_webhook(search: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """Post a saved search delta to its webhook; failures are logged, not raised."""
+    # Checked again at send time: the host may resolve elsewhere than when the search was saved
+    if not is_public_url(search["webhook_url"]):
+        logger.warning(f"Not notifying webhook of saved search {search['id']}: {search['webhook_url']} is not a public URL")
+        return
+    try:
+        response = http_client.request(
+            "POST", search["webhook_url"],
+            json={"search_id": search["id"], "resume_hash": search["resume_hash"], **delta},
+            timeout=10,
+            follow_redirects=False
+        )
+        if response.status_code >= 400:
+            logger.warning(f"Webhook for saved search {search['id']} returned {response.status_code}")
+    except Exception as e:
+        logger.error(f"Error notifying webhook for saved search {search['id']}: {str(e)}")
+
+
+async def saved_search_scheduler():
+    """Run due saved searches one at a time, forever"""
+    while True:
+        try:
+            for search_id in saved_searches.due():
+                await asyncio.to_thread(run_saved_search, search_id)
+        except Exception as e:
+            logger.error(f"Error in saved search scheduler: {str(e)}", exc_info=True)
+        await asyncio.sleep(SAVED_SEARCH_POLL_SECONDS)
+
+
+@app.on_event("startup")
+async def start_saved_search_scheduler():
+    if SAVED_SEARCH_POLL_SECONDS > 0:
+        app.state.saved_search_scheduler = asyncio.create_task(saved_search_scheduler())
+        logger.info(f"Saved search scheduler started ({len(saved_searches.get_all())} searches)")
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    # Close the pooled connections of the shared HTTP client (blocks on its loop, so not on ours)
+    await asyncio.to_thread(http_client.close)
+
+
+def _saved_search_summary(search: Dict[str, Any]) -> Dict[str, Any]:
+    summary = {key: value for key, value in search.items() if key not in ("seen", "deltas")}
+    summary["delta_count"] = len(search.get("deltas", []))
+    return summary
+
+
+@app.post("/saved-searches")
+async def create_saved_search(request: Dict[str, Any]):
+    """
+    Save a search that is re-run in the background.
+    
+    Expects {"resume_hash": ... or "task_id": ..., "job_urls": [...] or "job_url": ...,
+    "filters": {"keywords", "exclude_keywords", "location", "min_score", "limit"},
+    "interval_minutes": 1440, "webhook_url": optional}.
+    """
+    resume_hash = request.get("resume_hash")
+    if not resume_hash and request.get("task_id"):
+        resume_hash = tasks.get(request["task_id"], {}).get("resume_hash")
+    if not resume_hash or not resume_store.get(resume_hash):
+        raise HTTPException(status_code=404, detail="Resume not found, upload it first")
+    job_urls = request.get("job_urls") or ([request["job_url"]] if request.get("job_url") else [])
+    if not job_urls:
+        raise HTTPException(status_code=400, detail="At least one job URL is required")
+    if request.get("webhook_url") and not is_public_url(request["webhook_url"]):
+        raise HTTPException(status_code=400, detail="The webhook URL must be a public http(s) URL")
+    
+    search = saved_searches.add(
+        str(uuid.uuid4()),
+        resume_hash,
+        job_urls,
+        request.get("filters") or {},
+        int(request.get("interval_minutes", SAVED_SEARCH_INTERVAL_MINUTES)),
+        request.get("webhook_url")
+    )
+    return _saved_search_summary(search)
+
+
+@app.get("/saved-searches")
+async def list_saved_searches():
+    return {"results": [_saved_search_summary(search) for search in saved_searches.get_all().values()]}
+
+
+@app.get("/saved-searches/{search_id}/deltas")
+async def get_saved_search_deltas(search_id: str, since: float = 0.0):
+    """New matches found by a saved search, per run, after the `since` timestamp"""
+    if not saved_searches.get(search_id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return {"results": saved_searches.deltas(search_id, since)}
+
+
+@app.post("/saved-searches/{search_id}/run")
+async def run_saved_search_now(search_id: str):
+    if not saved_searches.get(search_id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    if saved_searches.running(search_id):
+        raise HTTPException(status_code=409, detail="Saved search is already running")
+    delta = await asyncio.to_thread(run_saved_search, search_id)
+    return {"delta": delta, "last_error": saved_searches.get(search_id).get("last_error")}
+
+
+@app.delete("/saved-searches/{search_id}")
+async def delete_saved_search(search_id: str):
+    if not saved_searches.delete(search_id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return {"status": "deleted"}
 
 
 @app.get("/results/{task_id}")
@@ -248,20 +907,26 @@ async def get_results(task_id: str):
         return {
             "status": "completed",
             "results": task["results"],
-            "csv_url": f"/download/{task_id}"
+            "csv_url": f"/download/{task_id}" if task.get("csv_path") else None
         }
     elif task["status"] == "failed":
         return {
             "status": "failed",
             "error": task.get("error", "Unknown error")
         }
+    elif task.get("resumes"):
+        # A batch in progress reports the status of each of its resumes
+        return {
+            "status": "processing",
+            "results": [dict(handle, status=tasks[handle["task_id"]]["status"]) for handle in task["resumes"]]
+        }
     else:
         return {"status": "processing"}
 
 
 @app.get("/download/{task_id}")
 async def download_csv(task_id: str):
-    if task_id not in tasks or tasks[task_id]["status"] != "completed":
+    if task_id not in tasks or tasks[task_id]["status"] != "completed" or not tasks[task_id].get("csv_path"):
         raise HTTPException(status_code=404, detail="Results not ready or task not found")
     
     # Serve the file for download
@@ -277,20 +942,22 @@ async def serve_uploaded_file(file_id: str):
         # Log the request
         logging.info(f"Serving file with ID: {file_id}")
         
-        # Look for the file in the uploads directory
-        matching_files = list(UPLOAD_DIR.glob(f"{file_id}*"))
+        # Files are stored under their content hash; a task ID resolves to its task's file
+        if file_id in tasks and tasks[file_id].get("file_path"):
+            file_path = Path(tasks[file_id]["file_path"])
+            filename = tasks[file_id].get("filename")
+        else:
+            file_path = find_upload(UPLOAD_DIR, file_id)
+            filename = None
         
-        if not matching_files:
+        if file_path is None or not file_path.exists():
             logging.warning(f"File not found with ID: {file_id}")
-            # List available files to help with debugging
-            available_files = list(UPLOAD_DIR.glob("*"))
-            logging.info(f"Available files: {[f.name for f in available_files]}")
             raise HTTPException(status_code=404, detail=f"File not found with ID: {file_id}")
         
-        # If we find a file that starts with the ID, serve it
-        file_path = matching_files[0]
         logging.info(f"Found file: {file_path.name}")
-        return FileResponse(path=str(file_path))
+        return FileResponse(path=str(file_path), filename=filename)
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error serving file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error serving file: {str(e)}")
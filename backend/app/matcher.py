@@ -1,32 +1,151 @@
-from typing import List, Tuple, Dict, Any, Set, Optional
+from typing import List, Tuple, Dict, Any, Set, Optional, Callable
 import numpy as np
 import logging
 import re
-import spacy
-from collections import Counter
-from sentence_transformers import SentenceTransformer
+import os
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from .models import get_model
+from .embedding_service import EmbeddingService
 
 # Get module logger
 logger = logging.getLogger("job_search_app.matcher")
 
 
-# Load the sentence transformer model for embeddings, always using GPU if available
-try:
-    import torch
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = SentenceTransformer('all-MiniLM-L6-v2', device=device)
-    logger.info(f"Successfully loaded SentenceTransformer model on device: {device}")
-except Exception as e:
-    logger.error(f"Error loading SentenceTransformer model: {str(e)}", exc_info=True)
-    # Create fallback transformer (will not work as well but prevents crash)
-    class FallbackTransformer:
-        def encode(self, texts, **kwargs):
-            logger.warning("Using fallback encoder - results will be random")
-            if isinstance(texts, str):
-                return np.random.rand(384)  # Single embedding vector
-            else:
-                return np.random.rand(len(texts), 384)  # Batch of embedding vectors
-    model = FallbackTransformer()
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Embedding inference backend, selectable for CPU-only hosts:
+#   "torch" - fp32 PyTorch (default, uses GPU if available)
+#   "int8"  - PyTorch with dynamic int8 quantization of the Linear layers (CPU)
+#   "onnx"  - ONNX Runtime (CPU), requires sentence-transformers[onnx]>=3.2 (requirements-onnx.txt)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+# ONNX file inside the model repository used by the "onnx" backend
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx2.onnx")
+
+class FallbackTransformer:
+    """Fallback encoder used when no model can be loaded (will not work as well but prevents crash)"""
+    is_fallback = True
+
+    def encode(self, texts, **kwargs):
+        logger.warning("Using fallback encoder - results will be random")
+        if isinstance(texts, str):
+            return np.random.rand(384)  # Single embedding vector
+        else:
+            return np.random.rand(len(texts), 384)  # Batch of embedding vectors
+
+def load_embedding_model(backend: str = EMBEDDING_BACKEND, fallback: bool = True):
+    """
+    Load the sentence transformer model with the requested inference backend
+    
+    Args:
+        backend: One of "torch", "int8" or "onnx"
+        fallback: Whether a failure is recovered from; otherwise the loading error is raised
+        
+    Returns:
+        A model exposing encode(). If the int8 or onnx backend fails to load, the fp32 torch
+        model is returned; a FallbackTransformer only if torch itself fails.
+    """
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+        if backend == "onnx":
+            model = SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu", backend="onnx",
+                                        model_kwargs={"file_name": EMBEDDING_ONNX_FILE})
+            device = "cpu"
+        elif backend == "int8":
+            model = SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+            torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+            device = "cpu"
+        else:
+            # Always use GPU if available
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            model = SentenceTransformer(EMBEDDING_MODEL_NAME, device=device)
+        logger.info(f"Successfully loaded SentenceTransformer model with {backend} backend on device: {device}")
+        return model
+    except Exception as e:
+        if not fallback:
+            raise
+        logger.error(f"Error loading SentenceTransformer model with {backend} backend: {str(e)}", exc_info=True)
+        if backend != "torch":
+            # Slower, but the same embeddings; never random ones for a misconfigured backend
+            logger.warning(f"Falling back to the torch backend instead of {backend}")
+            return load_embedding_model("torch")
+        return FallbackTransformer()
+
+def get_embedding_model():
+    """The shared sentence transformer model, loaded on first use (see models.py)"""
+    return get_model("embedding")
+
+# Length-aware batching: each encode call is limited to EMBEDDING_TOKEN_BUDGET padded tokens
+# (batch size x longest text in the batch) and EMBEDDING_MAX_BATCH_SIZE texts
+EMBEDDING_TOKEN_BUDGET = int(os.getenv("EMBEDDING_TOKEN_BUDGET", "16384"))
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "128"))
+# Average characters per token, used to estimate the length of a text when the model has no tokenizer
+AVG_CHARS_PER_TOKEN = 4
+
+def _truncate_to_window(model, texts: List[str], window: int) -> Tuple[List[str], List[int]]:
+    """
+    Cut texts at the model window with the model's own tokenizer
+    
+    Args:
+        model: The embedding model
+        texts: List of text strings, whitespace already collapsed
+        window: Maximum number of tokens (special tokens included) the model reads
+        
+    Returns:
+        Tuple of (texts cut after their last token within the window, token count of each)
+    """
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return texts, [min(window, len(text) // AVG_CHARS_PER_TOKEN + 2) for text in texts]
+    fast = getattr(tokenizer, "is_fast", False)
+    encoded = tokenizer(texts, truncation=True, max_length=window, return_offsets_mapping=fast)
+    lengths = [len(input_ids) for input_ids in encoded["input_ids"]]
+    if not fast:
+        # Without offsets the model truncates the same way when it tokenizes again
+        return texts, lengths
+    # The kept text ends where the last token inside the window ends (special tokens map to (0, 0))
+    cut = [text[:max((end for _, end in offsets), default=0)] for text, offsets in zip(texts, encoded["offset_mapping"])]
+    return cut, lengths
+
+def _encode_length_bucketed(texts: List[str]) -> np.ndarray:
+    """
+    Encode texts in batches of similar length sized from the token budget, in input order
+    
+    Args:
+        texts: List of text strings
+        
+    Returns:
+        Numpy array of embeddings, one row per text
+    """
+    model = get_embedding_model()
+    window = getattr(model, "max_seq_length", None) or 256
+    
+    # Collapse whitespace (the tokenizer splits on it anyway), then cut every text after its last
+    # token within the model window and bucket by token count
+    truncated, token_counts = _truncate_to_window(model, [" ".join((text or "").split()) for text in texts], window)
+    
+    # Sorted by length, the last text of a batch is the one every other text is padded to
+    order = sorted(range(len(truncated)), key=lambda i: token_counts[i])
+    embeddings = [None] * len(truncated)
+    start = 0
+    while start < len(order):
+        end = start + 1
+        while (end < len(order) and end - start < EMBEDDING_MAX_BATCH_SIZE
+               and (end - start + 1) * token_counts[order[end]] <= EMBEDDING_TOKEN_BUDGET):
+            end += 1
+        batch = order[start:end]
+        batch_embeddings = model.encode([truncated[i] for i in batch], batch_size=len(batch), show_progress_bar=False)
+        for i, embedding in zip(batch, np.atleast_2d(batch_embeddings)):
+            embeddings[i] = embedding
+        start = end
+    
+    return np.vstack(embeddings)
+
+# Encode requests of concurrent tasks are coalesced into micro-batches on one thread
+EMBEDDING_MICROBATCH = os.getenv("EMBEDDING_MICROBATCH", "true").lower() == "true"
+embedding_service = EmbeddingService(_encode_length_bucketed)
 
 def compute_embeddings(texts: List[str]) -> np.ndarray:
     """
@@ -43,7 +162,10 @@ def compute_embeddings(texts: List[str]) -> np.ndarray:
             logger.warning("No texts provided for embedding computation")
             return np.array([])
             
-        embeddings = model.encode(texts, show_progress_bar=False)
+        if EMBEDDING_MICROBATCH:
+            embeddings = embedding_service.encode(texts)
+        else:
+            embeddings = _encode_length_bucketed(texts)
         
         logger.info(f"Successfully created {len(embeddings)} embeddings with dimension {embeddings.shape[1]}")
         return embeddings
@@ -52,13 +174,132 @@ def compute_embeddings(texts: List[str]) -> np.ndarray:
         logger.error(f"Error computing embeddings: {str(e)}", exc_info=True)
         return np.array([])
 
-# Try loading spaCy for better NLP analysis
-try:
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("Successfully loaded spaCy model")
-except Exception as e:
-    logger.error(f"Error loading spaCy model: {e}")
-    nlp = None
+# Chunked embeddings for long documents: overlapping windows of EMBEDDING_CHUNK_WORDS words
+# (EMBEDDING_CHUNK_OVERLAP shared between neighbours) embedded separately and pooled per document.
+# EMBEDDING_POOLING is "none" (single truncated embedding), "mean", "max" or "maxsim"
+# (mean-pooled vectors, with job similarity taken as the best resume chunk x job chunk match)
+EMBEDDING_POOLING = os.getenv("EMBEDDING_POOLING", "none").lower()
+EMBEDDING_CHUNK_WORDS = int(os.getenv("EMBEDDING_CHUNK_WORDS", "160"))
+EMBEDDING_CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "32"))
+# Identifies document embeddings persisted across runs; they are recomputed when it changes
+EMBEDDING_SIGNATURE = (
+    f"{EMBEDDING_MODEL_NAME}:{EMBEDDING_BACKEND}:{EMBEDDING_POOLING}:"
+    f"{EMBEDDING_CHUNK_WORDS}:{EMBEDDING_CHUNK_OVERLAP}"
+)
+# Number of documents whose chunk embeddings are kept in memory
+CHUNK_CACHE_SIZE = int(os.getenv("EMBEDDING_CHUNK_CACHE_SIZE", "4096"))
+
+_chunk_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_chunk_cache_lock = threading.Lock()
+
+def split_into_chunks(text: str, chunk_words: int = EMBEDDING_CHUNK_WORDS,
+                      overlap: int = EMBEDDING_CHUNK_OVERLAP) -> List[str]:
+    """
+    Split a document into overlapping word windows
+    
+    Args:
+        text: Document text
+        chunk_words: Number of words per chunk
+        overlap: Number of words shared by consecutive chunks
+        
+    Returns:
+        List of chunk texts (a single chunk for short documents)
+    """
+    words = (text or "").split()
+    if len(words) <= chunk_words:
+        return [" ".join(words)]
+    step = max(1, chunk_words - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+def compute_chunk_embeddings(texts: List[str]) -> List[np.ndarray]:
+    """
+    Compute the chunk embeddings of each document, embedding all uncached chunks of all
+    documents in a single batched call
+    
+    Args:
+        texts: List of document texts
+        
+    Returns:
+        One (n_chunks, dim) array per document, or an empty list if embedding fails
+    """
+    params = f"{EMBEDDING_MODEL_NAME}:{EMBEDDING_BACKEND}:{EMBEDDING_CHUNK_WORDS}:{EMBEDDING_CHUNK_OVERLAP}"
+    keys = [hashlib.sha1(f"{params}\x00{text or ''}".encode("utf-8")).hexdigest() for text in texts]
+    
+    results = [None] * len(texts)
+    with _chunk_cache_lock:
+        for i, key in enumerate(keys):
+            if key in _chunk_cache:
+                _chunk_cache.move_to_end(key)
+                results[i] = _chunk_cache[key]
+    
+    # Embed every chunk of every uncached document together
+    missing = [i for i in range(len(texts)) if results[i] is None]
+    if missing:
+        chunks_per_doc = [split_into_chunks(texts[i]) for i in missing]
+        flat_chunks = [chunk for chunks in chunks_per_doc for chunk in chunks]
+        embeddings = compute_embeddings(flat_chunks)
+        if len(embeddings) != len(flat_chunks):
+            return []
+        offset = 0
+        with _chunk_cache_lock:
+            for i, chunks in zip(missing, chunks_per_doc):
+                results[i] = embeddings[offset:offset + len(chunks)]
+                offset += len(chunks)
+                _chunk_cache[keys[i]] = results[i]
+            while len(_chunk_cache) > CHUNK_CACHE_SIZE:
+                _chunk_cache.popitem(last=False)
+        logger.info(f"Embedded {len(flat_chunks)} chunks for {len(missing)} documents ({len(texts) - len(missing)} cached)")
+    
+    return results
+
+def compute_document_embeddings(texts: List[str], pooling: str = EMBEDDING_POOLING) -> np.ndarray:
+    """
+    Compute one embedding per document, pooling chunk embeddings so long documents are
+    represented beyond the model's token window
+    
+    Args:
+        texts: List of document texts
+        pooling: "none" for plain (truncated) embeddings, "mean" or "max" to pool chunk
+            embeddings ("maxsim" uses mean pooling for the document vector)
+        
+    Returns:
+        Numpy array of embeddings
+    """
+    if pooling == "none" or not texts:
+        return compute_embeddings(texts)
+    chunk_embeddings = compute_chunk_embeddings(texts)
+    if not chunk_embeddings:
+        return np.array([])
+    if pooling == "max":
+        return np.vstack([chunks.max(axis=0) for chunks in chunk_embeddings])
+    return np.vstack([chunks.mean(axis=0) for chunks in chunk_embeddings])
+
+def max_sim_scores(query_chunks: np.ndarray, document_chunks: List[np.ndarray]) -> np.ndarray:
+    """
+    Score documents by the best cosine similarity between any query chunk and any document chunk
+    
+    Args:
+        query_chunks: (n_chunks, dim) chunk embeddings of the query document
+        document_chunks: Chunk embeddings of each candidate document
+        
+    Returns:
+        Array with one max-sim score per document
+    """
+    if not document_chunks:
+        return np.array([])
+    query = query_chunks / np.linalg.norm(query_chunks, axis=1, keepdims=True)
+    lengths = [len(chunks) for chunks in document_chunks]
+    stacked = np.vstack(document_chunks)
+    stacked = stacked / np.linalg.norm(stacked, axis=1, keepdims=True)
+    # One matrix multiply over all chunks, then the max within each document's block of columns
+    best_per_chunk = (query @ stacked.T).max(axis=0)
+    boundaries = np.cumsum([0] + lengths[:-1])
+    return np.maximum.reduceat(best_per_chunk, boundaries)
 
 # Common skill terms by category
 TECH_SKILLS = {
@@ -139,6 +380,7 @@ def extract_structured_resume(resume_text: str) -> Dict[str, Any]:
     """
     try:
         # Use spaCy for better text analysis if available
+        nlp = get_model("spacy")
         if nlp:
             doc = nlp(resume_text)
             
@@ -216,6 +458,34 @@ def extract_structured_resume(resume_text: str) -> Dict[str, Any]:
             "experience_level": "unknown"
         }
 
+# Retrieval cascade: embedding similarity shortlists the top MATCH_SHORTLIST_K jobs before the
+# symbolic scorer runs, and the cross-encoder reranks the top MATCH_RERANK_M. 0 disables the shortlist.
+SHORTLIST_K = int(os.getenv("MATCH_SHORTLIST_K", "200"))
+RERANK_M = int(os.getenv("MATCH_RERANK_M", "5"))
+
+# Version of the job requirement extractor. Bump this whenever extract_job_requirements,
+# TECH_SKILLS or ENGINEERING_QUALITIES change so that precomputed job features are recomputed.
+EXTRACTOR_VERSION = "1"
+
+# Version of the ranking itself. Bump this whenever rank_jobs scoring changes so that cached
+# match results are not served any more; MATCHER_VERSION also covers the configuration.
+RANKING_VERSION = "1"
+MATCHER_VERSION = f"{RANKING_VERSION}:{EXTRACTOR_VERSION}:{EMBEDDING_SIGNATURE}:{SHORTLIST_K}:{RERANK_M}"
+
+def job_feature_key(job_text: str, job_title: str = "") -> str:
+    """
+    Build the cache key for a job's precomputed requirement features
+    
+    Args:
+        job_text: The full text of the job description
+        job_title: The job title if available separately
+        
+    Returns:
+        Hex digest identifying the job content
+    """
+    content = f"{job_title or ''}\x00{job_text or ''}"
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
 def extract_job_requirements(job_text: str, job_title: str = "") -> Dict[str, Any]:
     """
     Extract structured requirements from job description
@@ -436,9 +706,91 @@ def calculate_advanced_match_score(resume_data: Dict[str, Any], job_data: Dict[s
             "new_grad_friendly": False
         }
 
+def advanced_match_score_matrix(resume_datas: List[Dict[str, Any]], job_datas: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Vectorized calculate_advanced_match_score for every (resume, job) pair
+    
+    Args:
+        resume_datas: List of extracted resume information
+        job_datas: List of extracted job requirements
+        
+    Returns:
+        Matrix of shape (len(resume_datas), len(job_datas)) with the overall score of each pair
+    """
+    n_resumes, n_jobs = len(resume_datas), len(job_datas)
+    if n_resumes == 0 or n_jobs == 0:
+        return np.zeros((n_resumes, n_jobs))
+    
+    # New grad friendliness only depends on the job
+    new_grad = np.empty(n_jobs)
+    for j, job_data in enumerate(job_datas):
+        penalty = 0
+        if job_data.get("title") and re.search(r'(?i)\b(senior|lead|principal|staff|architect)\b|[^\w](?:II|III|IV|2|3)[^\w]|[^\w](?:sr)[^\w.]', job_data.get("title", "")):
+            penalty += 40
+        if job_data.get("requires_experience", False):
+            penalty += 30
+        new_grad[j] = 100 - penalty
+    
+    # Skills: binary skill matrices turn overlap counting into a single matrix multiply
+    vocabulary = {}
+    for data in resume_datas:
+        for skill in data["skills"]:
+            vocabulary.setdefault(skill, len(vocabulary))
+    resume_skills = np.zeros((n_resumes, len(vocabulary) or 1))
+    for r, data in enumerate(resume_datas):
+        for skill in data["skills"]:
+            resume_skills[r, vocabulary[skill]] = 1
+    
+    def skill_overlap_score(key: str) -> np.ndarray:
+        job_skills = np.zeros((n_jobs, resume_skills.shape[1]))
+        totals = np.zeros(n_jobs)
+        for j, job_data in enumerate(job_datas):
+            totals[j] = len(job_data[key])
+            for skill in job_data[key]:
+                if skill in vocabulary:
+                    job_skills[j, vocabulary[skill]] += 1
+        matched = resume_skills @ job_skills.T
+        return np.minimum(100, np.where(totals > 0, matched / np.maximum(totals, 1) * 100, 0))
+    
+    skills_score = skill_overlap_score("required_skills")
+    preferred_score = skill_overlap_score("preferred_skills")
+    
+    # Experience level: 100 for the same level, 50 one level apart, 0 otherwise
+    exp_levels = {"junior": 1, "mid": 2, "senior": 3, "unknown": 2}
+    resume_levels = np.array([exp_levels.get(data["experience_level"], 2) for data in resume_datas])
+    job_levels = np.array([exp_levels.get(data["experience_level"], 2) for data in job_datas])
+    level_diff = np.abs(resume_levels[:, None] - job_levels[None, :])
+    experience_score = np.select([level_diff == 0, level_diff == 1], [100.0, 50.0], 0.0)
+    
+    # Engineering qualities: mean coverage over the qualities the job mentions, 50 if none
+    quality_names = list(ENGINEERING_QUALITIES.keys())
+    for job_data in job_datas:
+        for quality in job_data["qualities"]:
+            if quality not in quality_names:
+                quality_names.append(quality)
+    quality_sum = np.zeros((n_resumes, n_jobs))
+    quality_count = np.zeros(n_jobs)
+    for quality in quality_names:
+        job_counts = np.array([data["qualities"].get(quality, 0) for data in job_datas], dtype=float)
+        resume_counts = np.array([data["qualities"].get(quality, 0) for data in resume_datas], dtype=float)
+        mentioned = job_counts > 0
+        coverage = np.minimum(resume_counts[:, None] / np.where(mentioned, job_counts, 1)[None, :], 1) * 100
+        quality_sum += np.where(mentioned[None, :], coverage, 0)
+        quality_count += mentioned
+    quality_score = np.where(quality_count > 0, quality_sum / np.maximum(quality_count, 1), 50)
+    
+    overall = (skills_score * 0.25) + (preferred_score * 0.1) + (experience_score * 0.15) + \
+              (quality_score * 0.1) + (new_grad[None, :] * 0.4)
+    return np.round(overall, 2)
+
 def rank_jobs(resume_embedding: np.ndarray, job_embeddings: np.ndarray, 
               resume_text: str = "", job_texts: List[str] = None, 
-              job_titles: List[str] = None, limit: int = 10) -> List[Tuple[int, float]]:
+              job_titles: List[str] = None, limit: int = 10,
+              job_features: Optional[List[Dict[str, Any]]] = None,
+              shortlist_k: Optional[int] = None,
+              similarity_scores: Optional[np.ndarray] = None,
+              feature_lookup: Optional[Callable[[List[str], List[str]], List[Dict[str, Any]]]] = None
+              ) -> List[Tuple[int, float]]:
     """
     Rank jobs based on similarity to resume with advanced scoring
     
@@ -449,6 +801,15 @@ def rank_jobs(resume_embedding: np.ndarray, job_embeddings: np.ndarray,
         job_texts: List of raw job description texts
         job_titles: List of job titles
         limit: Maximum number of jobs to return
+        job_features: Optional precomputed extract_job_requirements output per job,
+            used instead of re-extracting requirements from job_texts
+        shortlist_k: Number of jobs, selected by embedding similarity, that get advanced
+            scoring (defaults to SHORTLIST_K, 0 scores every job)
+        similarity_scores: Optional precomputed resume-job similarity per job (e.g. from
+            max_sim_scores), used instead of the cosine similarity of the embeddings
+        feature_lookup: Optional function returning the features of a list of jobs from their
+            texts and titles (e.g. JobFeatureStore.get_or_compute_many); when job_features is
+            not given it is called once, for the shortlisted jobs only
         
     Returns:
         List of tuples (job_index, similarity_score) sorted by similarity
@@ -459,17 +820,16 @@ def rank_jobs(resume_embedding: np.ndarray, job_embeddings: np.ndarray,
         advanced_scores = []
         
         # Check if we can do embedding similarity
-        if resume_embedding.size > 0 and job_embeddings.size > 0:
+        if similarity_scores is not None and len(similarity_scores) > 0:
+            similarities = list(enumerate(similarity_scores))
+        elif resume_embedding.size > 0 and job_embeddings.size > 0:
             logger.info("Computing embedding similarity scores")
-            for i, job_emb in enumerate(job_embeddings):
-                # Normalize the vectors
-                resume_norm = resume_embedding / np.linalg.norm(resume_embedding)
-                job_norm = job_emb / np.linalg.norm(job_emb)
-                
-                # Compute cosine similarity
-                similarity = np.dot(resume_norm, job_norm)
-                similarities.append((i, similarity))
-            
+            # Cosine similarity of the resume against every job in one matrix-vector product
+            resume_norm = resume_embedding / np.linalg.norm(resume_embedding)
+            job_norms = job_embeddings / np.linalg.norm(job_embeddings, axis=1, keepdims=True)
+            similarities = list(enumerate(job_norms @ resume_norm))
+        
+        if similarities:
             # Sort by similarity (highest first)
             sorted_similarities = sorted(similarities, key=lambda x: x[1], reverse=True)
             
@@ -488,18 +848,37 @@ def rank_jobs(resume_embedding: np.ndarray, job_embeddings: np.ndarray,
             resume_data = extract_structured_resume(resume_text)
             logger.info(f"Extracted {len(resume_data['skills'])} skills from resume")
             
-            # Compute advanced score for each job
-            for i, job_text in enumerate(job_texts):
-                job_title = job_titles[i] if job_titles and i < len(job_titles) else ""
-                job_data = extract_job_requirements(job_text, job_title)
+            # Only the top shortlist_k jobs by embedding similarity get the expensive advanced scoring
+            shortlist_k = SHORTLIST_K if shortlist_k is None else shortlist_k
+            candidates = range(len(job_texts))
+            if shortlist_k and similarities and shortlist_k < len(job_texts):
+                candidates = [idx for idx, _ in sorted_similarities[:shortlist_k]]
+                logger.info(f"Shortlisted {len(candidates)} of {len(job_texts)} jobs by embedding similarity")
+            embedding_scores = dict(similarities)
+            
+            # Features are fetched for the shortlisted jobs only
+            if job_features is None and feature_lookup is not None:
+                candidates = list(candidates)
+                fetched = feature_lookup(
+                    [job_texts[i] for i in candidates],
+                    [job_titles[i] if job_titles and i < len(job_titles) else "" for i in candidates]
+                )
+                job_features = [None] * len(job_texts)
+                for i, features in zip(candidates, fetched):
+                    job_features[i] = features
+            
+            # Compute advanced score for each candidate job
+            for i in candidates:
+                job_text = job_texts[i]
+                if job_features and i < len(job_features) and job_features[i]:
+                    job_data = job_features[i]
+                else:
+                    job_title = job_titles[i] if job_titles and i < len(job_titles) else ""
+                    job_data = extract_job_requirements(job_text, job_title)
                 match_data = calculate_advanced_match_score(resume_data, job_data)
                 
                 # Use advanced score, or cosine similarity if it's available as fallback
-                embedding_score = 0
-                for idx, score in similarities:
-                    if idx == i:
-                        embedding_score = score
-                        break
+                embedding_score = embedding_scores.get(i, 0)
                           # Combine scores: 80% advanced score + 20% embedding similarity
                 # Giving more weight to our structural scoring which includes the new_grad_friendly component
                 combined_score = (match_data["overall_score"] * 0.8 + embedding_score * 100 * 0.2) / 100
@@ -529,3 +908,33 @@ def rank_jobs(resume_embedding: np.ndarray, job_embeddings: np.ndarray,
     except Exception as e:
         logger.error(f"Error ranking jobs: {str(e)}", exc_info=True)
         return []
+
+def cascade_recall(resume_embedding: np.ndarray, job_embeddings: np.ndarray,
+                   resume_text: str, job_texts: List[str], job_titles: List[str] = None,
+                   limit: int = 10, shortlist_k: Optional[int] = None,
+                   job_features: Optional[List[Dict[str, Any]]] = None) -> float:
+    """
+    Measure how many of the exhaustive ranking's top jobs the shortlisted cascade also returns
+    
+    Args:
+        resume_embedding: Embedding vector of the resume
+        job_embeddings: Embedding vectors of job descriptions
+        resume_text: Raw text of the resume
+        job_texts: List of raw job description texts
+        job_titles: List of job titles
+        limit: Size of the top list being compared
+        shortlist_k: Shortlist size of the cascade (defaults to SHORTLIST_K)
+        job_features: Optional precomputed extract_job_requirements output per job
+        
+    Returns:
+        Recall@limit of the cascade relative to scoring every job, between 0 and 1
+    """
+    exhaustive = rank_jobs(resume_embedding, job_embeddings, resume_text, job_texts, job_titles,
+                           limit=limit, job_features=job_features, shortlist_k=0)
+    cascade = rank_jobs(resume_embedding, job_embeddings, resume_text, job_texts, job_titles,
+                        limit=limit, job_features=job_features, shortlist_k=shortlist_k)
+    if not exhaustive:
+        return 1.0
+    expected = {idx for idx, _ in exhaustive}
+    found = {idx for idx, _ in cascade}
+    return len(expected & found) / len(expected)
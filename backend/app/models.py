@@ -0,0 +1,154 @@
+"""
+Registry of the ML models used by the app.
+
+Models are registered by name with a loader and loaded once, on first use or by warmup()
+during startup, so importing the app stays cheap: torch, sentence-transformers and spaCy are
+only imported by the loaders. The load state of every model (not_loaded, loading, ready,
+degraded when a fallback is in use, failed) backs the /ready endpoint.
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("job_search_app.models")
+
+SPACY_MODEL_NAME = os.getenv("SPACY_MODEL_NAME", "en_core_web_sm")
+# Download the spaCy model when it is not installed
+SPACY_AUTO_DOWNLOAD = os.getenv("SPACY_AUTO_DOWNLOAD", "true").lower() == "true"
+CROSS_ENCODER_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+# Models that must be loaded before /ready reports ready; also the ones warmed up at startup
+READY_MODELS = [name.strip() for name in os.getenv("READY_MODELS", "embedding,spacy").split(",") if name.strip()]
+
+_models: Dict[str, Dict[str, Any]] = {}
+
+def register_model(name: str, loader: Callable[[], Any]) -> None:
+    """
+    Register a model loader
+
+    Args:
+        name: Name the model is requested by
+        loader: Function returning the loaded model. It may return None or an object with
+            is_fallback = True when only a fallback could be loaded.
+    """
+    _models[name] = {
+        "loader": loader,
+        "model": None,
+        "status": "not_loaded",
+        "error": None,
+        "load_seconds": None,
+        "lock": threading.Lock()
+    }
+
+def get_model(name: str) -> Any:
+    """
+    Get a model, loading it on first use
+
+    Args:
+        name: Name of a registered model
+
+    Returns:
+        The model, a fallback, or None if it could not be loaded
+    """
+    entry = _models[name]
+    if entry["status"] in ("ready", "degraded", "failed"):
+        return entry["model"]
+    with entry["lock"]:
+        if entry["status"] in ("ready", "degraded", "failed"):
+            return entry["model"]
+        entry["status"] = "loading"
+        start = time.perf_counter()
+        try:
+            model = entry["loader"]()
+            entry["model"] = model
+            entry["status"] = "degraded" if model is None or getattr(model, "is_fallback", False) else "ready"
+        except Exception as e:
+            logger.error(f"Error loading model {name}: {str(e)}", exc_info=True)
+            entry["error"] = str(e)
+            entry["status"] = "failed"
+        entry["load_seconds"] = round(time.perf_counter() - start, 3)
+        logger.info(f"Model {name} {entry['status']} in {entry['load_seconds']}s")
+    return entry["model"]
+
+def is_loaded(name: str) -> bool:
+    """Whether a model finished loading (successfully or not)"""
+    return _models[name]["status"] in ("ready", "degraded", "failed")
+
+def warmup(names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Load models ahead of their first use
+
+    Args:
+        names: Models to load, defaults to READY_MODELS
+
+    Returns:
+        The load state of every model, see model_states
+    """
+    for name in names if names is not None else READY_MODELS:
+        if name in _models:
+            get_model(name)
+        else:
+            logger.warning(f"Cannot warm up unknown model {name}")
+    return model_states()
+
+def model_states() -> Dict[str, Dict[str, Any]]:
+    """
+    Load state of every registered model
+
+    Returns:
+        Dictionary of model name to 'status', 'load_seconds' and 'error'
+    """
+    return {
+        name: {"status": entry["status"], "load_seconds": entry["load_seconds"], "error": entry["error"]}
+        for name, entry in _models.items()
+    }
+
+def ready(names: Optional[List[str]] = None) -> bool:
+    """
+    Whether the required models are loaded and usable
+
+    Args:
+        names: Required models, defaults to READY_MODELS
+
+    Returns:
+        True if every required model is ready or running on its fallback
+    """
+    return all(
+        _models[name]["status"] in ("ready", "degraded")
+        for name in (names if names is not None else READY_MODELS) if name in _models
+    )
+
+def _load_embedding_model() -> Any:
+    from .matcher import load_embedding_model
+    return load_embedding_model()
+
+def _load_spacy_model() -> Any:
+    import spacy
+    try:
+        return spacy.load(SPACY_MODEL_NAME)
+    except OSError:
+        if not SPACY_AUTO_DOWNLOAD:
+            logger.error(f"spaCy model '{SPACY_MODEL_NAME}' is not installed")
+            return None
+    # If the model is not installed, download it
+    logger.warning("spaCy model not found. Attempting to download...")
+    subprocess.run([sys.executable, "-m", "spacy", "download", SPACY_MODEL_NAME])
+    try:
+        return spacy.load(SPACY_MODEL_NAME)
+    except OSError as e:
+        logger.error(f"Error loading spaCy model: {e}")
+        return None
+
+def _load_cross_encoder() -> Any:
+    from sentence_transformers import CrossEncoder
+    import torch
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return CrossEncoder(CROSS_ENCODER_MODEL_NAME, device=device)
+
+register_model("embedding", _load_embedding_model)
+register_model("spacy", _load_spacy_model)
+register_model("cross_encoder", _load_cross_encoder)
@@ -0,0 +1,23 @@
+"""
+Location of the app's runtime data (caches and shared state), independent of the working
+directory the app is started from. Override with APP_DATA_DIR, e.g. to put it on a volume.
+"""
+
+import os
+
+DATA_DIR = os.getenv(
+    "APP_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+)
+
+def data_path(name: str) -> str:
+    """
+    Path of a file in the data directory
+
+    Args:
+        name: File name
+
+    Returns:
+        Absolute path of the file
+    """
+    return os.path.join(DATA_DIR, name)
@@ -0,0 +1,201 @@
+"""
+PDF text extraction for resumes.
+
+The fastest installed backend is used: pypdfium2, then PyMuPDF, then PyPDF2, which is always
+available. Extraction stops after PDF_MAX_PAGES pages or once PDF_MAX_CHARS characters were
+collected, so long portfolios cost no more than the part that is actually used. Documents of
+PDF_PARALLEL_MIN_PAGES pages or more are split into page ranges extracted in worker processes,
+each of which opens the file on its own; ranges are handed out a few at a time, so the
+character cap also stops the work of the ranges after it. This module stays free of heavy
+imports so the workers start quickly.
+"""
+
+import os
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger("job_search_app.pdf_extraction")
+
+if pdfium is not None:
+    PDF_BACKEND = "pdfium"
+elif fitz is not None:
+    PDF_BACKEND = "pymupdf"
+else:
+    PDF_BACKEND = "pypdf2"
+
+# Pages past this are ignored; resumes rarely need more than a few
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+# Extraction stops once this many characters were collected
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "200000"))
+# Documents with at least this many pages are extracted in parallel
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+    return _pool
+
+def _discard_pool() -> None:
+    """Shut down a broken pool so its processes and queued work are released; the next call starts a new one"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def page_count(file_path: str) -> int:
+    """
+    Number of pages of a PDF
+
+    Args:
+        file_path: Path to the PDF file
+
+    Returns:
+        Page count
+    """
+    if PDF_BACKEND == "pdfium":
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    if PDF_BACKEND == "pymupdf":
+        with fitz.open(file_path) as doc:
+            return doc.page_count
+    with open(file_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+def _iter_page_texts(file_path: str, start: int, stop: int) -> Iterator[str]:
+    """Text of the pages in [start, stop), read lazily with the selected backend."""
+    if PDF_BACKEND == "pdfium":
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            for index in range(start, stop):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+    elif PDF_BACKEND == "pymupdf":
+        with fitz.open(file_path) as doc:
+            for index in range(start, stop):
+                yield doc[index].get_text()
+    else:
+        with open(file_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            for index in range(start, stop):
+                yield reader.pages[index].extract_text() or ""
+
+def extract_page_range(file_path: str, start: int, stop: int, max_chars: int = PDF_MAX_CHARS) -> List[str]:
+    """
+    Extract the text of a range of pages, stopping early once max_chars were collected
+
+    Args:
+        file_path: Path to the PDF file
+        start: Index of the first page
+        stop: Index after the last page
+        max_chars: Character budget for the range
+
+    Returns:
+        Text of each extracted page
+    """
+    texts = []
+    chars = 0
+    for text in _iter_page_texts(file_path, start, stop):
+        texts.append(text)
+        chars += len(text)
+        if chars >= max_chars:
+            break
+    return texts
+
+def _page_ranges(pages: int, workers: int) -> List[Tuple[int, int]]:
+    size = -(-pages // workers)
+    return [(start, min(start + size, pages)) for start in range(0, pages, size)]
+
+def _extract_parallel(file_path: str, pages: int, max_chars: int) -> List[str]:
+    """
+    Extract page ranges in worker processes, collecting them in order until max_chars is reached.
+
+    The pages are cut into twice as many ranges as workers and at most one range per worker is
+    in flight; each range is submitted with the budget left when it starts, and no range is
+    submitted once the collected text reached max_chars.
+    """
+    pool = _get_pool()
+    ranges = deque(_page_ranges(pages, PDF_EXTRACT_WORKERS * 2))
+    in_flight = deque()
+    texts: List[str] = []
+    chars = 0
+
+    def submit_next() -> None:
+        start, stop = ranges.popleft()
+        in_flight.append(pool.submit(extract_page_range, file_path, start, stop, max_chars - chars))
+
+    while ranges and len(in_flight) < PDF_EXTRACT_WORKERS:
+        submit_next()
+    while in_flight:
+        for text in in_flight.popleft().result():
+            texts.append(text)
+            chars += len(text)
+            if chars >= max_chars:
+                break
+        if chars >= max_chars:
+            for pending in in_flight:
+                pending.cancel()
+            break
+        if ranges:
+            submit_next()
+    return texts
+
+def extract_pdf_text(file_path: str, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS) -> str:
+    """
+    Extract the text of a PDF
+
+    Args:
+        file_path: Path to the PDF file
+        max_pages: Maximum number of pages read
+        max_chars: Extraction stops once this many characters were collected
+
+    Returns:
+        Text of the pages joined by newlines, cut at max_chars
+    """
+    total_pages = page_count(file_path)
+    pages = min(total_pages, max_pages)
+
+    texts = None
+    if pages >= PDF_PARALLEL_MIN_PAGES and PDF_EXTRACT_WORKERS > 1:
+        try:
+            texts = _extract_parallel(file_path, pages, max_chars)
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Parallel PDF extraction failed, extracting serially: {str(e)}")
+            _discard_pool()
+    if texts is None:
+        texts = extract_page_range(file_path, 0, pages, max_chars)
+
+    text = "\n".join(texts)[:max_chars]
+    logger.info(
+        f"Extracted {len(text)} characters from {len(texts)}/{total_pages} pages using {PDF_BACKEND}"
+        + (" (truncated)" if len(texts) < total_pages or len(text) == max_chars else "")
+    )
+    return text
@@ -0,0 +1,251 @@
+"""
+Adaptive per-domain rate limiting for scraped sites.
+
+Every domain has a token bucket whose rate adapts AIMD-style to how the site responds: each fast
+2xx response adds RATE_LIMIT_INCREASE requests per second, each 429/503, CAPTCHA or block page
+multiplies the rate by RATE_LIMIT_DECREASE (and honours Retry-After). The buckets live in a
+SQLite file, so concurrent tasks and worker processes draw from the same budget per domain.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from .paths import data_path
+
+logger = logging.getLogger("job_search_app.rate_limiter")
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH", data_path("rate_limits.sqlite3"))
+# Requests per second a domain starts at, and the bounds of its adaptation
+RATE_LIMIT_INITIAL_RPS = float(os.getenv("RATE_LIMIT_INITIAL_RPS", "1.0"))
+RATE_LIMIT_MIN_RPS = float(os.getenv("RATE_LIMIT_MIN_RPS", "0.05"))
+RATE_LIMIT_MAX_RPS = float(os.getenv("RATE_LIMIT_MAX_RPS", "5.0"))
+# Requests that may be sent back to back after a domain was idle
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "2"))
+# Additive increase per fast 2xx response and multiplicative decrease per throttled response
+RATE_LIMIT_INCREASE = float(os.getenv("RATE_LIMIT_INCREASE", "0.1"))
+RATE_LIMIT_DECREASE = float(os.getenv("RATE_LIMIT_DECREASE", "0.5"))
+# A 2xx response slower than this does not raise the rate: the site may be struggling
+RATE_LIMIT_FAST_SECONDS = float(os.getenv("RATE_LIMIT_FAST_SECONDS", "2.0"))
+# Hosts that are never limited
+RATE_LIMIT_EXEMPT_HOSTS = {
+    host.strip() for host in os.getenv("RATE_LIMIT_EXEMPT_HOSTS", "localhost,127.0.0.1").split(",") if host.strip()
+}
+
+# Upper bound of the rate per domain (matched on the host suffix); anti-bot job boards are
+# kept slow whatever they answer. Extend or override with a JSON object in RATE_LIMIT_MAX_RPS_BY_DOMAIN.
+DOMAIN_MAX_RPS = {
+    "indeed.com": 0.5,
+    "linkedin.com": 0.5,
+}
+DOMAIN_MAX_RPS.update(json.loads(os.getenv("RATE_LIMIT_MAX_RPS_BY_DOMAIN", "{}")))
+
+# Responses asking us to slow down
+THROTTLE_STATUSES = {429, 503}
+# Markers of CAPTCHA and bot-block pages served instead of the requested content (matched lowercased):
+# Cloudflare, PerimeterX, DataDome, Imperva and Akamai
+BLOCK_MARKERS = (
+    "cf-chl-captcha-container",
+    "cf-browser-verification",
+    "<title>just a moment...</title>",
+    "<title>attention required! | cloudflare</title>",
+    "px-captcha",
+    "captcha-delivery.com",
+    "_incapsula_resource",
+    "errors.edgesuite.net",
+)
+
+def domain_of(url: str) -> str:
+    """Bucket key of a URL: its host, lowercased and without a leading www."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+def is_block_page(body: str) -> bool:
+    """Whether a page is a CAPTCHA challenge or bot-block page instead of the requested content"""
+    body = (body or "").lower()
+    return any(marker in body for marker in BLOCK_MARKERS)
+
+def is_limited(url: str) -> bool:
+    """Whether requests to a URL go through the rate limiter"""
+    domain = domain_of(url)
+    return RATE_LIMIT_ENABLED and bool(domain) and domain not in RATE_LIMIT_EXEMPT_HOSTS
+
+class DomainRateLimiter:
+    """
+    Token buckets per domain with AIMD rate adaptation, persisted in SQLite
+    """
+
+    def __init__(self, path: str = RATE_LIMIT_PATH):
+        """
+        Initialize the DomainRateLimiter
+
+        Args:
+            path: Path of the SQLite file shared by every worker
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " domain TEXT PRIMARY KEY, rate REAL, tokens REAL, updated REAL, blocked_until REAL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE transactions serialize the read-modify-write of a bucket across processes
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def max_rate_for(domain: str) -> float:
+        """Upper bound of the rate of a domain, from the most specific matching entry"""
+        matches = [name for name in DOMAIN_MAX_RPS if domain == name or domain.endswith("." + name)]
+        return DOMAIN_MAX_RPS[max(matches, key=len)] if matches else RATE_LIMIT_MAX_RPS
+
+    def _load(self, conn: sqlite3.Connection, domain: str, now: float) -> Dict[str, float]:
+        row = conn.execute(
+            "SELECT rate, tokens, updated, blocked_until FROM buckets WHERE domain = ?", (domain,)
+        ).fetchone()
+        if row is None:
+            rate = min(RATE_LIMIT_INITIAL_RPS, self.max_rate_for(domain))
+            return {"rate": rate, "tokens": RATE_LIMIT_BURST, "updated": now, "blocked_until": 0.0}
+        rate, tokens, updated, blocked_until = row
+        # Refill for the time elapsed since the last update
+        tokens = min(RATE_LIMIT_BURST, tokens + max(0.0, now - updated) * rate)
+        return {"rate": rate, "tokens": tokens, "updated": now, "blocked_until": blocked_until}
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, domain: str, bucket: Dict[str, float]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?, ?)",
+            (domain, bucket["rate"], bucket["tokens"], bucket["updated"], bucket["blocked_until"])
+        )
+
+    def reserve(self, url: str) -> float:
+        """
+        Take a token for a request to a URL
+
+        Tokens may go negative: a request reserved while the bucket is empty is scheduled behind
+        the ones already waiting, so concurrent callers are spaced out instead of all retrying at once.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        if not is_limited(url):
+            return 0.0
+        domain = domain_of(url)
+        try:
+            now = time.time()
+            with self._lock, self._connect() as conn:
+                bucket = self._load(conn, domain, now)
+                bucket["tokens"] -= 1
+                self._store(conn, domain, bucket)
+            delay = max(0.0, -bucket["tokens"] / bucket["rate"], bucket["blocked_until"] - now)
+            if delay > 0:
+                logger.info(f"Rate limiting {domain}: waiting {delay:.2f}s ({bucket['rate']:.2f} req/s)")
+            return delay
+        except Exception as e:
+            logger.error(f"Error reserving rate limit token for {domain}: {str(e)}")
+            return 0.0
+
+    def wait(self, url: str) -> None:
+        """Block until a request to a URL may be sent"""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str) -> None:
+        """Wait, without blocking the event loop, until a request to a URL may be sent"""
+        delay = await asyncio.to_thread(self.reserve, url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, url: str, status: int, elapsed: float, blocked: bool = False,
+               retry_after: Optional[float] = None) -> None:
+        """
+        Adapt the rate of a domain to a response
+
+        Args:
+            url: URL that was requested
+            status: HTTP status of the response (200 for a rendered page)
+            elapsed: Seconds the response took
+            blocked: Whether the response was a CAPTCHA or bot-block page, see is_block_page
+            retry_after: Seconds the site asked us to wait (Retry-After), if any
+        """
+        if not is_limited(url):
+            return
+        domain = domain_of(url)
+        try:
+            now = time.time()
+            with self._lock, self._connect() as conn:
+                bucket = self._load(conn, domain, now)
+                rate = bucket["rate"]
+                if blocked or status in THROTTLE_STATUSES:
+                    bucket["rate"] = max(RATE_LIMIT_MIN_RPS, rate * RATE_LIMIT_DECREASE)
+                    # Drop the burst allowance so the next request waits a full interval
+                    bucket["tokens"] = min(bucket["tokens"], 0.0)
+                    if retry_after:
+                        bucket["blocked_until"] = max(bucket["blocked_until"], now + retry_after)
+                elif 200 <= status < 300 and elapsed <= RATE_LIMIT_FAST_SECONDS:
+                    bucket["rate"] = min(self.max_rate_for(domain), rate + RATE_LIMIT_INCREASE)
+                self._store(conn, domain, bucket)
+            if bucket["rate"] < rate:
+                logger.warning(
+                    f"Backing off {domain} to {bucket['rate']:.2f} req/s after "
+                    f"{'a block page' if blocked else f'status {status}'}"
+                )
+        except Exception as e:
+            logger.error(f"Error recording response for {domain}: {str(e)}")
+
+    def state(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Current bucket of the domain of a URL
+
+        Args:
+            url: Any URL of the domain
+
+        Returns:
+            Dictionary with 'rate', 'tokens' and 'blocked_until', or None if the domain has no bucket yet
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT rate, tokens, blocked_until FROM buckets WHERE domain = ?", (domain_of(url),)
+            ).fetchone()
+        return None if row is None else {"rate": row[0], "tokens": row[1], "blocked_until": row[2]}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header given in seconds (HTTP dates are ignored)"""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+_limiter: Optional[DomainRateLimiter] = None
+
+def get_rate_limiter() -> DomainRateLimiter:
+    """Get the process-wide rate limiter, created on first use"""
+    global _limiter
+    if _limiter is None:
+        _limiter = DomainRateLimiter()
+    return _limiter
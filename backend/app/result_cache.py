@@ -0,0 +1,184 @@
+"""
+Cache of match results by request.
+
+An upload of the same resume content against the same job board (normalized URL) with the
+same matcher version is answered by the task that already ran it, or that is still running
+it, instead of running the pipeline again. The map is kept in SQLite in the data directory
+like the other stores, so reuse holds across gunicorn workers.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .paths import data_path
+from .utils import normalize_url
+
+logger = logging.getLogger("job_search_app.result_cache")
+
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", data_path("result_cache.sqlite3"))
+# How long the results of a completed match are served to identical uploads
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "900"))
+# How long a running task is waited for; a task whose worker crashed stops answering after this
+RESULT_CACHE_MAX_RUN_SECONDS = int(os.getenv("RESULT_CACHE_MAX_RUN_SECONDS", "1800"))
+
+def result_key(file_sha256: str, job_url: str, matcher_version: str) -> str:
+    """
+    Cache key of a match request: the same resume content against the same board with the
+    same matcher gives the same results
+
+    Args:
+        file_sha256: Content hash of the uploaded resume
+        job_url: URL of the job board
+        matcher_version: Version of the matcher, see MATCHER_VERSION
+
+    Returns:
+        The key
+    """
+    return hashlib.sha256(f"{file_sha256}|{normalize_url(job_url)}|{matcher_version}".encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """
+    A map from match request to the task holding its results, so a resubmitted resume and board
+    is answered by an earlier task instead of running the pipeline again.
+
+    Entries live in a SQLite file shared by every worker process. A running task answers
+    identical requests on any worker (single-flight) for at most max_run_seconds, and a
+    completed task for the TTL.
+    """
+
+    def __init__(
+        self,
+        path: str = RESULT_CACHE_PATH,
+        ttl: int = RESULT_CACHE_TTL,
+        max_run_seconds: int = RESULT_CACHE_MAX_RUN_SECONDS
+    ):
+        """
+        Initialize the ResultCache
+
+        Args:
+            path: Path of the SQLite file shared by every worker
+            ttl: Seconds the results of a completed task are reused (0 disables reuse)
+            max_run_seconds: Seconds a running task is waited for
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_run_seconds = max_run_seconds
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, task_id TEXT, running INTEGER, updated REAL)"
+            )
+            # Entries nobody can be answered by any more
+            conn.execute(
+                "DELETE FROM results WHERE updated < ?",
+                (time.time() - max(self.ttl, self.max_run_seconds),)
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE transactions make check-then-claim atomic across processes
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _current(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        """Task answering a request, dropping its entry if it expired"""
+        row = conn.execute("SELECT task_id, running, updated FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        task_id, running, updated = row
+        if time.time() - updated > (self.max_run_seconds if running else self.ttl):
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            return None
+        return task_id
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Find the task answering a match request
+
+        Args:
+            key: Key of the request, see result_key
+
+        Returns:
+            ID of the task running the request, or of a task that completed it within the TTL,
+            or None
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                return self._current(conn, key)
+        except Exception as e:
+            logger.error(f"Error looking up cached result: {str(e)}")
+            return None
+
+    def begin(self, key: str, task_id: str) -> str:
+        """
+        Record that a task started running a match request, unless another task already answers it
+
+        Args:
+            key: Key of the request
+            task_id: ID of the task
+
+        Returns:
+            ID of the task answering the request: task_id, or the task another worker started
+            in the meantime
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                current = self._current(conn, key)
+                if current is not None:
+                    return current
+                conn.execute("INSERT INTO results VALUES (?, ?, 1, ?)", (key, task_id, time.time()))
+        except Exception as e:
+            logger.error(f"Error recording running task {task_id}: {str(e)}")
+        return task_id
+
+    def finish(self, key: str, task_id: str, completed: bool) -> None:
+        """
+        Record that a task stopped running; its results are cached if it completed
+
+        Args:
+            key: Key of the request
+            task_id: ID of the task
+            completed: Whether the task completed (failed tasks are not cached)
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                if completed and self.ttl > 0:
+                    conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, 0, ?)", (key, task_id, time.time()))
+                else:
+                    conn.execute("DELETE FROM results WHERE key = ? AND task_id = ?", (key, task_id))
+        except Exception as e:
+            logger.error(f"Error recording finished task {task_id}: {str(e)}")
+
+    def invalidate(self, key: str, task_id: Optional[str] = None) -> None:
+        """
+        Drop the cached results of a request, e.g. when its task is gone
+
+        Args:
+            key: Key of the request
+            task_id: Only drop the entry if it still points to this task, so a task another
+                worker just started is kept
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                if task_id is None:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                else:
+                    conn.execute("DELETE FROM results WHERE key = ? AND task_id = ?", (key, task_id))
+        except Exception as e:
+            logger.error(f"Error invalidating cached result: {str(e)}")
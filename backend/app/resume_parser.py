@@ -1,29 +1,17 @@
 import os
 from typing import List, Dict
-import PyPDF2
-import docx
-import spacy
 from pathlib import Path
 import logging
+from . import extractors
+from .extractors import extract_text_from_file
+from .models import get_model, SPACY_MODEL_NAME
 
 # Get module logger
 logger = logging.getLogger("job_search_app.resume_parser")
 
-# Load spaCy NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("Successfully loaded spaCy model 'en_core_web_sm'")
-except OSError:
-    # If the model is not installed, download it
-    logger.warning("spaCy model not found. Attempting to download...")
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("Downloaded and loaded spaCy model 'en_core_web_sm'")
-
 def extract_text(file_path: str) -> str:
     """
-    Extract text from PDF or DOCX file
+    Extract text from a resume file (PDF, DOCX, ODT, RTF, HTML, Markdown or plain text)
     
     Args:
         file_path: Path to the file
@@ -32,51 +20,29 @@ def extract_text(file_path: str) -> str:
         Extracted text as a string
     """
     logger.info(f"Extracting text from file: {file_path}")
-    file_ext = Path(file_path).suffix.lower()
-    
-    if file_ext == '.pdf':
-        logger.info(f"Detected PDF file format")
-        text = extract_text_from_pdf(file_path)
-    elif file_ext == '.docx':
-        logger.info(f"Detected DOCX file format")
-        text = extract_text_from_docx(file_path)
-    else:
-        logger.error(f"Unsupported file format: {file_ext}")
-        raise ValueError(f"Unsupported file format: {file_ext}")
+    try:
+        text = extract_text_from_file(file_path)
+    except ValueError as e:
+        logger.error(str(e))
+        raise
     
     logger.info(f"Text extraction completed. Extracted {len(text)} characters")
     return text
 
 
 def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
-    text = ""
+    """Extract text from PDF file, see pdf_extraction for backends and limits"""
     try:
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            logger.info(f"PDF file opened successfully. Contains {len(reader.pages)} pages")
-            
-            for i, page in enumerate(reader.pages):
-                page_text = page.extract_text()
-                text += page_text + "\n"
-                logger.info(f"Extracted {len(page_text)} characters from page {i+1}")
-        
-        logger.info(f"PDF extraction completed successfully")
-        return text
+        return extractors.extract_pdf(file_path)
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}", exc_info=True)
         raise
 
 
 def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file"""
+    """Extract text from DOCX file, including tables, headers and footers"""
     try:
-        doc = docx.Document(file_path)
-        logger.info(f"DOCX file opened successfully. Contains {len(doc.paragraphs)} paragraphs")
-        
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        logger.info(f"DOCX extraction completed successfully. Extracted {len(text)} characters")
-        return text
+        return extractors.extract_docx(file_path)
     except Exception as e:
         logger.error(f"Error extracting text from DOCX: {str(e)}", exc_info=True)
         raise
@@ -97,6 +63,9 @@ def extract_skills(text: str) -> List[str]:
     # Process the text with spaCy
     skills = []
     try:
+        nlp = get_model("spacy")
+        if nlp is None:
+            raise RuntimeError(f"spaCy model '{SPACY_MODEL_NAME}' is not available")
         doc = nlp(text)
         logger.info(f"Text processed with spaCy. Document contains {len(doc)} tokens")
         
@@ -0,0 +1,291 @@
+"""
+Store of parsed resumes.
+
+Each resume (text, structured data, embedding) is one row of a SQLite file, so an upload
+writes only its own row and every worker process sees the resumes parsed by the others. A
+worker keeps the rows in memory, indexed for nearest-neighbour search, and picks up rows
+added by other workers before each lookup.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+import logging
+import numpy as np
+
+from .ann_index import VectorIndex
+from .matcher import extract_job_requirements, calculate_advanced_match_score, compute_document_embeddings
+from .paths import data_path
+
+logger = logging.getLogger("job_search_app.resume_store")
+
+RESUME_STORE_PATH = os.getenv("RESUME_STORE_PATH", data_path("resumes.sqlite3"))
+# JSON store of earlier versions, imported once into an empty SQLite store
+LEGACY_RESUME_STORE_FILE = "./resume_store.json"
+
+def resume_text_hash(resume_text: str) -> str:
+    """
+    Compute the identifier of a parsed resume from its text
+
+    Args:
+        resume_text: The full text of the resume
+
+    Returns:
+        Hex SHA-256 digest of the text
+    """
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+class ResumeStore:
+    """
+    A cache of parsed resumes (text, structured data and embedding) keyed by resume hash,
+    persisted in SQLite and indexed for nearest-neighbour search so that stored resumes
+    can be ranked for a job
+    """
+
+    def __init__(self, path: str = RESUME_STORE_PATH, legacy_file: Optional[str] = LEGACY_RESUME_STORE_FILE):
+        """
+        Initialize the ResumeStore
+
+        Args:
+            path: Path of the SQLite file shared by every worker
+            legacy_file: JSON store (with its _embeddings.npy) to import if the SQLite store is empty
+        """
+        self.resumes: Dict[str, Dict[str, Any]] = {}
+        self.path = path
+        self.index = VectorIndex()
+        self._by_file_hash: Dict[str, str] = {}
+        self._pending: Dict[str, Any] = {}
+        self._last_rowid = 0
+        self._lock = threading.RLock()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS resumes ("
+                    " resume_hash TEXT PRIMARY KEY, file_sha256 TEXT, entry TEXT, embedding BLOB)"
+                )
+        except Exception as e:
+            logger.error(f"Error opening resume store: {str(e)}")
+
+        # Load the resumes stored so far
+        self._refresh()
+        if not self.resumes and legacy_file and os.path.exists(legacy_file):
+            self._import_legacy(legacy_file)
+
+        logger.info(f"ResumeStore initialized with {len(self.resumes)} resumes")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps the store safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _remember(self, resume_hash: str, entry: Dict[str, Any], embedding: Optional[np.ndarray]) -> None:
+        """Put a resume in the in-memory maps and index; call with the lock held"""
+        previous = self.resumes.get(resume_hash)
+        if previous and previous.get("file_sha256"):
+            self._by_file_hash.pop(previous["file_sha256"], None)
+        self.resumes[resume_hash] = entry
+        if entry.get("file_sha256"):
+            self._by_file_hash[entry["file_sha256"]] = resume_hash
+        if embedding is not None:
+            self.index.add([resume_hash], np.atleast_2d(embedding))
+
+    def _refresh(self) -> None:
+        """Load the rows written since the last refresh, including other workers' uploads"""
+        try:
+            with self._lock:
+                with self._connect() as conn:
+                    rows = conn.execute(
+                        "SELECT rowid, resume_hash, entry, embedding FROM resumes WHERE rowid > ? ORDER BY rowid",
+                        (self._last_rowid,)
+                    ).fetchall()
+                for rowid, resume_hash, entry, embedding in rows:
+                    vector = np.frombuffer(embedding, dtype=np.float32) if embedding else None
+                    self._remember(resume_hash, json.loads(entry), vector)
+                    self._last_rowid = max(self._last_rowid, rowid)
+            if rows:
+                logger.debug(f"Loaded {len(rows)} resumes from {self.path}")
+        except Exception as e:
+            logger.error(f"Error loading resumes: {str(e)}")
+
+    def _import_legacy(self, legacy_file: str) -> None:
+        """Import the resumes and embeddings of a JSON store written by earlier versions"""
+        try:
+            with open(legacy_file, 'r') as f:
+                resumes = json.load(f)
+            ids = [resume_hash for resume_hash, entry in resumes.items() if entry.get("has_embedding")]
+            embeddings_file = os.path.splitext(legacy_file)[0] + "_embeddings.npy"
+            embeddings = np.load(embeddings_file) if ids and os.path.exists(embeddings_file) else None
+            vectors = dict(zip(ids, embeddings)) if embeddings is not None and len(embeddings) == len(ids) else {}
+            for resume_hash, entry in resumes.items():
+                vector = vectors.get(resume_hash)
+                entry["has_embedding"] = vector is not None
+                self.add(resume_hash, entry.pop("text"), entry.pop("data"), vector, entry, save=False)
+            self.save()
+            logger.info(f"Imported {len(resumes)} resumes from {legacy_file}")
+        except Exception as e:
+            logger.error(f"Error importing resumes from {legacy_file}: {str(e)}")
+
+    def get(self, resume_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a parsed resume by hash
+
+        Args:
+            resume_hash: Identifier of the resume
+
+        Returns:
+            The stored resume entry or None if not found
+        """
+        self._refresh()
+        return self.resumes.get(resume_hash)
+
+    def find_by_file_hash(self, file_hash: str) -> Optional[str]:
+        """
+        Find the resume parsed from an uploaded file
+
+        Args:
+            file_hash: SHA-256 digest of the uploaded file
+
+        Returns:
+            The resume hash or None if the file was not parsed before
+        """
+        self._refresh()
+        return self._by_file_hash.get(file_hash)
+
+    def get_embedding(self, resume_hash: str) -> Optional[np.ndarray]:
+        """
+        Get the (normalized) embedding of a stored resume
+
+        Args:
+            resume_hash: Identifier of the resume
+
+        Returns:
+            The embedding or None if not available
+        """
+        self._refresh()
+        with self._lock:
+            return self.index.get(resume_hash)
+
+    def add(
+        self,
+        resume_hash: str,
+        resume_text: str,
+        resume_data: Dict[str, Any],
+        embedding: Optional[np.ndarray] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        save: bool = True
+    ) -> None:
+        """
+        Add or update a parsed resume
+
+        Args:
+            resume_hash: Identifier of the resume
+            resume_text: The full text of the resume
+            resume_data: Output of extract_structured_resume for the resume
+            embedding: Optional embedding of the resume text
+            metadata: Optional extra fields to store, e.g. the uploaded file name
+            save: Whether to persist the resume now; batches add many resumes and call save() once
+        """
+        has_embedding = embedding is not None and np.size(embedding) > 0
+        entry = {
+            "text": resume_text,
+            "data": resume_data,
+            "has_embedding": has_embedding,
+            "updated_at": time.time()
+        }
+        entry.update(metadata or {})
+        vector = np.asarray(embedding, dtype=np.float32).ravel() if has_embedding else None
+        with self._lock:
+            self._remember(resume_hash, entry, vector)
+            self._pending[resume_hash] = (entry, vector)
+        if save:
+            self.save()
+
+    def save(self) -> None:
+        """Persist the resumes added since the last save"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO resumes VALUES (?, ?, ?, ?)",
+                    [
+                        (resume_hash, entry.get("file_sha256"), json.dumps(entry),
+                         vector.tobytes() if vector is not None else None)
+                        for resume_hash, (entry, vector) in pending.items()
+                    ]
+                )
+            logger.info(f"Saved {len(pending)} resumes to {self.path}")
+        except Exception as e:
+            logger.error(f"Error saving resumes: {str(e)}")
+
+    def search_for_job(
+        self,
+        job_text: str,
+        job_title: str = "",
+        top_k: int = 10,
+        shortlist_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank stored resumes for a job description.
+
+        The nearest-neighbour index selects a shortlist by embedding similarity, then the
+        structured match score is computed for the shortlisted resumes only.
+
+        Args:
+            job_text: The full text of the job description
+            job_title: The job title if available separately
+            top_k: Number of candidates to return
+            shortlist_size: Number of resumes scored in detail (defaults to 5 x top_k)
+
+        Returns:
+            List of candidate dictionaries sorted by combined score
+        """
+        self._refresh()
+        if len(self.index) == 0:
+            logger.warning("No indexed resumes to search")
+            return []
+
+        # Embedded like the stored resumes, so chunk-pooled resumes are compared with a pooled job
+        job_embs = compute_document_embeddings([job_text or job_title])
+        if job_embs.size == 0:
+            logger.error("Failed to compute embedding for job description")
+            return []
+
+        with self._lock:
+            shortlist = self.index.search(job_embs[0], shortlist_size or top_k * 5)
+            entries = {resume_hash: self.resumes[resume_hash] for resume_hash, _ in shortlist}
+        job_data = extract_job_requirements(job_text, job_title)
+
+        candidates = []
+        for resume_hash, similarity in shortlist:
+            entry = entries[resume_hash]
+            match_data = calculate_advanced_match_score(entry["data"], job_data)
+            # Same blend as rank_jobs: 80% structured score + 20% embedding similarity
+            combined_score = (match_data["overall_score"] * 0.8 + similarity * 100 * 0.2) / 100
+            candidates.append({
+                "resume_hash": resume_hash,
+                "filename": entry.get("filename"),
+                "match_score": round(combined_score, 4),
+                "symbolic_score": match_data["overall_score"],
+                "embedding_similarity": similarity,
+                "matched_skills": match_data["matched_skills"],
+                "missing_skills": match_data["missing_skills"],
+                "experience_match": match_data["experience_match"]
+            })
+
+        candidates.sort(key=lambda x: x["match_score"], reverse=True)
+        logger.info(f"Ranked {len(shortlist)} shortlisted resumes out of {len(self.index)} for job '{job_title}'")
+        return candidates[:top_k]
@@ -0,0 +1,308 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+import logging
+
+from .paths import data_path
+
+logger = logging.getLogger("job_search_app.saved_searches")
+
+# Default interval between two runs of a saved search
+SAVED_SEARCH_INTERVAL_MINUTES = int(os.getenv("SAVED_SEARCH_INTERVAL_MINUTES", "1440"))
+# Number of past deltas kept per saved search
+SAVED_SEARCH_MAX_DELTAS = int(os.getenv("SAVED_SEARCH_MAX_DELTAS", "50"))
+# How long a run holds its claim on a search; a run lost with a crashed worker blocks the search this long
+SAVED_SEARCH_CLAIM_SECONDS = int(os.getenv("SAVED_SEARCH_CLAIM_SECONDS", "3600"))
+SAVED_SEARCH_PATH = os.getenv("SAVED_SEARCH_PATH", data_path("saved_searches.sqlite3"))
+# JSON store of earlier versions, imported once into an empty SQLite store
+LEGACY_SAVED_SEARCH_FILE = "./saved_searches.json"
+
+def apply_filters(jobs: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Keep the jobs matching a saved search's keyword and location filters
+
+    Args:
+        jobs: Scraped job dictionaries
+        filters: Optional 'keywords' (any must appear in title or description),
+            'exclude_keywords' (none may appear) and 'location' (substring of the location)
+
+    Returns:
+        The matching jobs
+    """
+    keywords = [keyword.lower() for keyword in filters.get("keywords") or []]
+    excluded = [keyword.lower() for keyword in filters.get("exclude_keywords") or []]
+    location = (filters.get("location") or "").lower()
+    matching = []
+    for job in jobs:
+        text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+        if keywords and not any(keyword in text for keyword in keywords):
+            continue
+        if any(keyword in text for keyword in excluded):
+            continue
+        if location and location not in (job.get("location") or "").lower():
+            continue
+        matching.append(job)
+    return matching
+
+class SavedSearchStore:
+    """
+    Saved searches (a stored resume, the boards to monitor and filters), the listings each
+    has already reported and the new matches found by each run, one row per search in a
+    SQLite file shared by every worker. A run claims its search first, so the scheduler, an
+    explicit run and other workers never run the same search at the same time.
+    """
+
+    def __init__(self, path: str = SAVED_SEARCH_PATH, legacy_file: Optional[str] = LEGACY_SAVED_SEARCH_FILE,
+                 claim_seconds: int = SAVED_SEARCH_CLAIM_SECONDS):
+        """
+        Initialize the SavedSearchStore
+
+        Args:
+            path: Path of the SQLite file shared by every worker
+            legacy_file: JSON store to import if the SQLite store is empty
+            claim_seconds: Seconds a run holds its claim on a search, see claim
+        """
+        self.path = path
+        self.claim_seconds = claim_seconds
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS searches ("
+                " search_id TEXT PRIMARY KEY, last_run REAL, interval_minutes INTEGER, search TEXT, running_until REAL)"
+            )
+            if "running_until" not in [row[1] for row in conn.execute("PRAGMA table_info(searches)")]:
+                conn.execute("ALTER TABLE searches ADD COLUMN running_until REAL")
+            count = conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+
+        if not count and legacy_file and os.path.exists(legacy_file):
+            self._import_legacy(legacy_file)
+
+        logger.info(f"SavedSearchStore initialized with {len(self.get_all())} searches")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE transactions serialize the read-modify-write of a search across processes
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, search: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT INTO searches (search_id, last_run, interval_minutes, search) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(search_id) DO UPDATE SET"
+            " last_run = excluded.last_run, interval_minutes = excluded.interval_minutes, search = excluded.search",
+            (search["id"], search["last_run"], search["interval_minutes"], json.dumps(search))
+        )
+
+    def _import_legacy(self, legacy_file: str) -> None:
+        """Copy the searches of a JSON store written by earlier versions"""
+        try:
+            with open(legacy_file, 'r') as f:
+                legacy = json.load(f)
+            with self._lock, self._connect() as conn:
+                for search in legacy.values():
+                    self._store(conn, search)
+            logger.info(f"Imported {len(legacy)} saved searches from {legacy_file}")
+        except Exception as e:
+            logger.error(f"Error importing saved searches from {legacy_file}: {str(e)}")
+
+    def get(self, search_id: str) -> Dict[str, Any]:
+        """
+        Get a saved search by ID
+
+        Args:
+            search_id: The ID of the saved search
+
+        Returns:
+            The saved search or an empty dict if not found
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT search FROM searches WHERE search_id = ?", (search_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def get_all(self) -> Dict[str, Any]:
+        """
+        Get all saved searches
+
+        Returns:
+            Dictionary of all saved searches
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT search_id, search FROM searches ORDER BY rowid").fetchall()
+        return {search_id: json.loads(search) for search_id, search in rows}
+
+    def add(
+        self,
+        search_id: str,
+        resume_hash: str,
+        job_urls: List[str],
+        filters: Optional[Dict[str, Any]] = None,
+        interval_minutes: int = SAVED_SEARCH_INTERVAL_MINUTES,
+        webhook_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a saved search
+
+        Args:
+            search_id: The ID of the saved search
+            resume_hash: Identifier of a resume in the ResumeStore
+            job_urls: Job board URLs to monitor
+            filters: Optional filters, see apply_filters, plus 'min_score' and 'limit'
+            interval_minutes: Minutes between two runs
+            webhook_url: Optional URL notified with every non-empty delta
+
+        Returns:
+            The saved search
+        """
+        search = {
+            "id": search_id,
+            "resume_hash": resume_hash,
+            "job_urls": job_urls,
+            "filters": filters or {},
+            "interval_minutes": interval_minutes,
+            "webhook_url": webhook_url,
+            "created_at": time.time(),
+            "last_run": None,
+            "last_error": None,
+            # Listing key -> content hash already reported, per board
+            "seen": {},
+            "deltas": []
+        }
+        with self._lock, self._connect() as conn:
+            self._store(conn, search)
+        return search
+
+    def delete(self, search_id: str) -> bool:
+        """
+        Delete a saved search
+
+        Args:
+            search_id: The ID of the saved search
+
+        Returns:
+            True if the search was deleted, False if not found
+        """
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM searches WHERE search_id = ?", (search_id,))
+        return cursor.rowcount == 1
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """
+        IDs of the saved searches whose interval has elapsed since their last run and that no
+        run has claimed
+
+        Args:
+            now: Current time, defaults to time.time()
+
+        Returns:
+            List of search IDs
+        """
+        now = now or time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT search_id FROM searches"
+                " WHERE (last_run IS NULL OR ? - last_run >= interval_minutes * 60)"
+                " AND (running_until IS NULL OR running_until < ?) ORDER BY rowid",
+                (now, now)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, search_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim a saved search for a run, unless another run holds it; record_run releases it
+
+        Args:
+            search_id: The ID of the saved search
+
+        Returns:
+            The saved search as of the claim (run from its 'seen'), or None if it does not exist
+            or another run claimed it
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT search, running_until FROM searches WHERE search_id = ?", (search_id,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] >= now):
+                return None
+            conn.execute(
+                "UPDATE searches SET running_until = ? WHERE search_id = ?", (now + self.claim_seconds, search_id)
+            )
+        return json.loads(row[0])
+
+    def running(self, search_id: str) -> bool:
+        """
+        Whether a run currently holds the claim on a saved search
+
+        Args:
+            search_id: The ID of the saved search
+
+        Returns:
+            True if the search is claimed
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT running_until FROM searches WHERE search_id = ?", (search_id,)).fetchone()
+        return bool(row and row[0] is not None and row[0] >= time.time())
+
+    def record_run(
+        self,
+        search_id: str,
+        seen: Dict[str, Dict[str, str]],
+        matches: List[Dict[str, Any]],
+        error: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record the outcome of a run and release its claim
+
+        Args:
+            search_id: The ID of the saved search
+            seen: Listings reported so far per board (listing key -> content hash)
+            matches: New matches found by this run
+            error: Error message if the run failed
+
+        Returns:
+            The stored delta, or None if the run found nothing new
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT search FROM searches WHERE search_id = ?", (search_id,)).fetchone()
+            if row is None:
+                return None
+            search = json.loads(row[0])
+            now = time.time()
+            search["last_run"] = now
+            search["last_error"] = error
+            search["seen"] = seen
+            delta = None
+            if matches:
+                delta = {"run_at": now, "matches": matches}
+                search["deltas"] = (search["deltas"] + [delta])[-SAVED_SEARCH_MAX_DELTAS:]
+            self._store(conn, search)
+            conn.execute("UPDATE searches SET running_until = NULL WHERE search_id = ?", (search_id,))
+        return delta
+
+    def deltas(self, search_id: str, since: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Deltas of a saved search recorded after a point in time
+
+        Args:
+            search_id: The ID of the saved search
+            since: Only deltas of runs after this timestamp are returned
+
+        Returns:
+            List of deltas, oldest first
+        """
+        return [delta for delta in self.get(search_id).get("deltas", []) if delta["run_at"] > since]
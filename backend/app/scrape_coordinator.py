@@ -0,0 +1,232 @@
+"""
+Single-flight coordination of job board scrapes.
+
+Concurrent tasks scraping the same board (by normalized URL and scrape options, e.g.
+bypass_cache) share one scrape: the first
+caller leads and runs the browser, the others wait for its result. Across worker processes the
+leader holds a lease in a SQLite table next to the HTTP cache, renewed while it scrapes, and
+publishes its listings (an empty result included) in the same database when done. A worker
+finding the lease held by another process waits for that outcome and only scrapes itself if
+the other worker failed or crashed.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import logging
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .http_cache import HTTP_CACHE_PATH
+from .utils import normalize_url
+
+logger = logging.getLogger("job_search_app.scrape_coordinator")
+
+# Lifetime of a lease, renewed every third of it while the scrape runs; a crashed leader's
+# lease expires after this
+SCRAPE_LEASE_SECONDS = float(os.getenv("SCRAPE_LEASE_SECONDS", "180"))
+# How often a worker waiting on another worker's scrape checks the lease
+SCRAPE_LEASE_POLL_SECONDS = float(os.getenv("SCRAPE_LEASE_POLL_SECONDS", "0.5"))
+
+class ScrapeCoordinator:
+    """
+    Deduplicates in-flight scrapes of the same URL within and across processes
+    """
+
+    def __init__(
+        self,
+        scrape_fn: Callable[..., List[Dict[str, Any]]],
+        lease_path: Optional[str] = HTTP_CACHE_PATH,
+        lease_seconds: float = SCRAPE_LEASE_SECONDS,
+        poll_seconds: float = SCRAPE_LEASE_POLL_SECONDS
+    ):
+        """
+        Initialize the ScrapeCoordinator
+
+        Args:
+            scrape_fn: Function scraping the listings of a URL, e.g. scrape_jobs
+            lease_path: SQLite file holding the leases shared by worker processes (None: this process only)
+            lease_seconds: Lifetime of a lease, renewed while the scrape runs
+            poll_seconds: Interval between two checks of a lease held by another process
+        """
+        self.scrape_fn = scrape_fn
+        self.lease_path = lease_path
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._stats = {"scrapes": 0, "shared": 0, "waited": 0}
+        if lease_path:
+            os.makedirs(os.path.dirname(os.path.abspath(lease_path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS scrape_leases (key TEXT PRIMARY KEY, owner TEXT, expires REAL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS scrape_results (key TEXT PRIMARY KEY, finished REAL, jobs TEXT)")
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        # Each worker is its own lease owner
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.lease_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _try_lease(self, key: str) -> bool:
+        """Take the lease of a URL unless another process holds an unexpired one"""
+        if not self.lease_path:
+            return True
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                conn.execute("DELETE FROM scrape_leases WHERE key = ? AND expires < ?", (key, now))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO scrape_leases VALUES (?, ?, ?)", (key, self.owner, now + self.lease_seconds)
+                )
+                return cursor.rowcount == 1
+        except Exception as e:
+            logger.error(f"Error taking scrape lease for {key}: {str(e)}")
+            return True
+
+    def _release_lease(self, key: str) -> None:
+        if not self.lease_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM scrape_leases WHERE key = ? AND owner = ?", (key, self.owner))
+        except Exception as e:
+            logger.error(f"Error releasing scrape lease for {key}: {str(e)}")
+
+    def _renew_lease(self, key: str, stop: threading.Event) -> None:
+        """Extend the lease of a URL every third of its lifetime until stop is set"""
+        while not stop.wait(self.lease_seconds / 3):
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "UPDATE scrape_leases SET expires = ? WHERE key = ? AND owner = ?",
+                        (time.time() + self.lease_seconds, key, self.owner)
+                    )
+            except Exception as e:
+                logger.error(f"Error renewing scrape lease for {key}: {str(e)}")
+
+    def _publish(self, key: str, jobs: List[Dict[str, Any]]) -> None:
+        """Share the listings of a finished scrape with the workers waiting on its lease"""
+        if not self.lease_path:
+            return
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO scrape_results VALUES (?, ?, ?)",
+                             (key, now, json.dumps(jobs or [], default=str)))
+                # Only workers that were waiting while a scrape ran read its outcome
+                conn.execute("DELETE FROM scrape_results WHERE finished < ?", (now - self.lease_seconds,))
+        except Exception as e:
+            logger.error(f"Error publishing scrape result for {key}: {str(e)}")
+
+    def _published(self, key: str, since: float) -> Optional[List[Dict[str, Any]]]:
+        """Listings another worker published for a URL after since, or None"""
+        if not self.lease_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT jobs FROM scrape_results WHERE key = ? AND finished >= ?", (key, since)
+                ).fetchone()
+            return None if row is None else json.loads(row[0])
+        except Exception as e:
+            logger.error(f"Error reading scrape result for {key}: {str(e)}")
+            return None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _lead(self, url: str, key: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Scrape as this process's leader, unless another process's scrape of the URL finished meanwhile"""
+        waited_since = None
+        while not self._try_lease(key):
+            if waited_since is None:
+                logger.info(f"Waiting for another worker's scrape of {url}")
+                waited_since = time.time()
+            time.sleep(self.poll_seconds)
+            published = self._published(key, waited_since)
+            if published is not None:
+                self._count("waited")
+                return published
+        if waited_since is not None:
+            self._count("waited")
+            # The other worker may have published and released between two polls
+            published = self._published(key, waited_since)
+            if published is not None:
+                self._release_lease(key)
+                return published
+            logger.info(f"Another worker's scrape of {url} failed, scraping it here")
+
+        stop_renewing = threading.Event()
+        renewer = threading.Thread(target=self._renew_lease, args=(key, stop_renewing), daemon=True)
+        if self.lease_path:
+            renewer.start()
+        try:
+            self._count("scrapes")
+            jobs = self.scrape_fn(url, **kwargs)
+            self._publish(key, jobs)
+            return jobs
+        finally:
+            stop_renewing.set()
+            self._release_lease(key)
+
+    def scrape(self, url: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Scrape a URL, sharing the result with concurrent callers scraping the same URL with the same options
+
+        Args:
+            url: URL of the job board
+            **kwargs: Passed to scrape_fn; calls with different options never share a scrape
+
+        Returns:
+            The scraped listings; every caller gets its own copies of the listing dicts
+        """
+        key = normalize_url(url)
+        if kwargs:
+            key = f"{key} {json.dumps(kwargs, sort_keys=True, default=str)}"
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+        if leader:
+            try:
+                future.set_result(self._lead(url, key, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+        else:
+            self._count("shared")
+            logger.info(f"Joining in-flight scrape of {url}")
+        return [dict(job) for job in future.result() or []]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters of the coordinator
+
+        Returns:
+            Dictionary with the number of 'scrapes' run, calls that 'shared' another caller's
+            scrape, and calls that 'waited' for another worker's scrape
+        """
+        with self._lock:
+            return dict(self._stats)
@@ -8,14 +8,21 @@ import random
 from urllib.parse import urlparse, parse_qs
 import traceback
 import httpx
-from fake_useragent import UserAgent
-from tenacity import retry, stop_after_attempt, wait_exponential
+from . import http_client
 
 # Get module logger
 logger = logging.getLogger("job_search_app.scraper")
 
-# Initialize UserAgent for random headers
-ua = UserAgent()
+# Random headers come from the fake_useragent database, loaded on first use
+_ua = None
+
+def random_user_agent() -> str:
+    """A random browser user agent string"""
+    global _ua
+    if _ua is None:
+        from fake_useragent import UserAgent
+        _ua = UserAgent()
+    return _ua.random
 
 # List of user agents to randomize for better anonymity
 USER_AGENTS = [
@@ -26,13 +33,13 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.1 Safari/605.1.15",
 ]
 
-# Retry decorator for HTTP requests
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def fetch_url(url: str, proxies: Dict[str, str] = None) -> str:
-    """Fetch the URL content with retry logic."""
-    headers = {"User-Agent": ua.random}
+# Requests go through the shared pooled client, which applies the retry policy
+def fetch_url(url: str, proxies: Dict[str, str] = None, bypass_cache: bool = False) -> str:
+    """Fetch the URL content with retry logic, served from the HTTP cache while fresh."""
+    headers = {"User-Agent": random_user_agent()}
+    proxy = next(iter(proxies.values()), None) if proxies else None
     try:
-        response = httpx.get(url, headers=headers, proxies=proxies, timeout=10)
+        response = http_client.get(url, headers=headers, proxy=proxy, timeout=10, cache=True, bypass_cache=bypass_cache)
         response.raise_for_status()
         return response.text
     except httpx.RequestError as e:
@@ -42,14 +49,15 @@ def fetch_url(url: str, proxies: Dict[str, str] = None) -> str:
 import httpx
 from urllib.parse import urljoin
 
-def scrape_jobs(url: str) -> List[Dict[str, Any]]:
+def scrape_jobs(url: str, bypass_cache: bool = False) -> List[Dict[str, Any]]:
     """
     Scrape job listings from the given URL.
     This function will delegate to a site-specific parser.
+    Pass bypass_cache=True to refetch the page even if a fresh cached copy exists.
     """
     try:
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
-        response = httpx.get(url, headers=headers, timeout=20)
+        response = http_client.get(url, headers=headers, timeout=20, cache=True, bypass_cache=bypass_cache)
         response.raise_for_status()
         html_content = response.text
 
@@ -1,5 +1,6 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
+import os
 import time
 import re
 import logging
@@ -8,53 +9,113 @@ import random
 from urllib.parse import urlparse, parse_qs, urljoin
 import traceback
 import httpx
-from fake_useragent import UserAgent
-from tenacity import retry, stop_after_attempt, wait_exponential
-
-# Standard Selenium imports
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-
-# For stealth/undetected Chrome (for anti-bot sites like Indeed)
-import undetected_chromedriver as uc
+from . import http_client
+from .http_cache import get_http_cache
+from .rate_limiter import get_rate_limiter, is_block_page, THROTTLE_STATUSES
 
 # Get module logger
 logger = logging.getLogger("job_search_app.scraper")
 
-# Initialize UserAgent for random headers
-ua = UserAgent()
+# Random headers come from the fake_useragent database, loaded on first use
+_ua = None
+
+def random_user_agent() -> str:
+    """A random browser user agent string"""
+    global _ua
+    if _ua is None:
+        from fake_useragent import UserAgent
+        _ua = UserAgent()
+    return _ua.random
+
+# Longest wait for a rendered page's content to settle after load
+SCRAPE_RENDER_TIMEOUT = float(os.getenv("SCRAPE_RENDER_TIMEOUT", "10"))
+SCRAPE_RENDER_POLL_SECONDS = float(os.getenv("SCRAPE_RENDER_POLL_SECONDS", "0.5"))
 
-# Retry decorator for HTTP requests
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def fetch_url(url: str) -> str:
-    """Fetch the URL content with retry logic."""
-    headers = {"User-Agent": ua.random}
+def _wait_for_render(driver, timeout: float = SCRAPE_RENDER_TIMEOUT, poll: float = SCRAPE_RENDER_POLL_SECONDS) -> None:
+    """Wait until the document is loaded and its HTML stopped changing between two polls, or the timeout."""
+    deadline = time.monotonic() + timeout
+    last_size = None
+    while time.monotonic() < deadline:
+        try:
+            size = len(driver.page_source) if driver.execute_script("return document.readyState") == "complete" else None
+        except Exception as e:
+            logger.warning(f"Could not check page render state: {e}")
+            return
+        if size is not None and size == last_size:
+            return
+        last_size = size
+        time.sleep(poll)
+
+def _navigation_status(driver) -> Optional[int]:
+    """HTTP status of the page the browser loaded last, where the browser reports it (Chrome 109+)."""
     try:
-        response = httpx.get(url, headers=headers, timeout=10)
+        status = driver.execute_script(
+            "const entry = performance.getEntriesByType('navigation')[0];"
+            "return entry && entry.responseStatus ? entry.responseStatus : null;"
+        )
+        return int(status) if status else None
+    except Exception:
+        return None
+
+# Requests go through the shared pooled client, which applies the retry policy
+def fetch_url(url: str, bypass_cache: bool = False) -> str:
+    """Fetch the URL content with retry logic, served from the HTTP cache while fresh."""
+    headers = {"User-Agent": random_user_agent()}
+    try:
+        response = http_client.get(url, headers=headers, timeout=10, cache=True, bypass_cache=bypass_cache)
         response.raise_for_status()
         return response.text
     except httpx.RequestError as e:
         logger.error(f"Request failed: {e}")
         raise
 
-def scrape_jobs(url: str, proxies_list: list = None) -> list:
+def _parse_jobs(html_content: str, url: str) -> list:
+    """Dispatch rendered HTML to the site-specific parser."""
+    if "linkedin.com" in url:
+        logger.info("Using LinkedIn parser")
+        return parse_linkedin(html_content, url)
+    elif "indeed.com" in url:
+        logger.info("Using Indeed parser")
+        return parse_indeed(html_content, url)
+    logger.info("Using generic parser")
+    return parse_generic(html_content, url)
+
+def scrape_jobs(url: str, proxies_list: list = None, bypass_cache: bool = False) -> list:
     """
     Scrape job listings from the given URL with advanced anonymity.
+
+    Browser-rendered pages are kept in the HTTP cache (namespace "rendered"), so repeated
+    searches within the domain TTL skip launching Chrome entirely.
     
     Args:
         url: URL of the job listing page.
         proxies_list: Optional list of proxies to rotate through.
+        bypass_cache: Render the page even if a fresh cached copy exists.
         
     Returns:
         List of dictionaries containing job details
     """
     logger.info(f"Starting job scraping from URL: {url}")
+    http_cache = get_http_cache()
+    if not bypass_cache:
+        cached = http_cache.get(url, namespace="rendered")
+        if cached and cached["fresh"]:
+            logger.info(f"Using cached rendered page for {url}")
+            jobs = _parse_jobs(cached["body"], url)
+            if jobs:
+                return jobs
     driver = None
     def run_scrape(user_agent_override=None, proxy_override=None):
+        # Selenium and the driver managers are only imported once a page has to be rendered
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+        # For stealth/undetected Chrome (for anti-bot sites like Indeed)
+        import undetected_chromedriver as uc
+
         use_stealth = "indeed.com" in url.lower()
-        user_agent = user_agent_override or ua.random
+        user_agent = user_agent_override or random_user_agent()
         local_driver = None
         headless = False if use_stealth else True  # Use headful for anti-bot
         try:
@@ -101,9 +162,19 @@ def scrape_jobs(url: str, proxies_list: list = None) -> list:
                 service = Service(ChromeDriverManager().install())
                 local_driver = webdriver.Chrome(service=service, options=chrome_options)
             local_driver.set_page_load_timeout(30)
+            # Pace requests to the board by its adaptive rate limit, shared with the other workers
+            rate_limiter = get_rate_limiter()
+            rate_limiter.wait(url)
+            start = time.perf_counter()
             local_driver.get(url)
-            # Human-like delay after page load
-            time.sleep(random.uniform(2.5, 5.5))
+            load_seconds = time.perf_counter() - start
+            _wait_for_render(local_driver)
+            # The browser hides throttling, so look at the navigation status and for block pages
+            status = _navigation_status(local_driver) or 200
+            blocked = is_block_page(local_driver.page_source)
+            if blocked or status in THROTTLE_STATUSES:
+                logger.warning(f"{url} answered with {'a block page' if blocked else f'status {status}'}")
+            rate_limiter.record(url, status, load_seconds, blocked=blocked)
             # Human-like scrolling
             if use_stealth:
                 scroll_steps = random.randint(3, 7)
@@ -139,18 +210,11 @@ def scrape_jobs(url: str, proxies_list: list = None) -> list:
                     logger.info("Saved Indeed debug HTML and screenshot.")
                 except Exception as e:
                     logger.warning(f"Failed to save Indeed debug HTML/screenshot: {e}")
-            else:
-                time.sleep(random.uniform(3, 6))
             html_content = local_driver.page_source
-            if "linkedin.com" in url:
-                logger.info("Using LinkedIn parser")
-                jobs = parse_linkedin(html_content, url)
-            elif "indeed.com" in url:
-                logger.info("Using Indeed parser")
-                jobs = parse_indeed(html_content, url)
-            else:
-                logger.info("Using generic parser")
-                jobs = parse_generic(html_content, url)
+            jobs = _parse_jobs(html_content, url)
+            # Only cache pages that produced jobs, never empty or blocked renders
+            if jobs:
+                http_cache.put(url, html_content, namespace="rendered")
             return jobs
         finally:
             if local_driver:
@@ -162,7 +226,7 @@ def scrape_jobs(url: str, proxies_list: list = None) -> list:
         # If no jobs found and this is an anti-bot site, retry with new user agent/proxy
         if (not jobs or len(jobs) == 0) and ("indeed.com" in url.lower()):
             logger.info("No jobs found on first attempt, retrying with new user agent and proxy (if available)...")
-            new_user_agent = ua.random
+            new_user_agent = random_user_agent()
             new_proxy = None
             if proxies_list:
                 new_proxy = random.choice(proxies_list)
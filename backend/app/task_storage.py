@@ -1,114 +1,167 @@
+"""
+Storage of upload and batch tasks.
+
+Each task is one row of a SQLite file, so a task created by one worker process can be polled
+through any other, and saving a task writes only its own row. The store reads through to the
+file on every access instead of keeping a copy per worker.
+"""
+
 import os
 import json
-from typing import Dict, Any
+import sqlite3
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
 import logging
 
+from .paths import data_path
+
 logger = logging.getLogger("job_search_app.task_storage")
 
-class TaskStorage:
+TASK_STORAGE_PATH = os.getenv("TASK_STORAGE_PATH", data_path("tasks.sqlite3"))
+# JSON store of earlier versions, imported once into an empty SQLite store
+LEGACY_TASK_STORAGE_FILE = "./task_storage.json"
+
+class TaskStorage(Mapping):
     """
-    A simple class for storing and retrieving tasks in memory with optional persistence to disk
+    Tasks by ID, persisted in SQLite and shared by every worker; reads as a read-only
+    dictionary, writes go through add, update and delete
     """
-    
-    def __init__(self, storage_file: str = "./task_storage.json"):
+
+    def __init__(self, path: str = TASK_STORAGE_PATH, legacy_file: Optional[str] = LEGACY_TASK_STORAGE_FILE):
         """
         Initialize the TaskStorage
-        
+
         Args:
-            storage_file: Optional path to a JSON file for persisting tasks
+            path: Path of the SQLite file shared by every worker
+            legacy_file: JSON store to import if the SQLite store is empty
         """
-        self.tasks = {}
-        self.storage_file = storage_file
-        
-        # Try to load existing tasks if the storage file exists
-        self._load_from_disk()
-        
-        logger.info(f"TaskStorage initialized with {len(self.tasks)} tasks")
-    
-    def _load_from_disk(self) -> None:
-        """Load tasks from disk if the storage file exists"""
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS tasks (task_id TEXT PRIMARY KEY, data TEXT)")
+
+        if legacy_file and os.path.exists(legacy_file) and len(self) == 0:
+            self._import_legacy(legacy_file)
+
+        logger.info(f"TaskStorage initialized with {len(self)} tasks")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
         try:
-            if os.path.exists(self.storage_file):
-                with open(self.storage_file, 'r') as f:
-                    self.tasks = json.load(f)
-                logger.info(f"Loaded {len(self.tasks)} tasks from {self.storage_file}")
-        except Exception as e:
-            logger.error(f"Error loading tasks from disk: {str(e)}")
-    
-    def _save_to_disk(self) -> None:
-        """Save tasks to disk"""
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_legacy(self, legacy_file: str) -> None:
+        """Copy the tasks of a JSON store written by earlier versions"""
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(os.path.abspath(self.storage_file)), exist_ok=True)
-            
-            # Save tasks to file
-            with open(self.storage_file, 'w') as f:
-                json.dump(self.tasks, f)
-            logger.info(f"Saved {len(self.tasks)} tasks to {self.storage_file}")
+            with open(legacy_file, 'r') as f:
+                legacy = json.load(f)
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO tasks VALUES (?, ?)",
+                    [(task_id, json.dumps(task_data)) for task_id, task_data in legacy.items()]
+                )
+            logger.info(f"Imported {len(legacy)} tasks from {legacy_file}")
         except Exception as e:
-            logger.error(f"Error saving tasks to disk: {str(e)}")
-    
-    def get(self, task_id: str) -> Dict[str, Any]:
+            logger.error(f"Error importing tasks from {legacy_file}: {str(e)}")
+
+    def __getitem__(self, task_id: str) -> Dict[str, Any]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+        return json.loads(row[0])
+
+    def __contains__(self, task_id: object) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM tasks WHERE task_id = ?", (task_id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._connect() as conn:
+            return iter([row[0] for row in conn.execute("SELECT task_id FROM tasks ORDER BY rowid")])
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def items(self):
+        # One query instead of one per task
+        return self.get_all().items()
+
+    def get(self, task_id: str, default: Any = None) -> Any:
         """
         Get a task by ID
-        
+
         Args:
             task_id: The ID of the task to retrieve
-            
+            default: Returned if the task is not found
+
         Returns:
-            The task dictionary or an empty dict if not found
+            A copy of the task dictionary, or default if not found
         """
-        return self.tasks.get(task_id, {})
-    
+        try:
+            return self[task_id]
+        except KeyError:
+            return default
+
     def get_all(self) -> Dict[str, Any]:
         """
         Get all tasks
-        
+
         Returns:
-            Dictionary of all tasks
+            Dictionary of copies of all tasks
         """
-        return self.tasks
-    
+        with self._connect() as conn:
+            return {task_id: json.loads(data) for task_id, data in conn.execute("SELECT task_id, data FROM tasks ORDER BY rowid")}
+
     def add(self, task_id: str, task_data: Dict[str, Any]) -> None:
         """
         Add or update a task
-        
+
         Args:
             task_id: The ID of the task
             task_data: The task data
         """
-        self.tasks[task_id] = task_data
-        self._save_to_disk()
-        
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO tasks VALUES (?, ?) ON CONFLICT(task_id) DO UPDATE SET data = excluded.data",
+                    (task_id, json.dumps(task_data))
+                )
+        except Exception as e:
+            logger.error(f"Error saving task {task_id}: {str(e)}")
+
     def update(self, task_id: str, task_data: Dict[str, Any]) -> bool:
         """
         Update an existing task
-        
+
         Args:
             task_id: The ID of the task to update
             task_data: The new task data
-            
+
         Returns:
             True if the task was updated, False if not found
         """
-        if task_id in self.tasks:
-            self.tasks[task_id] = task_data
-            self._save_to_disk()
-            return True
-        return False
-    
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("UPDATE tasks SET data = ? WHERE task_id = ?", (json.dumps(task_data), task_id))
+        return cursor.rowcount == 1
+
     def delete(self, task_id: str) -> bool:
         """
         Delete a task
-        
+
         Args:
             task_id: The ID of the task to delete
-            
+
         Returns:
             True if the task was deleted, False if not found
         """
-        if task_id in self.tasks:
-            del self.tasks[task_id]
-            self._save_to_disk()
-            return True
-        return False
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+        return cursor.rowcount == 1
@@ -0,0 +1,185 @@
+"""
+Content-addressed storage of uploaded resumes.
+
+Uploads are streamed to disk in chunks, with the file writes moved off the event loop, and
+hashed while they are written. A file is stored once under its SHA-256 digest, so the same
+resume uploaded repeatedly takes no extra space and its digest identifies the parsed resume
+in the ResumeStore. Uploads larger than MAX_UPLOAD_BYTES are rejected while streaming,
+before they are fully read, and RequestSizeLimitMiddleware rejects oversized request bodies
+while they are received, before the form parser spools them to disk.
+"""
+
+import os
+import glob
+import uuid
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger("job_search_app.upload_store")
+
+# Largest accepted upload
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Room for the multipart boundaries and form fields around an uploaded file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the maximum size"""
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware answering 413 to request bodies larger than the limit of their path, from
+    the declared Content-Length or as soon as the bytes received exceed it
+    """
+
+    def __init__(self, app: Any, limits: Dict[str, int]):
+        """
+        Initialize the RequestSizeLimitMiddleware
+
+        Args:
+            app: The wrapped ASGI application
+            limits: Largest accepted body in bytes per request path; other paths are not limited
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        detail = f"Request exceeds the maximum size of {limit} bytes"
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Dict[str, Any]:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the request handler, so it is answered like any HTTPException
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+async def save_upload(
+    upload: Any,
+    upload_dir: Path,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Stream an upload to content-addressed storage
+
+    Args:
+        upload: The uploaded file (e.g. a FastAPI UploadFile) with an async read(size) and a filename
+        upload_dir: Directory files are stored in
+        max_bytes: Largest accepted upload
+        chunk_size: Bytes read and written at a time
+
+    Returns:
+        Dictionary with 'sha256', 'path', 'size', 'filename' and 'duplicate' (True if the same
+        content was already stored)
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds max_bytes
+    """
+    upload_dir = Path(upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    filename = os.path.basename(upload.filename or "upload")
+    tmp_path = upload_dir / f".upload-{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    buffer = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds the maximum size of {max_bytes} bytes")
+            digest.update(chunk)
+            await asyncio.to_thread(buffer.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(buffer.close)
+        await asyncio.to_thread(_remove, tmp_path)
+        raise
+    await asyncio.to_thread(buffer.close)
+
+    return await asyncio.to_thread(_commit, tmp_path, upload_dir, digest.hexdigest(), filename, size)
+
+def _commit(tmp_path: Optional[Path], upload_dir: Path, sha256: str, filename: str, size: int) -> Dict[str, Any]:
+    """Move a fully written temporary file to its content address, unless that content is already stored."""
+    # The extension is kept because text extraction dispatches on it
+    path = upload_dir / f"{sha256}{Path(filename).suffix.lower()}"
+    duplicate = path.exists()
+    if duplicate:
+        if tmp_path is not None:
+            _remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+    logger.info(f"Stored upload {filename} ({size} bytes) as {path.name}{' (duplicate)' if duplicate else ''}")
+    return {"sha256": sha256, "path": str(path), "size": size, "filename": filename, "duplicate": duplicate}
+
+def store_bytes(data: bytes, filename: str, upload_dir: Path) -> Dict[str, Any]:
+    """
+    Store file content already in memory, e.g. a member of an uploaded archive
+
+    Args:
+        data: Content of the file
+        filename: Original file name
+        upload_dir: Directory files are stored in
+
+    Returns:
+        Dictionary with 'sha256', 'path', 'size', 'filename' and 'duplicate', as save_upload
+    """
+    upload_dir = Path(upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    filename = os.path.basename(filename or "upload")
+    sha256 = hashlib.sha256(data).hexdigest()
+    if (upload_dir / f"{sha256}{Path(filename).suffix.lower()}").exists():
+        return _commit(None, upload_dir, sha256, filename, len(data))
+    tmp_path = upload_dir / f".upload-{uuid.uuid4().hex}.part"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    return _commit(tmp_path, upload_dir, sha256, filename, len(data))
+
+def find_upload(upload_dir: Path, file_id: str) -> Optional[Path]:
+    """
+    Find a stored upload by its digest, or by the prefix of a file stored under its task ID
+
+    Args:
+        upload_dir: Directory files are stored in
+        file_id: SHA-256 digest or file name prefix
+
+    Returns:
+        Path of the file or None if not found
+    """
+    if not file_id or "/" in file_id or "\\" in file_id or file_id.startswith("."):
+        return None
+    matching_files = sorted(Path(upload_dir).glob(f"{glob.escape(file_id)}*"))
+    return matching_files[0] if matching_files else None
@@ -1,14 +1,83 @@
 import csv
 from typing import List, Dict, Any
 import re
+import socket
+import ipaddress
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import logging
-import requests
 from bs4 import BeautifulSoup
 import random
+from . import http_client
 
 # Get module logger
 logger = logging.getLogger("job_search_app.utils")
 
+# Query parameters that only track the visitor and never change the page content, on any site
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid"}
+# Parameters that are tracking-only on a given board (matched on the host suffix) but may select
+# content elsewhere, e.g. "from" is a search filter on many sites
+BOARD_TRACKING_PARAMS = {
+    "linkedin.com": {"refid", "trackingid", "trk"},
+    "indeed.com": {"from", "vjk"},
+}
+
+def _tracking_params(host: str) -> set:
+    """Tracking parameters of a host: the generic ones plus those of its board"""
+    params = set(TRACKING_PARAMS)
+    for domain, board_params in BOARD_TRACKING_PARAMS.items():
+        if host == domain or host.endswith("." + domain):
+            params |= board_params
+    return params
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent links map to the same cache key
+    
+    Lowercases the scheme and host, drops default ports, fragments, tracking parameters (generic
+    ones and those known for the URL's board) and trailing slashes, and sorts the remaining
+    query parameters.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    tracking = _tracking_params(parts.hostname.lower() if parts.hostname else "")
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in tracking
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def is_public_url(url: str) -> bool:
+    """
+    Whether a URL is an http(s) URL whose host resolves only to public addresses, so a request
+    to it cannot reach loopback, private, link-local or other internal services
+    
+    Args:
+        url: URL to check
+        
+    Returns:
+        True if every address of the host is globally routable
+    """
+    try:
+        parts = urlsplit(url.strip())
+        if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+            return False
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, parts.port or None, type=socket.SOCK_STREAM)}
+        # Zone ids ("fe80::1%eth0") are not part of the address
+        return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_global for address in addresses)
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not resolve {url}: {str(e)}")
+        return False
+
 def export_to_csv(jobs: List[Dict[str, Any]], file_path: str) -> bool:
     """
     Export job listings to CSV file
@@ -67,7 +136,7 @@ def extract_skills_from_url(url: str) -> List[str]:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10, follow_redirects=True, cache=True)
         if response.status_code != 200:
             logger.warning(f"Failed to retrieve URL: {url}, status code: {response.status_code}")
             return skills
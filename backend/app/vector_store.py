@@ -7,9 +7,11 @@ GCP Dataflow/Vertex AI/Cloud Storage code is scaffolded and commented for future
 # The following code is configured for local development using MongoDB and Hugging Face embeddings.
 # To enable cloud integration, uncomment the GCP-related sections below and configure your GCP credentials.
 
-from sentence_transformers import SentenceTransformer
-from pymongo import MongoClient
+import os
 import numpy as np
+from .matcher import extract_job_requirements, EXTRACTOR_VERSION
+from .ann_index import VectorIndex
+from .models import get_model
 
 # --- GCP Integration (Commented for Local Development) ---
 # Uncomment the following imports and functions to enable GCP integration.
@@ -25,34 +27,78 @@ import numpy as np
 #     # Use Vertex AI Matching Engine or similar for semantic search
 #     pass
 
-# --- Local MongoDB Setup ---
-client = MongoClient("mongodb://localhost:27017/")
-db = client["job_search"]
-jobs_col = db["jobs"]
+# --- Local MongoDB Setup (connected on first use) ---
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+_jobs_col = None
 
-# --- Embedding Model (local Hugging Face) ---
-import torch
-device = "cuda" if torch.cuda.is_available() else "cpu"
-model = SentenceTransformer("all-MiniLM-L6-v2", device=device)
+def get_jobs_collection():
+    """The MongoDB jobs collection, connecting on first use"""
+    global _jobs_col
+    if _jobs_col is None:
+        from pymongo import MongoClient
+        client = MongoClient(MONGO_URI)
+        _jobs_col = client["job_search"]["jobs"]
+    return _jobs_col
 
-# --- Local: Add job with embedding ---
-def add_job_local(job_dict):
+# --- Embedding Model: the app's shared sentence transformer (see models.py) ---
+
+# --- Local: In-memory ANN index over the job embeddings stored in MongoDB ---
+_job_index = None
+
+def get_job_index() -> VectorIndex:
+    """Build the job index from MongoDB on first use and keep it in sync afterwards"""
+    global _job_index
+    if _job_index is None:
+        index = VectorIndex()
+        ids, embeddings = [], []
+        for job in get_jobs_collection().find({"embedding": {"$exists": True}, "expired": {"$ne": True}}, {"embedding": 1}):
+            ids.append(job["_id"])
+            embeddings.append(job["embedding"])
+        if ids:
+            index.add(ids, np.array(embeddings))
+        _job_index = index
+    return _job_index
+
+# --- Local: Add job with embedding and precomputed requirement features ---
+def add_job_local(job_dict, embedding=None):
     text = job_dict["description"]
-    embedding = model.encode(text).tolist()
+    if embedding is None:
+        embedding = get_model("embedding").encode(text)
+    embedding = np.asarray(embedding).tolist()
     job_dict["embedding"] = embedding
-    jobs_col.insert_one(job_dict)
+    job_dict["expired"] = False
+    # Features are extracted once at ingest so matching against the corpus does no regex work
+    if job_dict.get("features_version") != EXTRACTOR_VERSION:
+        job_dict["features"] = extract_job_requirements(text, job_dict.get("title", ""))
+        job_dict["features_version"] = EXTRACTOR_VERSION
+    jobs_col = get_jobs_collection()
+    if job_dict.get("url"):
+        # A re-scraped listing replaces its previous version instead of adding a duplicate
+        result = jobs_col.replace_one({"url": job_dict["url"]}, job_dict, upsert=True)
+        job_id = result.upserted_id or jobs_col.find_one({"url": job_dict["url"]}, {"_id": 1})["_id"]
+    else:
+        job_id = jobs_col.insert_one(job_dict).inserted_id
+    if _job_index is not None:
+        _job_index.add([job_id], np.array([embedding]))
+
+# --- Local: Mark listings that disappeared from their board as expired ---
+def expire_jobs_local(urls):
+    if not urls:
+        return 0
+    jobs_col = get_jobs_collection()
+    job_ids = [job["_id"] for job in jobs_col.find({"url": {"$in": list(urls)}}, {"_id": 1})]
+    if job_ids:
+        jobs_col.update_many({"_id": {"$in": job_ids}}, {"$set": {"expired": True}})
+        if _job_index is not None:
+            _job_index.remove(job_ids)
+    return len(job_ids)
 
 # --- Local: Semantic search ---
 def search_jobs_local(query, top_k=5):
-    query_emb = model.encode(query)
-    jobs = list(jobs_col.find())
-    scored = []
-    for job in jobs:
-        emb = np.array(job["embedding"])
-        score = float(np.dot(query_emb, emb) / (np.linalg.norm(query_emb) * np.linalg.norm(emb)))
-        scored.append((score, job))
-    scored.sort(reverse=True, key=lambda x: x[0])
-    return [job for score, job in scored[:top_k]]
+    query_emb = get_model("embedding").encode(query)
+    hits = get_job_index().search(query_emb, top_k)
+    jobs_by_id = {job["_id"]: job for job in get_jobs_collection().find({"_id": {"$in": [job_id for job_id, _ in hits]}})}
+    return [jobs_by_id[job_id] for job_id, score in hits if job_id in jobs_by_id]
 
 # Usage example (local):
 # add_job_local({"title": "ML Engineer", "description": "Build ML pipelines..."})
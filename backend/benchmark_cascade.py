@@ -0,0 +1,51 @@
+"""
+Recall and latency of the retrieval cascade against exhaustive scoring.
+
+Usage:
+    python benchmark_cascade.py --jobs jobs.json --resumes resume.txt --limit 10 --k 25 50 100
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from app.matcher import compute_embeddings, rank_jobs, cascade_recall
+from benchmark_corpus import load_jobs, load_resumes
+
+logging.basicConfig(level=logging.WARNING)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the shortlist cascade with exhaustive ranking")
+    parser.add_argument("--jobs", nargs="*", help="JSON or CSV job files (default: ./results/*.csv)")
+    parser.add_argument("--resumes", nargs="*", help="Resume files (default: ./uploads/*)")
+    parser.add_argument("--limit", type=int, default=10, help="Size of the top list compared")
+    parser.add_argument("--k", type=int, nargs="+", default=[25, 50, 100, 200], help="Shortlist sizes to evaluate")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs)
+    resumes = load_resumes(args.resumes)
+    if not jobs or not resumes:
+        print("Benchmark corpus is empty, pass --jobs and --resumes")
+        return
+
+    job_texts = [job.get("description") or job.get("title") or "" for job in jobs]
+    job_titles = [job.get("title", "") for job in jobs]
+    job_embs = compute_embeddings(job_texts)
+    resume_embs = compute_embeddings(resumes)
+
+    print(f"{len(resumes)} resumes x {len(jobs)} jobs, recall@{args.limit}")
+    print(f"{'K':>8} {'recall':>8} {'ms/resume':>10}")
+    for k in [0] + args.k:
+        recalls, elapsed = [], 0.0
+        for resume_text, resume_emb in zip(resumes, resume_embs):
+            start = time.perf_counter()
+            rank_jobs(resume_emb, job_embs, resume_text, job_texts, job_titles, limit=args.limit, shortlist_k=k)
+            elapsed += time.perf_counter() - start
+            recalls.append(cascade_recall(resume_emb, job_embs, resume_text, job_texts, job_titles,
+                                          limit=args.limit, shortlist_k=k))
+        label = "all" if k == 0 else str(k)
+        print(f"{label:>8} {np.mean(recalls):>8.3f} {elapsed / len(resumes) * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
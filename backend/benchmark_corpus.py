@@ -0,0 +1,54 @@
+"""
+Shared benchmark corpus loader.
+
+Jobs are read from JSON files (a list of job dicts) or from the CSV exports written to
+./results, resumes from text files or any uploaded resume format in ./uploads.
+"""
+import csv
+import glob
+import json
+import logging
+from typing import Dict, Any, List, Optional
+
+from app.resume_parser import extract_text
+
+logger = logging.getLogger("benchmark_corpus")
+
+def load_jobs(paths: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Load unique jobs from JSON or CSV files (defaults to ./results/*.csv)"""
+    paths = paths or sorted(glob.glob("./results/*.csv"))
+    jobs, seen = [], set()
+    for path in paths:
+        try:
+            if path.endswith(".json"):
+                with open(path, encoding="utf-8") as f:
+                    rows = json.load(f)
+            else:
+                with open(path, newline="", encoding="utf-8") as f:
+                    rows = list(csv.DictReader(f))
+        except Exception as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        for row in rows:
+            key = (row.get("title", ""), row.get("description", ""))
+            if key not in seen and any(key):
+                seen.add(key)
+                jobs.append(row)
+    logger.info(f"Loaded {len(jobs)} benchmark jobs from {len(paths)} files")
+    return jobs
+
+def load_resumes(paths: Optional[List[str]] = None) -> List[str]:
+    """Load resume texts from text files or uploaded resumes (defaults to ./uploads/*)"""
+    paths = paths or sorted(glob.glob("./uploads/*"))
+    resumes = []
+    for path in paths:
+        try:
+            if path.endswith(".txt"):
+                with open(path, encoding="utf-8") as f:
+                    resumes.append(f.read())
+            else:
+                resumes.append(extract_text(path))
+        except Exception as e:
+            logger.warning(f"Skipping {path}: {e}")
+    logger.info(f"Loaded {len(resumes)} benchmark resumes")
+    return [text for text in resumes if text]
@@ -0,0 +1,82 @@
+"""
+Accuracy and throughput of the quantized embedding backends against the fp32 baseline.
+
+For every resume in the benchmark corpus, jobs are ranked by cosine similarity with each
+backend and compared with the fp32 ranking (top-k overlap and Spearman rank correlation).
+
+Usage:
+    python benchmark_embeddings.py --jobs jobs.json --resumes resume.txt --backends int8 onnx
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from app.matcher import load_embedding_model
+from benchmark_corpus import load_jobs, load_resumes
+
+logging.basicConfig(level=logging.WARNING)
+
+def encode(model, texts):
+    """Encode texts and return (normalized embeddings, texts per second)"""
+    start = time.perf_counter()
+    embeddings = np.asarray(model.encode(texts, show_progress_bar=False), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings, len(texts) / elapsed
+
+def spearman(a, b):
+    """Spearman rank correlation of two score vectors"""
+    rank_a = np.argsort(np.argsort(-a))
+    rank_b = np.argsort(np.argsort(-b))
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedding backends with the fp32 baseline")
+    parser.add_argument("--jobs", nargs="*", help="JSON or CSV job files (default: ./results/*.csv)")
+    parser.add_argument("--resumes", nargs="*", help="Resume files (default: ./uploads/*)")
+    parser.add_argument("--backends", nargs="+", default=["int8", "onnx"], help="Backends to compare with torch fp32")
+    parser.add_argument("--top-k", type=int, default=10, help="Size of the top list compared")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs)
+    resumes = load_resumes(args.resumes)
+    if not jobs or not resumes:
+        print("Benchmark corpus is empty, pass --jobs and --resumes")
+        return
+    job_texts = [job.get("description") or job.get("title") or "" for job in jobs]
+    top_k = min(args.top_k, len(job_texts))
+
+    baseline = load_embedding_model("torch", fallback=False)
+    base_jobs, base_rate = encode(baseline, job_texts)
+    base_resumes, _ = encode(baseline, resumes)
+    base_scores = base_resumes @ base_jobs.T
+
+    print(f"{len(resumes)} resumes x {len(jobs)} jobs")
+    print(f"{'backend':>8} {'texts/s':>9} {'speedup':>8} {'cosine':>8} {'top-k':>7} {'spearman':>9}")
+    print(f"{'torch':>8} {base_rate:>9.1f} {1.0:>8.2f} {1.0:>8.4f} {1.0:>7.3f} {1.0:>9.3f}")
+    for backend in args.backends:
+        try:
+            model = load_embedding_model(backend, fallback=False)
+        except Exception as e:
+            print(f"{backend:>8} failed to load: {e}")
+            continue
+        jobs_emb, rate = encode(model, job_texts)
+        resumes_emb, _ = encode(model, resumes)
+        scores = resumes_emb @ jobs_emb.T
+
+        # Agreement with the fp32 baseline
+        cosine = float(np.mean(np.sum(jobs_emb * base_jobs, axis=1)))
+        overlaps, correlations = [], []
+        for expected, actual in zip(base_scores, scores):
+            expected_top = set(np.argsort(-expected)[:top_k])
+            actual_top = set(np.argsort(-actual)[:top_k])
+            overlaps.append(len(expected_top & actual_top) / top_k)
+            if len(job_texts) > 1:
+                correlations.append(spearman(expected, actual))
+        print(f"{backend:>8} {rate:>9.1f} {rate / base_rate:>8.2f} {cosine:>8.4f} "
+              f"{np.mean(overlaps):>7.3f} {np.mean(correlations) if correlations else 1.0:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cold start time of the API: `import app.main` in a fresh interpreter, and optionally the
+model warmup that follows it.
+
+Usage:
+    python benchmark_startup.py --runs 5 [--warmup]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules that must not be imported by `import app.main` itself
+HEAVY_MODULES = [
+    "torch", "sentence_transformers", "spacy", "selenium", "undetected_chromedriver",
+    "webdriver_manager", "pymongo", "fake_useragent", "docx", "PyPDF2"
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+result = {"import_seconds": time.perf_counter() - start,
+          "heavy_modules": [name for name in %r if name in sys.modules]}
+if %r:
+    from app import models
+    start = time.perf_counter()
+    result["models"] = models.warmup()
+    result["warmup_seconds"] = time.perf_counter() - start
+print(json.dumps(result))
+"""
+
+def run_probe(warmup: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE % (HEAVY_MODULES, warmup)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold start time of the API")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument("--warmup", action="store_true", help="Also time loading the models after the import")
+    args = parser.parse_args()
+
+    results = [run_probe(args.warmup) for _ in range(args.runs)]
+    import_times = [result["import_seconds"] * 1000 for result in results]
+    print(f"import app.main over {args.runs} runs: median {statistics.median(import_times):.0f} ms, "
+          f"min {min(import_times):.0f} ms, max {max(import_times):.0f} ms")
+    heavy = sorted({name for result in results for name in result["heavy_modules"]})
+    print(f"Heavy modules imported eagerly: {', '.join(heavy) if heavy else 'none'}")
+    if args.warmup:
+        warmup_times = [result["warmup_seconds"] * 1000 for result in results]
+        print(f"Model warmup: median {statistics.median(warmup_times):.0f} ms")
+        for name, state in results[-1]["models"].items():
+            print(f"  {name:<14} {state['status']:<11} {state['load_seconds'] if state['load_seconds'] is not None else '-'}")
+
+if __name__ == "__main__":
+    main()
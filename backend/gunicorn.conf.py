@@ -0,0 +1,56 @@
+"""
+Gunicorn configuration for multi-worker deployments that share the models between workers.
+
+The app is imported and its models loaded once in the master process, then the workers are
+forked from it: the model weights are shared copy-on-write instead of being loaded again by
+every worker, so the worker count is bounded by cores rather than RAM. gc.freeze() keeps the
+garbage collector from touching (and so copying) the preloaded objects in the workers.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Loading models before the fork only works on CPU; set PRELOAD_MODELS=false when the models
+run on a GPU, so each worker initialises CUDA itself.
+"""
+import gc
+import os
+import sys
+import multiprocessing
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+preload_app = True
+
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "true").lower() == "true"
+# Intra-op threads per worker, so that workers x threads matches the core count
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", str(max(1, multiprocessing.cpu_count() // workers))))
+
+def when_ready(server):
+    """Runs in the master once the app is imported, before any worker is forked"""
+    if PRELOAD_MODELS:
+        from app import models
+        states = models.warmup()
+        loaded = ", ".join(f"{name} {state['status']}" for name, state in states.items())
+        server.log.info(f"Preloaded models: {loaded}")
+    # Move everything allocated so far out of the collector's reach, so workers never write to it
+    gc.collect()
+    gc.freeze()
+
+def pre_fork(server, worker):
+    """Runs in the master before each fork: one worker at a time runs the saved search scheduler"""
+    if not any(getattr(other, "runs_scheduler", False) for other in server.WORKERS.values()):
+        worker.runs_scheduler = True
+
+def post_fork(server, worker):
+    """Runs in each worker right after the fork"""
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(TORCH_THREADS_PER_WORKER)
+    if not getattr(worker, "runs_scheduler", False):
+        import app.main
+        app.main.SAVED_SEARCH_POLL_SECONDS = 0
+    server.log.info(
+        f"Worker {worker.pid} started ({TORCH_THREADS_PER_WORKER} torch threads"
+        f"{', saved search scheduler' if getattr(worker, 'runs_scheduler', False) else ''})"
+    )
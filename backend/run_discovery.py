@@ -1,7 +1,27 @@
+"""
+Discover company career pages and scrape their jobs.
+
+Companies are processed concurrently: the search, crawl and scrape stages each have their
+own concurrency limit, and requests to the same company domain are paced by the shared
+per-domain rate limiter (app/rate_limiter.py) that every crawl fetch and scrape goes through.
+Each finished company is appended to a JSONL output file, which doubles as the checkpoint: an
+interrupted run skips the companies already written when restarted, and a company whose
+discovery failed is not written, so it is retried.
+
+Usage:
+    python run_discovery.py --companies companies.csv --output discovery_results.jsonl [--restart]
+"""
 import os
 import csv
+import json
+import time
+import asyncio
+import argparse
 import logging
-from app.discovery import find_career_page_google, crawl_for_career_page
+import httpx
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.discovery import find_career_page_google_async, crawl_career_site, career_url_confidence
+from app.discovery_cache import DiscoveryCache, company_key
 from app.scraper_no_retry import scrape_jobs
 from dotenv import load_dotenv
 
@@ -15,50 +35,238 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 SEARCH_ENGINE_ID = os.getenv("SEARCH_ENGINE_ID")
 
 # The input file is now a CSV file
-COMPANIES_FILE = r"C:\Users\ideal\Documents\companies.csv"
+COMPANIES_FILE = os.getenv("COMPANIES_FILE", r"C:\Users\ideal\Documents\companies.csv")
+OUTPUT_FILE = os.getenv("DISCOVERY_OUTPUT_FILE", "./discovery_results.jsonl")
+
+# Concurrency per stage: searches are cheap API calls, crawls fetch a few pages each
+# (CRAWL_MAX_PAGES), scrapes each drive a headless browser
+SEARCH_CONCURRENCY = int(os.getenv("DISCOVERY_SEARCH_CONCURRENCY", "5"))
+CRAWL_CONCURRENCY = int(os.getenv("DISCOVERY_CRAWL_CONCURRENCY", "10"))
+SCRAPE_CONCURRENCY = int(os.getenv("DISCOVERY_SCRAPE_CONCURRENCY", "2"))
+# The discovery cache is written once per this many finished companies, and at the end
+CACHE_SAVE_EVERY = int(os.getenv("DISCOVERY_CACHE_SAVE_EVERY", "25"))
+
+def load_companies(companies_file: str) -> List[Dict[str, str]]:
+    """Read the companies CSV (columns: name, domain)."""
+    with open(companies_file, "r", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def load_completed(output_file: str) -> Set[str]:
+    """
+    Companies already written to the output file by a previous run
+
+    Args:
+        output_file: Path of the JSONL output file
+
+    Returns:
+        Set of company keys
+    """
+    completed = set()
+    if not os.path.exists(output_file):
+        return completed
+    with open(output_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                completed.add(company_key(json.loads(line)["company"]))
+            except (ValueError, KeyError):
+                # A line cut short by an interrupted run; that company is processed again
+                continue
+    return completed
+
+class DiscoveryError(Exception):
+    """Discovery found no career page but a search or crawl failed, so the company may still have one"""
+
+async def discover_career_page(
+    company_data: Dict[str, str],
+    stages: Dict[str, asyncio.Semaphore]
+) -> Tuple[Optional[str], Optional[str], float]:
+    """
+    Find the career page of a company over the network
+
+    Args:
+        company_data: CSV row with 'name' and optional 'domain'
+        stages: Semaphores bounding the 'search' and 'crawl' stages
+
+    Returns:
+        Tuple of (career page URL, source, confidence) or (None, None, 0.0) if every step
+        succeeded without finding one
+
+    Raises:
+        DiscoveryError: If nothing was found and the search or the crawl failed
+    """
+    company_name = company_data.get("name")
+    company_url = company_data.get("domain")
+    errors = []
+
+    # 1. Find the career page using Google Search API
+    async with stages["search"]:
+        try:
+            career_page_url = await find_career_page_google_async(company_name, GOOGLE_API_KEY, SEARCH_ENGINE_ID)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Google Search API request failed for {company_name}: {e}")
+            errors.append(f"search: {e}")
+            career_page_url = None
+    if career_page_url:
+        return career_page_url, "google", career_url_confidence(career_page_url, "google")
+
+    # 2. If Google fails and a domain is provided, try crawling
+    if company_url:
+        homepage = f"https://{company_url}"
+        async with stages["crawl"]:
+            try:
+                career_page_url, score = await crawl_career_site(homepage)
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to crawl {homepage}: {e}")
+                errors.append(f"crawl: {e}")
+                career_page_url, score = None, 0.0
+        if career_page_url:
+            return career_page_url, "crawl", score
+
+    if errors:
+        raise DiscoveryError(f"No career page found for {company_name} ({'; '.join(errors)})")
+    return None, None, 0.0
+
+async def scrape_career_page(career_page_url: str, stages: Dict[str, asyncio.Semaphore]) -> List[Dict[str, Any]]:
+    """Scrape a career page; Selenium is blocking, so it runs in a worker thread."""
+    async with stages["scrape"]:
+        logger.info(f"Scraping jobs from {career_page_url}")
+        return await asyncio.to_thread(scrape_jobs, career_page_url)
+
+async def process_company(
+    company_data: Dict[str, str],
+    cache: DiscoveryCache,
+    stages: Dict[str, asyncio.Semaphore]
+) -> Dict[str, Any]:
+    """
+    Find the career page of one company and scrape its jobs
+
+    Args:
+        company_data: CSV row with 'name' and optional 'domain'
+        cache: Cache of previously discovered career pages
+        stages: Semaphores bounding the 'search', 'crawl' and 'scrape' stages
+
+    Returns:
+        Result dictionary written to the output file
+
+    Raises:
+        DiscoveryError: If discovery failed; nothing is cached for the company
+    """
+    company_name = company_data.get("name")
+    logger.info(f"--- Processing {company_name} ---")
+
+    async def discover() -> Tuple[Optional[str], Optional[str]]:
+        career_page_url, source, confidence = await discover_career_page(company_data, stages)
+        if career_page_url:
+            cache.set(company_name, career_page_url, source, confidence)
+        else:
+            # Only a search that succeeded without a result is remembered as "no career page"
+            cache.set_negative(company_name)
+        return career_page_url, source
+
+    # Fresh cache entries, positive or negative, skip discovery entirely
+    cached = cache.get(company_name)
+    if cached:
+        career_page_url, source = cached["url"], "cache"
+    else:
+        career_page_url, source = await discover()
+
+    # 3. If a career page is found, scrape it
+    jobs = await scrape_career_page(career_page_url, stages) if career_page_url else []
+
+    if not jobs and source == "cache" and career_page_url:
+        # The cached page stopped yielding jobs (moved or redesigned): rediscover once
+        cache.invalidate(company_name)
+        previous_url = career_page_url
+        career_page_url, source = await discover()
+        if career_page_url and career_page_url != previous_url:
+            jobs = await scrape_career_page(career_page_url, stages)
+
+    if jobs:
+        logger.info(f"Found {len(jobs)} jobs at {company_name}")
+    elif career_page_url:
+        logger.warning(f"No jobs found at {career_page_url}")
+    else:
+        logger.error(f"Could not find a career page for {company_name}")
+
+    entry = cache.get(company_name) or {}
+    return {
+        "company": company_name,
+        "domain": company_data.get("domain"),
+        "career_url": career_page_url,
+        "source": source if career_page_url else None,
+        "confidence": entry.get("confidence"),
+        "jobs": jobs,
+        "processed_at": time.time()
+    }
+
+async def run_pipeline(companies: List[Dict[str, str]], output_file: str, cache: DiscoveryCache) -> int:
+    """
+    Process companies concurrently, appending each result to the output file as it finishes
+
+    Args:
+        companies: CSV rows still to process
+        output_file: Path of the JSONL output file
+        cache: Cache of previously discovered career pages
+
+    Returns:
+        Number of companies processed
+    """
+    stages = {
+        "search": asyncio.Semaphore(SEARCH_CONCURRENCY),
+        "crawl": asyncio.Semaphore(CRAWL_CONCURRENCY),
+        "scrape": asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    }
+    tasks = [asyncio.create_task(process_company(company, cache, stages)) for company in companies]
+
+    processed = 0
+    try:
+        with open(output_file, "a", encoding="utf-8") as out:
+            for next_result in asyncio.as_completed(tasks):
+                try:
+                    result = await next_result
+                except Exception as e:
+                    # Failed companies are not checkpointed, so the next run retries them
+                    logger.error(f"Discovery failed: {str(e)}")
+                    continue
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                processed += 1
+                if processed % CACHE_SAVE_EVERY == 0:
+                    cache.save()
+                for job in result["jobs"]:
+                    print(f"  - {job['title']} at {job.get('company', result['company'])}")
+                logger.info(f"Progress: {processed}/{len(companies)} companies")
+    finally:
+        # Also after an interruption: the companies discovered so far are not searched again
+        cache.save()
+    return processed
 
 def main():
+    parser = argparse.ArgumentParser(description="Discover career pages and scrape jobs for a list of companies")
+    parser.add_argument("--companies", default=COMPANIES_FILE, help="CSV file with 'name' and 'domain' columns")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="JSONL file results are appended to")
+    parser.add_argument("--restart", action="store_true", help="Ignore progress from a previous run")
+    args = parser.parse_args()
+
     if not GOOGLE_API_KEY or not SEARCH_ENGINE_ID:
         logger.error("Please set GOOGLE_API_KEY and SEARCH_ENGINE_ID in your .env file.")
         return
 
     try:
-        with open(COMPANIES_FILE, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            companies = list(reader)
+        companies = [company for company in load_companies(args.companies) if company.get("name")]
     except FileNotFoundError:
-        logger.error(f"The file {COMPANIES_FILE} was not found. Please create it.")
+        logger.error(f"The file {args.companies} was not found. Please create it.")
         return
 
-    for company_data in companies:
-        company_name = company_data.get("name")
-        company_url = company_data.get("domain")
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    completed = load_completed(args.output)
+    pending = [company for company in companies if company_key(company["name"]) not in completed]
+    logger.info(f"{len(completed)} companies already processed, {len(pending)} remaining")
 
-        if not company_name:
-            continue
-
-        logger.info(f"--- Processing {company_name} ---")
-        
-        # 1. Find the career page using Google Search API
-        career_page_url = find_career_page_google(company_name, GOOGLE_API_KEY, SEARCH_ENGINE_ID)
-        
-        # 2. If Google fails and a domain is provided, try crawling
-        if not career_page_url and company_url:
-            career_page_url = crawl_for_career_page(f"https://{company_url}")
-
-        # 3. If a career page is found, scrape it
-        if career_page_url:
-            logger.info(f"Scraping jobs from {career_page_url}")
-            jobs = scrape_jobs(career_page_url)
-            
-            if jobs:
-                logger.info(f"Found {len(jobs)} jobs at {company_name}")
-                for job in jobs:
-                    print(f"  - {job['title']} at {job.get('company', company_name)}")
-            else:
-                logger.warning(f"No jobs found at {career_page_url}")
-        else:
-            logger.error(f"Could not find a career page for {company_name}")
+    start_time = time.time()
+    processed = asyncio.run(run_pipeline(pending, args.output, DiscoveryCache()))
+    logger.info(f"Processed {processed} companies in {time.time() - start_time:.1f} seconds")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+import io
+import zipfile
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.batch_ingest import collect_resumes, is_zip, BatchTooLargeError
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+def test_archive_members_are_stored_once_per_content():
+    archive = make_zip({
+        "batch/alice.pdf": b"%PDF alice",
+        "batch/alice copy.pdf": b"%PDF alice",
+        "batch/bob.docx": b"PK docx bob",
+        "batch/notes.xlsx": b"not a resume",
+        "__MACOSX/batch/._alice.pdf": b"resource fork",
+        "batch/big.pdf": b"x" * 200,
+    })
+    single = io.BytesIO(b"%PDF carol")
+    with tempfile.TemporaryDirectory() as tmp:
+        assert is_zip(archive) and archive.tell() == 0
+        collected = collect_resumes([("resumes.zip", archive), ("carol.pdf", single)], Path(tmp), max_member_bytes=100)
+
+        assert [r["filename"] for r in collected["resumes"]] == ["alice.pdf", "bob.docx", "carol.pdf"]
+        assert collected["duplicates"] == [{"filename": "alice copy.pdf", "sha256": collected["resumes"][0]["sha256"]}]
+        assert {(s["filename"], s["reason"]) for s in collected["skipped"]} == {
+            ("notes.xlsx", "unsupported file type"), ("big.pdf", "file too large")
+        }
+        assert Path(collected["resumes"][2]["path"]).read_bytes() == b"%PDF carol"
+        assert len(list(Path(tmp).iterdir())) == 3
+
+def test_batch_size_limit():
+    archive = make_zip({f"{i}.pdf": f"%PDF {i}".encode() for i in range(3)})
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(BatchTooLargeError):
+            collect_resumes([("resumes.zip", archive)], Path(tmp), max_resumes=2)
+
+def test_broken_pool_is_replaced(monkeypatch):
+    from concurrent.futures.process import BrokenProcessPool
+    import app.batch_ingest as batch_ingest
+
+    class BrokenPool:
+        shut_down = False
+
+        def map(self, *args, **kwargs):
+            raise BrokenProcessPool("worker killed")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = (wait, cancel_futures)
+
+    broken = BrokenPool()
+    monkeypatch.setattr(batch_ingest, "_pool", broken)
+    with pytest.raises(BrokenProcessPool):
+        batch_ingest.parse_resumes(["a.pdf", "b.pdf"], workers=2)
+    assert broken.shut_down == (False, True)
+    assert batch_ingest._pool is None
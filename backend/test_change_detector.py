@@ -0,0 +1,48 @@
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.change_detector import ChangeDetector, listing_fingerprint
+
+BOARD = "https://www.linkedin.com/jobs/search?keywords=python&utm_source=share"
+
+def _job(n, description="Build things"):
+    return {"title": f"Engineer {n}", "company": "Acme", "location": "Remote",
+            "url": f"https://www.linkedin.com/jobs/view/{n}", "description": description}
+
+def test_listing_fingerprint():
+    key, content_hash = listing_fingerprint(_job(1))
+    assert key == "https://www.linkedin.com/jobs/view/1"
+    assert listing_fingerprint(_job(1, "Build other things"))[1] != content_hash
+    # Listings without their own URL fall back to title, company and location
+    board_only = dict(_job(2), url=BOARD)
+    assert listing_fingerprint(board_only, BOARD)[0].startswith("listing:")
+
+def test_rescrape_only_reports_churn(tmp_path):
+    detector = ChangeDetector(str(tmp_path / "listings.sqlite3"))
+    first = detector.apply(BOARD, [_job(1), _job(2), _job(3)])
+    assert len(first["new"]) == 3 and not first["removed"]
+
+    signature = "test-model"
+    embeddings = np.random.rand(3, 4).astype(np.float32)
+    detector.store_embeddings(BOARD, [_job(1), _job(2), _job(3)], embeddings, signature)
+
+    second = detector.apply(BOARD.replace("&utm_source=share", ""), [_job(1), _job(2, "New description"), _job(4)])
+    assert [job["title"] for job in second["unchanged"]] == ["Engineer 1"]
+    assert [job["title"] for job in second["changed"]] == ["Engineer 2"]
+    assert [job["title"] for job in second["new"]] == ["Engineer 4"]
+    assert [job["title"] for job in second["removed"]] == ["Engineer 3"]
+    assert [job["title"] for job in detector.active_jobs(BOARD)] == ["Engineer 1", "Engineer 2", "Engineer 4"]
+
+    # Only the unchanged listing keeps its embedding, and only for the same signature
+    reused = detector.get_embeddings(BOARD, [_job(1), _job(2, "New description"), _job(4)], signature)
+    assert np.allclose(reused[0], embeddings[0])
+    assert reused[1] is None and reused[2] is None
+    assert detector.get_embeddings(BOARD, [_job(1)], "other-model") == [None]
+
+    # A listing that comes back is active again
+    third = detector.apply(BOARD, [_job(1), _job(2, "New description"), _job(3), _job(4)])
+    assert [job["title"] for job in third["unchanged"]] == ["Engineer 1", "Engineer 2", "Engineer 3", "Engineer 4"]
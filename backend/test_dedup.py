@@ -0,0 +1,113 @@
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.dedup import DedupIndex, canonical_job_id
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design and build scalable Python services. "
+    "You will own our payments APIs, work with PostgreSQL and Redis, deploy on Kubernetes "
+    "and mentor junior engineers. Five years of experience with distributed systems required."
+)
+
+def test_canonical_job_id():
+    assert canonical_job_id("https://www.linkedin.com/jobs/view/backend-engineer-at-acme-3812345678?refId=x") == "linkedin:3812345678"
+    assert canonical_job_id("https://www.linkedin.com/jobs/search?keywords=python&currentJobId=42") == "linkedin:42"
+    assert canonical_job_id("https://www.indeed.com/viewjob?jk=abc123&from=serp") == "indeed:abc123"
+    assert canonical_job_id("https://acme.com/careers?gh_jid=4455") == "greenhouse:4455"
+    assert canonical_job_id("https://boards.greenhouse.io/acme/jobs/4455") == "greenhouse:4455"
+    assert canonical_job_id("https://acme.com/careers") is None
+
+def test_cross_source_listings_collapse(tmp_path):
+    path = str(tmp_path / "dedup_index.sqlite3")
+    index = DedupIndex(path, legacy_file=None)
+    jobs = [
+        {"title": "Backend Engineer", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/111",
+         "description": DESCRIPTION},
+        {"title": "Backend Engineer", "company": "Acme Inc", "url": "https://www.indeed.com/viewjob?jk=abc",
+         "description": DESCRIPTION + " Apply today!"},
+        {"title": "Frontend Engineer", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/222",
+         "description": "Build React interfaces for our customer dashboard with TypeScript and GraphQL."},
+        # Same LinkedIn posting reached through a tracking URL
+        {"title": "Backend Engineer", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/111?trk=feed",
+         "description": "short"},
+    ]
+    unique = index.deduplicate(jobs)
+    assert [job["title"] for job in unique] == ["Backend Engineer", "Frontend Engineer"]
+    backend = unique[0]
+    assert backend["description"].endswith("Apply today!")
+    assert {source["site"] for source in backend["sources"]} == {"www.linkedin.com", "www.indeed.com"}
+    assert len(backend["sources"]) == 3
+
+    # The persisted index gives the career page copy the same dedup_id later on
+    reloaded = DedupIndex(path, legacy_file=None)
+    career_page = {"title": "Backend Engineer", "company": "Acme", "url": "https://acme.com/careers/backend",
+                   "description": DESCRIPTION}
+    assert reloaded.assign(career_page) == backend["dedup_id"]
+    # A more senior opening with the same description is another posting
+    senior = dict(career_page, title="Senior Backend Engineer", url="https://acme.com/careers/senior-backend")
+    assert reloaded.assign(senior) != backend["dedup_id"]
+
+def test_board_url_fallback_does_not_merge(tmp_path):
+    board = "https://example.com/jobs"
+    index = DedupIndex(str(tmp_path / "dedup_index.sqlite3"), legacy_file=None)
+    jobs = [
+        {"title": "Data Analyst", "company": "Acme", "url": board, "description": "SQL dashboards and reporting"},
+        {"title": "Site Reliability Engineer", "company": "Acme", "url": board, "description": "On-call and Terraform"},
+    ]
+    assert len(index.deduplicate(jobs, source_url=board)) == 2
+
+def test_different_ids_of_one_board_never_merge(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup_index.sqlite3"), legacy_file=None)
+    jobs = [
+        {"title": "Backend Engineer", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/111",
+         "description": DESCRIPTION},
+        # The same role opened again, e.g. for another location
+        {"title": "Backend Engineer", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/333",
+         "description": DESCRIPTION},
+    ]
+    assert len(index.deduplicate(jobs)) == 2
+
+def test_workers_share_dedup_ids(tmp_path):
+    path = str(tmp_path / "dedup_index.sqlite3")
+    worker_a = DedupIndex(path, legacy_file=None)
+    worker_b = DedupIndex(path, legacy_file=None)
+    linkedin = {"title": "Backend Engineer", "company": "Acme", "url": "https://www.linkedin.com/jobs/view/111",
+                "description": DESCRIPTION}
+    indeed = dict(linkedin, url="https://www.indeed.com/viewjob?jk=abc")
+    first = worker_a.deduplicate([linkedin])[0]["dedup_id"]
+    # The other worker sees the posting and its additions are not lost on save
+    assert worker_b.deduplicate([indeed])[0]["dedup_id"] == first
+    reloaded = DedupIndex(path, legacy_file=None)
+    assert set(reloaded.records[first]["canonical_ids"]) == {"linkedin:111", "indeed:abc"}
+
+def test_same_role_in_another_city_is_kept(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup_index.sqlite3"), legacy_file=None)
+    austin = {"title": "Backend Engineer", "company": "Acme", "location": "Austin, TX",
+              "url": "https://acme.com/careers/backend-austin", "description": DESCRIPTION}
+    denver = dict(austin, location="Denver, CO", url="https://acme.com/careers/backend-denver")
+    anywhere = dict(austin, location=None, url="https://www.indeed.com/viewjob?jk=abc")
+    unique = index.deduplicate([austin, denver, anywhere])
+    assert [job["location"] for job in unique] == ["Austin, TX", "Denver, CO"]
+
+def test_old_and_excess_postings_are_evicted(tmp_path):
+    import sqlite3
+    import time
+
+    path = str(tmp_path / "dedup_index.sqlite3")
+    index = DedupIndex(path, legacy_file=None, ttl_days=1, max_entries=2)
+    jobs = [{"title": f"{role} Engineer", "company": "Acme", "url": f"https://acme.com/careers/{role}",
+             "description": f"{role} work"} for role in ("Backend", "Frontend", "Data")]
+    ids = [job["dedup_id"] for job in index.deduplicate(jobs)]
+    # The least recently seen posting is evicted from memory and from disk
+    assert set(index.records) == set(ids[1:])
+    conn = sqlite3.connect(path)
+    assert {row[0] for row in conn.execute("SELECT dedup_id FROM postings")} == set(ids[1:])
+
+    # Postings not seen for the TTL are gone for every worker
+    with conn:
+        conn.execute("UPDATE postings SET last_seen = ? WHERE dedup_id = ?", (time.time() - 2 * 86400, ids[1]))
+    conn.close()
+    assert set(DedupIndex(path, legacy_file=None, ttl_days=1).records) == {ids[2]}
@@ -0,0 +1,197 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+import httpx
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app import http_cache
+from app.discovery import crawl_career_site, score_career_link
+from app.discovery_cache import DiscoveryCache
+from app.http_cache import HttpCache
+import run_discovery
+from run_discovery import DiscoveryError, load_completed, process_company
+
+def test_discovery_cache_persists_and_expires(tmp_path):
+    storage_file = str(tmp_path / "discovery_cache.json")
+    cache = DiscoveryCache(storage_file, legacy_file=None)
+    cache.set("Acme Corp", "https://acme.com/careers", "google", 0.9)
+    cache.set_negative("Nowhere Ltd")
+    cache.save()
+
+    reloaded = DiscoveryCache(storage_file, ttl=3600, negative_ttl=60, legacy_file=None)
+    entry = reloaded.get("  acme corp ")
+    assert entry["url"] == "https://acme.com/careers"
+    assert entry["source"] == "google" and entry["confidence"] == 0.9
+    assert reloaded.get("Nowhere Ltd")["url"] is None
+    assert reloaded.get("Other Inc") is None
+
+    # Negative entries expire sooner than positive ones
+    for key in reloaded.entries:
+        reloaded.entries[key]["timestamp"] = time.time() - 120
+    assert reloaded.get("Acme Corp") is not None
+    assert reloaded.get("Nowhere Ltd") is None
+
+    reloaded.entries["acme corp"]["timestamp"] = time.time() - reloaded.ttl - 1
+    assert reloaded.get("Acme Corp") is None
+
+def test_discovery_cache_reads_the_legacy_file_and_saves_atomically(tmp_path):
+    legacy_file = str(tmp_path / "old_cache.json")
+    legacy = DiscoveryCache(legacy_file, legacy_file=None)
+    legacy.set("Acme Corp", "https://acme.com/careers", "google")
+    legacy.save()
+
+    storage_file = str(tmp_path / "data" / "discovery_cache.json")
+    cache = DiscoveryCache(storage_file, legacy_file=legacy_file)
+    assert cache.get("Acme Corp")["url"] == "https://acme.com/careers"
+    cache.save()
+    assert os.listdir(tmp_path / "data") == ["discovery_cache.json"]
+
+def test_invalidate_stale_career_page(tmp_path):
+    cache = DiscoveryCache(str(tmp_path / "discovery_cache.json"), legacy_file=None)
+    cache.set("Acme Corp", "https://acme.com/old-careers", "crawl", 0.8)
+    cache.invalidate("ACME CORP")
+    assert cache.get("Acme Corp") is None
+
+def test_load_completed_skips_truncated_lines(tmp_path):
+    output_file = tmp_path / "results.jsonl"
+    output_file.write_text(json.dumps({"company": "Acme Corp", "jobs": []}) + "\n" + '{"company": "Cut')
+    assert load_completed(str(output_file)) == {"acme corp"}
+    assert load_completed(str(tmp_path / "missing.jsonl")) == set()
+
+def _stages():
+    return {name: asyncio.Semaphore(1) for name in ("search", "crawl", "scrape")}
+
+def test_failed_search_is_not_cached_as_negative(tmp_path, monkeypatch):
+    async def failing_search(*args):
+        raise httpx.ConnectError("network down")
+
+    async def no_result(*args):
+        return None
+
+    cache = DiscoveryCache(str(tmp_path / "discovery_cache.json"), legacy_file=None)
+    monkeypatch.setattr(run_discovery, "find_career_page_google_async", failing_search)
+    with pytest.raises(DiscoveryError):
+        asyncio.run(process_company({"name": "Acme Corp"}, cache, _stages()))
+    assert cache.get("Acme Corp") is None
+
+    # A search that succeeds without a result is remembered as "no career page"
+    monkeypatch.setattr(run_discovery, "find_career_page_google_async", no_result)
+    result = asyncio.run(process_company({"name": "Acme Corp"}, cache, _stages()))
+    assert result["career_url"] is None
+    assert cache.get("Acme Corp")["url"] is None
+
+_SITE = {
+    "/": '<a href="/products">Products</a><footer><a href="/about">About us</a></footer>',
+    "/products": '<a href="/">Home</a>',
+    "/about": '<p>Our story</p><a href="/company/join">Join our team</a>',
+    "/company/join": '<h1>Open positions</h1><a href="https://boards.greenhouse.io/acme">All jobs</a>',
+}
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = []
+
+    def do_GET(self):
+        _SiteHandler.hits.append(self.path)
+        body = _SITE.get(self.path)
+        self.send_response(200 if body is not None else 404)
+        data = (body or "not found").encode()
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def test_score_career_link():
+    assert score_career_link("https://jobs.lever.co/acme") == 0.95
+    assert score_career_link("https://careers.acme.com/", "", "acme.com") == 0.9
+    assert score_career_link("https://acme.com/careers", "Careers", "acme.com") == 0.9
+    assert score_career_link("https://acme.com/company/join", "Join our team", "acme.com") == 0.6
+    assert score_career_link("https://acme.com/about", "About", "acme.com") == 0.2
+    assert score_career_link("https://twitter.com/acme/jobs", "Jobs", "acme.com") == 0.0
+    assert score_career_link("mailto:jobs@acme.com", "Jobs") == 0.0
+
+def test_crawler_follows_footer_links_to_ats(tmp_path):
+    http_cache._cache = HttpCache(str(tmp_path / "cache.sqlite3"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _SiteHandler.hits.clear()
+        url, score = asyncio.run(crawl_career_site(f"http://127.0.0.1:{server.server_port}/", max_pages=4, concurrency=1))
+        assert url == "https://boards.greenhouse.io/acme"
+        assert score == 0.95
+        # The best-first order skips /products and the ATS board is never fetched
+        assert "/products" not in _SiteHandler.hits
+        assert len(_SiteHandler.hits) == 4
+    finally:
+        server.shutdown()
+        http_cache._cache = None
+
+def test_crawler_raises_when_homepage_is_unreachable(tmp_path):
+    http_cache._cache = HttpCache(str(tmp_path / "cache.sqlite3"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    port = server.server_port
+    server.server_close()
+    try:
+        with pytest.raises(httpx.HTTPError):
+            asyncio.run(crawl_career_site(f"http://127.0.0.1:{port}/", max_pages=2))
+    finally:
+        http_cache._cache = None
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        _SearchHandler.requests.append((self.path, self.headers.get("X-Goog-Api-Key")))
+        body = json.dumps({"items": [{"link": "https://acme.com/careers"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_google_search_keeps_api_key_out_of_cache(tmp_path, monkeypatch):
+    from app import discovery
+
+    http_cache._cache = HttpCache(str(tmp_path / "cache.sqlite3"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SearchHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(discovery, "GOOGLE_SEARCH_URL", f"http://127.0.0.1:{server.server_port}/customsearch/v1")
+    try:
+        _SearchHandler.requests.clear()
+        assert discovery.find_career_page_google("Acme", "secret-key", "engine") == "https://acme.com/careers"
+        path, header = _SearchHandler.requests[0]
+        assert header == "secret-key" and "secret-key" not in path
+        with http_cache._cache._connect() as conn:
+            rows = conn.execute("SELECT key, url FROM responses").fetchall()
+        assert rows and not any("secret-key" in key or "secret-key" in url for key, url in rows)
+    finally:
+        server.shutdown()
+        http_cache._cache = None
+
+def test_sync_crawl_works_inside_running_loop(tmp_path):
+    from app.discovery import crawl_for_career_page
+
+    http_cache._cache = HttpCache(str(tmp_path / "cache.sqlite3"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        async def called_from_async_code():
+            return crawl_for_career_page(f"http://127.0.0.1:{server.server_port}/")
+
+        assert asyncio.run(called_from_async_code()) == "https://boards.greenhouse.io/acme"
+    finally:
+        server.shutdown()
+        http_cache._cache = None
@@ -0,0 +1,102 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.embedding_service import EmbeddingService
+
+def make_encoder(calls):
+    barrier = threading.Event()
+
+    def encode(texts):
+        # Hold the first batch until every caller is queued behind it
+        barrier.wait(timeout=5)
+        calls.append(len(texts))
+        return np.array([[float(len(text)), float(text.count("a"))] for text in texts])
+
+    return encode, barrier
+
+def test_concurrent_requests_are_coalesced():
+    calls = []
+    encode, barrier = make_encoder(calls)
+    service = EmbeddingService(encode, max_batch_size=64, max_wait_ms=50)
+    requests = [[f"{'a' * i} text {j}" for j in range(i + 1)] for i in range(8)]
+    futures = [service.submit(texts) for texts in requests]
+    barrier.set()
+
+    for texts, future in zip(requests, futures):
+        result = future.result(timeout=5)
+        assert result.shape == (len(texts), 2)
+        assert result[:, 0].tolist() == [float(len(text)) for text in texts]
+    assert sum(calls) == sum(len(texts) for texts in requests)
+    assert len(calls) < len(requests)
+    assert service.stats()["requests"] == len(requests)
+
+def test_batch_size_limit_and_empty_requests():
+    calls = []
+    encode, barrier = make_encoder(calls)
+    barrier.set()
+    service = EmbeddingService(encode, max_batch_size=2, max_wait_ms=50)
+    futures = [service.submit(["x", "y"]) for _ in range(3)]
+    assert [len(future.result(timeout=5)) for future in futures] == [2, 2, 2]
+    assert max(calls) == 2
+    assert len(service.encode([])) == 0
+
+def test_errors_reach_every_caller_and_service_recovers():
+    def encode(texts):
+        if "boom" in texts:
+            raise RuntimeError("model failed")
+        return np.ones((len(texts), 3))
+
+    service = EmbeddingService(encode, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="model failed"):
+        service.encode(["boom"])
+    assert service.encode(["fine", "too"]).shape == (2, 3)
+
+def test_concurrent_uploads_share_encoder_calls(tmp_path, monkeypatch):
+    import asyncio
+    import types
+    import app.main as main
+    from app.feature_store import JobFeatureStore
+    from app.resume_store import ResumeStore
+    from app.task_storage import TaskStorage
+
+    calls = []
+    service = EmbeddingService(
+        lambda texts: calls.append(list(texts)) or np.ones((len(texts), 4)), max_wait_ms=500
+    )
+    # Both uploads finish scraping together, then embed from their own threads
+    scraped = threading.Barrier(2)
+
+    def scrape(url):
+        scraped.wait(timeout=5)
+        return [{"title": "Python Developer", "description": f"Django at {url}", "url": f"{url}/1"}]
+
+    tasks = TaskStorage(str(tmp_path / "tasks.sqlite3"), legacy_file=None)
+    monkeypatch.setattr(main, "tasks", tasks)
+    monkeypatch.setattr(main, "task_storage", tasks)
+    monkeypatch.setattr(main, "RESULTS_DIR", tmp_path)
+    monkeypatch.setattr(main, "resume_store", ResumeStore(path=str(tmp_path / "resumes.sqlite3"), legacy_file=None))
+    monkeypatch.setattr(main, "feature_store", JobFeatureStore(path=str(tmp_path / "features.sqlite3")))
+    monkeypatch.setattr(main, "extract_text", lambda path: f"Python developer {path}")
+    monkeypatch.setattr(main, "extract_skills", lambda text: ["python"])
+    monkeypatch.setattr(main, "scrape_coordinator", types.SimpleNamespace(scrape=scrape))
+    monkeypatch.setattr(main, "dedup_index", types.SimpleNamespace(
+        deduplicate=lambda jobs, url: [dict(job, dedup_id=job["url"]) for job in jobs]))
+    monkeypatch.setattr(main, "record_board_scrape", lambda *args: None)
+    monkeypatch.setattr(main, "compute_document_embeddings", service.encode)
+    monkeypatch.setattr(main, "embed_board_listings", lambda url, jobs, texts: service.encode(texts))
+    monkeypatch.setattr(main, "EMBEDDING_POOLING", "mean")
+
+    for task_id in ("t1", "t2"):
+        tasks.add(task_id, {"status": "processing", "file_path": f"{task_id}.pdf",
+                            "job_url": f"https://example.com/{task_id}", "results": None})
+
+    async def run_both():
+        await asyncio.gather(main.process_resume_and_jobs("t1"), main.process_resume_and_jobs("t2"))
+
+    asyncio.run(run_both())
+    assert [tasks[task_id]["status"] for task_id in ("t1", "t2")] == ["completed", "completed"]
+    # One call for both resumes and one for both boards, instead of one per upload and step
+    assert [len(texts) for texts in calls] == [2, 2]
+    assert service.stats()["requests"] == 4
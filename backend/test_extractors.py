@@ -0,0 +1,112 @@
+import os
+import sys
+import zipfile
+import tempfile
+
+import docx
+
+from app import extractors
+from app.extractors import extract_text_from_file, sniff_mime_type
+from test_pdf_extraction import write_pdf
+
+def write(path, data):
+    with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    return path
+
+def test_sniffing_uses_content_before_extension():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "resume.docx")
+        write_pdf(pdf, ["Misnamed PDF"])
+        assert sniff_mime_type(pdf) == extractors.PDF
+        assert "Misnamed PDF" in extract_text_from_file(pdf)
+
+        html = write(os.path.join(tmp, "resume.txt"), "<!DOCTYPE html><html><body><p>Hi</p></body></html>")
+        assert sniff_mime_type(html) == extractors.HTML
+        assert sniff_mime_type(write(os.path.join(tmp, "resume.md"), "# Jane")) == extractors.MARKDOWN
+        assert sniff_mime_type(write(os.path.join(tmp, "resume"), "Jane Doe")) == extractors.TEXT
+        assert sniff_mime_type(write(os.path.join(tmp, "resume.bin"), b"\x00\x01\x02")) == extractors.BINARY
+
+def test_text_formats():
+    with tempfile.TemporaryDirectory() as tmp:
+        html = write(os.path.join(tmp, "r.html"),
+                     "<html><head><style>p {}</style><script>var x;</script></head>"
+                     "<body><h1>Jane Doe</h1><p>Senior <b>Python</b> engineer</p></body></html>")
+        assert extract_text_from_file(html) == "Jane Doe\nSenior\nPython\nengineer"
+
+        md = write(os.path.join(tmp, "r.md"), "# Jane Doe\n\n**Skills:** [Python](https://python.org), `SQL`, *Docker*\n")
+        assert extract_text_from_file(md) == "Jane Doe\n\nSkills: Python, SQL, Docker\n"
+
+        txt = write(os.path.join(tmp, "r.txt"), "Jane Doe\nPython".encode("utf-16"))
+        assert extract_text_from_file(txt) == "Jane Doe\nPython"
+
+def test_rtf():
+    rtf = (r"{\rtf1\ansi\deff0{\fonttbl{\f0 Times New Roman;}}{\*\generator Word;}"
+           r"\f0\fs24 Jane Doe\par Caf\'e9 owner\par \uc1\u8364? budget\par}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write(os.path.join(tmp, "r.rtf"), rtf)
+        assert sniff_mime_type(path) == extractors.RTF
+        assert extractors._strip_rtf(rtf) == "Jane Doe\nCafé owner\n€ budget\n"
+        assert "Café owner" in extract_text_from_file(path)
+
+def test_odt():
+    content = (
+        '<?xml version="1.0"?><office:document-content'
+        ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+        ' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><office:body><office:text>'
+        '<text:h>Jane Doe</text:h><text:p>Python<text:tab/>SQL<text:s text:c="2"/>Go</text:p>'
+        '<text:p>Line<text:line-break/>break <text:span>styled</text:span></text:p>'
+        '</office:text></office:body></office:document-content>'
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume")
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("mimetype", extractors.ODT)
+            archive.writestr("content.xml", content)
+        assert sniff_mime_type(path) == extractors.ODT
+        assert extract_text_from_file(path) == "Jane Doe\nPython\tSQL  Go\nLine\nbreak styled"
+
+def test_docx_tables_and_headers():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe - jane@example.com"
+    document.add_paragraph("Experience")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text, table.cell(0, 1).text = "Skill", "Years"
+    table.cell(1, 0).text, table.cell(1, 1).text = "Python", "5"
+    document.add_paragraph("Education")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.docx")
+        document.save(path)
+        assert sniff_mime_type(path) == extractors.DOCX
+        assert extract_text_from_file(path) == "Jane Doe - jane@example.com\nExperience\nSkill\tYears\nPython\t5\nEducation"
+
+def test_docx_first_and_even_page_headers_and_footers():
+    document = docx.Document()
+    section = document.sections[0]
+    section.different_first_page_header_footer = True
+    document.settings.odd_and_even_pages_header_footer = True
+    section.first_page_header.paragraphs[0].text = "Jane Doe"
+    section.even_page_header.paragraphs[0].text = "Resume of Jane Doe"
+    section.first_page_footer.paragraphs[0].text = "jane@example.com"
+    section.even_page_footer.paragraphs[0].text = "+1 555 0100"
+    document.add_paragraph("Experience")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.docx")
+        document.save(path)
+        assert extract_text_from_file(path) == "Jane Doe\nResume of Jane Doe\nExperience\njane@example.com\n+1 555 0100"
+
+def test_rtf_markup_is_read_capped(monkeypatch):
+    monkeypatch.setattr(extractors, "EXTRACT_MAX_RTF_BYTES", 100)
+    rtf = r"{\rtf1\ansi " + "word " * 1000 + "}"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write(os.path.join(tmp, "r.rtf"), rtf)
+        assert 0 < len(extract_text_from_file(path)) < 100
+
+def test_unsupported_format():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write(os.path.join(tmp, "resume.doc"), b"\xd0\xcf\x11\xe0legacy")
+        try:
+            extract_text_from_file(path)
+            assert False, "legacy .doc files are not supported"
+        except ValueError as e:
+            assert "application/msword" in str(e)
@@ -0,0 +1,40 @@
+import os
+import runpy
+import types
+
+import pytest
+
+from app import http_client
+
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py")
+
+def test_config_preloads_app():
+    config = runpy.run_path(CONFIG)
+    assert config["preload_app"] is True
+    assert config["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert config["TORCH_THREADS_PER_WORKER"] >= 1
+
+def test_one_worker_runs_the_scheduler():
+    pre_fork = runpy.run_path(CONFIG)["pre_fork"]
+    server = types.SimpleNamespace(WORKERS={})
+    for pid in range(1, 4):
+        worker = types.SimpleNamespace(pid=pid)
+        pre_fork(server, worker)
+        server.WORKERS[pid] = worker
+    assert [getattr(w, "runs_scheduler", False) for w in server.WORKERS.values()] == [True, False, False]
+
+    # When the scheduler worker exits, the next forked worker takes over
+    del server.WORKERS[1]
+    replacement = types.SimpleNamespace(pid=4)
+    pre_fork(server, replacement)
+    assert replacement.runs_scheduler
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_http_client_loop_is_not_inherited_by_forked_workers():
+    http_client._get_loop()
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if http_client._loop is None and not http_client._clients else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert http_client._loop is not None
@@ -0,0 +1,88 @@
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app import http_cache, http_client
+from app.http_cache import HttpCache
+from app.utils import normalize_url
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = []
+
+    def do_GET(self):
+        _Handler.hits.append(self.path)
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = f"page {self.path}".encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.com:443/jobs/?utm_source=x&b=2&a=1#top") == "https://example.com/jobs?a=1&b=2"
+    assert normalize_url("http://example.com/jobs?gclid=1") == "http://example.com/jobs"
+    # Board-specific tracking parameters are only dropped on their board
+    assert normalize_url("https://www.indeed.com/jobs?q=python&vjk=abc&from=searchOnHP") == "https://www.indeed.com/jobs?q=python"
+    assert normalize_url("https://www.linkedin.com/jobs/view/1?trk=public&refId=x") == "https://www.linkedin.com/jobs/view/1"
+    assert normalize_url("https://example.com/flights?from=NYC&to=SFO") == "https://example.com/flights?from=NYC&to=SFO"
+
+def test_cache_freshness_and_eviction(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache.sqlite3"), max_bytes=10**6)
+    cache.put("https://example.com/jobs?utm_source=x", "hello", headers={"ETag": '"abc"'})
+    entry = cache.get("https://example.com/jobs")
+    assert entry["body"] == "hello" and entry["etag"] == '"abc"' and entry["fresh"]
+    assert cache.get("https://example.com/jobs", namespace="rendered") is None
+
+    # Incompressible bodies beyond the size cap evict the least recently used entries
+    cache.max_bytes = 3000
+    cache.put("https://example.com/a", os.urandom(1500).hex())
+    cache.put("https://example.com/b", os.urandom(1500).hex())
+    assert cache.get("https://example.com/a") is None
+    assert cache.get("https://example.com/b") is not None
+
+def test_client_serves_and_revalidates_from_cache(tmp_path):
+    http_cache._cache = HttpCache(str(tmp_path / "cache.sqlite3"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/jobs"
+    try:
+        _Handler.hits.clear()
+        assert http_client.get(url, cache=True).text == "page /jobs"
+        assert http_client.get(url, cache=True).text == "page /jobs"
+        assert len(_Handler.hits) == 1
+
+        # A stale entry is revalidated with a conditional GET and served on 304
+        with http_cache._cache._connect() as conn:
+            conn.execute("UPDATE responses SET stored_at = 0")
+        response = http_client.get(url, cache=True)
+        assert response.status_code == 200 and response.text == "page /jobs"
+        assert len(_Handler.hits) == 2
+        assert http_cache._cache.get(url)["fresh"]
+
+        assert http_client.get(url, cache=True, bypass_cache=True).text == "page /jobs"
+        assert len(_Handler.hits) == 3
+    finally:
+        server.shutdown()
+        http_cache._cache = None
+
+def test_cache_errors_do_not_raise(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("https://example.com/jobs", "hello")
+    # A database that can no longer be opened degrades to cache misses instead of failing the fetch
+    cache.path = str(tmp_path / "missing" / "cache.sqlite3")
+    assert cache.get("https://example.com/jobs") is None
+    cache.refresh("https://example.com/jobs")
+    cache.delete("https://example.com/jobs")
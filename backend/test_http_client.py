@@ -0,0 +1,101 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app import http_client
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"not found" if self.path == "/missing" else f"hello {self.path}".encode()
+        self.send_response(404 if self.path == "/missing" else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def test_sync_and_async_requests_share_client():
+    server, base_url = _start_server()
+    try:
+        assert http_client.get(f"{base_url}/a").text == "hello /a"
+        # Client errors are returned as-is, without retries
+        assert http_client.get(f"{base_url}/missing").status_code == 404
+
+        async def fetch_many():
+            return await asyncio.gather(*(http_client.fetch(f"{base_url}/{i}") for i in range(5)))
+
+        responses = asyncio.run(fetch_many())
+        assert [r.text for r in responses] == [f"hello /{i}" for i in range(5)]
+        assert len(http_client._clients) == 1
+    finally:
+        server.shutdown()
+
+def test_sync_request_from_the_client_loop_raises_instead_of_deadlocking():
+    async def sync_call_on_loop():
+        with pytest.raises(RuntimeError, match="await fetch"):
+            http_client.request("GET", "http://127.0.0.1:1/")
+        return True
+
+    assert http_client.run(sync_call_on_loop())
+
+def test_blocked_rate_limiter_does_not_stall_other_requests(monkeypatch):
+    server, base_url = _start_server()
+
+    class SlowLimiter:
+        def reserve(self, url):
+            # A reservation waiting on a locked database
+            time.sleep(1.0)
+            return 0.0
+
+        def record(self, url, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(http_client, "is_limited", lambda url: url.endswith("/slow"))
+    monkeypatch.setattr(http_client, "get_rate_limiter", SlowLimiter)
+    try:
+        async def fetch_both():
+            finished = {}
+
+            async def timed(path):
+                await http_client.fetch(f"{base_url}/{path}", retry=False)
+                finished[path] = time.monotonic()
+
+            await asyncio.gather(timed("slow"), timed("fast"))
+            return finished
+
+        finished = asyncio.run(fetch_both())
+        assert finished["fast"] < finished["slow"] - 0.5
+    finally:
+        server.shutdown()
+
+def test_app_shutdown_closes_http_client(monkeypatch):
+    from fastapi.testclient import TestClient
+    import app.main
+
+    monkeypatch.setattr(app.main, "MODEL_WARMUP", False)
+    monkeypatch.setattr(app.main, "SAVED_SEARCH_POLL_SECONDS", 0)
+    server, base_url = _start_server()
+    try:
+        http_client.get(f"{base_url}/a")
+        assert http_client._clients
+        with TestClient(app.main.app):
+            pass
+        assert not http_client._clients
+    finally:
+        server.shutdown()
@@ -204,5 +204,130 @@ def test_new_grad_friendly_scoring():
     # The new grad job should be ranked higher
     assert top[0][0] == 1 or top[0][0] == 0
 
+def test_precomputed_job_features(tmp_path):
+    from app.matcher import rank_jobs, compute_embeddings
+    from app.feature_store import JobFeatureStore
+    job_texts = [job[0] for job in sample_jobs]
+    job_titles = [job[1] for job in sample_jobs]
+    resume_emb = compute_embeddings([sample_resume])[0]
+    job_embs = compute_embeddings(job_texts)
+
+    store = JobFeatureStore(path=str(tmp_path / "job_features.sqlite3"))
+    job_features = store.get_or_compute_many(job_texts, job_titles)
+    # A fresh store reads the persisted features instead of extracting them again
+    reloaded = JobFeatureStore(path=str(tmp_path / "job_features.sqlite3"), max_entries=2)
+    assert reloaded.get(job_texts[0], job_titles[0]) == job_features[0]
+    # Beyond the cap the least recently used jobs are evicted
+    reloaded.get_or_compute_many(["A brand new Rust role"], ["Rust Engineer"])
+    assert reloaded.get(job_texts[0], job_titles[0]) == job_features[0]
+    assert reloaded.get(job_texts[1], job_titles[1]) is None
+
+    expected = rank_jobs(resume_emb, job_embs, sample_resume, job_texts, job_titles, limit=4)
+    cached = rank_jobs(resume_emb, job_embs, sample_resume, job_texts, job_titles, limit=4, job_features=job_features)
+    assert expected == cached
+
+    # A feature lookup is only asked for the shortlisted jobs
+    looked_up = []
+    def lookup(texts, titles):
+        looked_up.extend(texts)
+        return store.get_or_compute_many(texts, titles)
+    lazy = rank_jobs(resume_emb, job_embs, sample_resume, job_texts, job_titles, limit=2,
+                     shortlist_k=2, feature_lookup=lookup)
+    assert len(looked_up) == 2
+    assert [idx for idx, _ in lazy] == [idx for idx, _ in rank_jobs(
+        resume_emb, job_embs, sample_resume, job_texts, job_titles, limit=2, shortlist_k=2)]
+
+def test_score_matrix_matches_pairwise_scoring():
+    import numpy as np
+    from app.matcher import (
+        extract_structured_resume, extract_job_requirements,
+        calculate_advanced_match_score, advanced_match_score_matrix
+    )
+    resumes = [sample_resume, "Senior architect with 10 years of Java, Go and Kubernetes experience"]
+    resume_datas = [extract_structured_resume(text) for text in resumes]
+    job_datas = [extract_job_requirements(text, title) for text, title in sample_jobs]
+    matrix = advanced_match_score_matrix(resume_datas, job_datas)
+    expected = np.array([[calculate_advanced_match_score(r, j)["overall_score"] for j in job_datas] for r in resume_datas])
+    assert np.allclose(matrix, expected)
+
+def test_match_resumes_to_jobs_batch():
+    matcher = JobMatcher(use_cross_encoder=False)
+    resumes = [sample_resume, "Senior architect with 10 years of Java, Go and Kubernetes experience"]
+    results = matcher.match_resumes_to_jobs(resumes, [job[0] for job in sample_jobs], [job[1] for job in sample_jobs], limit=2)
+    assert len(results) == 2
+    for matches in results:
+        assert len(matches) == 2
+        assert matches[0]["final_score"] >= matches[1]["final_score"]
+
+def test_shortlist_cascade():
+    from app.matcher import rank_jobs, compute_embeddings, cascade_recall
+    job_texts = [job[0] for job in sample_jobs]
+    job_titles = [job[1] for job in sample_jobs]
+    resume_emb = compute_embeddings([sample_resume])[0]
+    job_embs = compute_embeddings(job_texts)
+
+    shortlisted = rank_jobs(resume_emb, job_embs, sample_resume, job_texts, job_titles, limit=4, shortlist_k=2)
+    assert len(shortlisted) == 2
+    assert cascade_recall(resume_emb, job_embs, sample_resume, job_texts, job_titles, limit=2, shortlist_k=4) == 1.0
+
+def test_chunked_document_embeddings():
+    import numpy as np
+    from app.matcher import split_into_chunks, compute_chunk_embeddings, compute_document_embeddings, max_sim_scores
+    long_text = " ".join(f"word{i}" for i in range(400))
+    chunks = split_into_chunks(long_text, chunk_words=160, overlap=32)
+    assert len(chunks) == 3
+    assert chunks[0].split()[-32:] == chunks[1].split()[:32]
+    assert chunks[-1].split()[-1] == "word399"
+
+    first = compute_chunk_embeddings([long_text, sample_resume])
+    # Chunk embeddings are cached per document
+    assert compute_chunk_embeddings([long_text])[0] is first[0]
+    assert compute_document_embeddings([long_text, sample_resume], pooling="mean").shape[0] == 2
+
+    rng = np.random.default_rng(0)
+    query = rng.normal(size=(2, 8))
+    docs = [rng.normal(size=(3, 8)), rng.normal(size=(1, 8))]
+    normalize = lambda m: m / np.linalg.norm(m, axis=1, keepdims=True)
+    expected = [np.max(normalize(query) @ normalize(doc).T) for doc in docs]
+    assert np.allclose(max_sim_scores(query, docs), expected)
+
+class _WordTokenizer:
+    """Fast-tokenizer stand-in: one token per word plus [CLS] and [SEP]"""
+    is_fast = True
+
+    def __call__(self, texts, truncation, max_length, return_offsets_mapping):
+        import re
+        encoded = {"input_ids": [], "offset_mapping": []}
+        for text in texts:
+            words = [(m.start(), m.end()) for m in re.finditer(r"\S+", text)][:max_length - 2]
+            encoded["input_ids"].append([0] * (len(words) + 2))
+            encoded["offset_mapping"].append([(0, 0)] + words + [(0, 0)])
+        return encoded
+
+class _WordModel:
+    max_seq_length = 6
+    tokenizer = _WordTokenizer()
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        import numpy as np
+        self.batches.append(list(texts))
+        return np.array([[len(text.split())] for text in texts], dtype=float)
+
+def test_length_bucketing_truncates_with_the_tokenizer(monkeypatch):
+    from app import matcher
+    model = _WordModel()
+    monkeypatch.setattr(matcher, "get_embedding_model", lambda: model)
+    monkeypatch.setattr(matcher, "EMBEDDING_TOKEN_BUDGET", 12)
+    texts = ["supercalifragilistic " * 10, "a b", "one  two\nthree four five six"]
+    embeddings = matcher._encode_length_bucketed(texts)
+    # Each text is cut after its last token within the window, whatever the word lengths
+    assert [row[0] for row in embeddings] == [4, 2, 4]
+    assert "one two three four" in [text for batch in model.batches for text in batch]
+    # Batches are sized from token counts: the two 6-token texts fit the budget together
+    assert sorted(len(batch) for batch in model.batches) == [1, 2]
+
 if __name__ == "__main__":
     main()
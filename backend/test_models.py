@@ -0,0 +1,60 @@
+import sys
+import subprocess
+
+from app import models
+
+def test_models_load_once_and_report_state():
+    calls = []
+
+    class Fallback:
+        is_fallback = True
+
+    def load_ok():
+        calls.append("ok")
+        return object()
+
+    def load_broken():
+        raise RuntimeError("no weights")
+
+    models.register_model("test_ok", load_ok)
+    models.register_model("test_fallback", Fallback)
+    models.register_model("test_broken", load_broken)
+
+    assert models.model_states()["test_ok"]["status"] == "not_loaded"
+    assert not models.ready(["test_ok"])
+    first = models.get_model("test_ok")
+    assert models.get_model("test_ok") is first and calls == ["ok"]
+    assert models.get_model("test_broken") is None
+
+    states = models.warmup(["test_fallback"])
+    assert states["test_ok"]["status"] == "ready"
+    assert states["test_fallback"]["status"] == "degraded"
+    assert states["test_broken"]["status"] == "failed" and states["test_broken"]["error"] == "no weights"
+    assert models.ready(["test_ok", "test_fallback"])
+    assert not models.ready(["test_ok", "test_broken"])
+
+def test_matcher_import_loads_no_model():
+    code = (
+        "import sys; import app.matcher, app.vector_store, app.resume_parser, app.scraper_no_retry; "
+        "print([m for m in ('torch', 'sentence_transformers', 'spacy', 'selenium', 'pymongo') if m in sys.modules])"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"
+
+def test_failed_backend_falls_back_to_torch_not_random(monkeypatch):
+    import types
+    import pytest
+    from app.matcher import load_embedding_model
+
+    class FakeSentenceTransformer:
+        def __init__(self, name, device=None, backend="torch", model_kwargs=None):
+            if backend == "onnx":
+                raise ImportError("optimum is not installed")
+            self.backend = backend
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers",
+                        types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer))
+    model = load_embedding_model("onnx")
+    assert isinstance(model, FakeSentenceTransformer) and model.backend == "torch"
+    with pytest.raises(ImportError):
+        load_embedding_model("onnx", fallback=False)
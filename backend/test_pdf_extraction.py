@@ -0,0 +1,106 @@
+import os
+import tempfile
+
+from app import pdf_extraction
+from app.pdf_extraction import extract_pdf_text, page_count
+
+def write_pdf(path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page"""
+    count = len(page_texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{4 + 2 * i} 0 R" for i in range(count)), count)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * i} 0 R"
+            " /Resources << /Font << /F1 3 0 R >> >> >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+def test_extracts_pages_in_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.pdf")
+        write_pdf(path, ["Python developer", "Kubernetes and AWS", "References"])
+        assert page_count(path) == 3
+        text = extract_pdf_text(path)
+        assert text.index("Python developer") < text.index("Kubernetes and AWS") < text.index("References")
+
+def test_page_and_char_caps():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "portfolio.pdf")
+        write_pdf(path, [f"Page number {i}" for i in range(10)])
+        text = extract_pdf_text(path, max_pages=2)
+        assert "Page number 1" in text and "Page number 2" not in text
+        text = extract_pdf_text(path, max_chars=20)
+        assert len(text) == 20 and "Page number 0" in text
+
+def test_parallel_extraction_matches_serial():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "portfolio.pdf")
+        write_pdf(path, [f"Project {i}" for i in range(24)])
+        serial = "\n".join(pdf_extraction.extract_page_range(path, 0, 24))
+        original = (pdf_extraction.PDF_PARALLEL_MIN_PAGES, pdf_extraction.PDF_EXTRACT_WORKERS)
+        pdf_extraction.PDF_PARALLEL_MIN_PAGES, pdf_extraction.PDF_EXTRACT_WORKERS = 16, 3
+        try:
+            assert extract_pdf_text(path) == serial
+            assert "Project 23" in serial
+        finally:
+            pdf_extraction.PDF_PARALLEL_MIN_PAGES, pdf_extraction.PDF_EXTRACT_WORKERS = original
+
+class _RecordingPool:
+    """In-process stand-in for the worker pool that records the submitted page ranges"""
+
+    def __init__(self, broken=False):
+        self.submitted = []
+        self.broken = broken
+        self.shut_down = False
+
+    def submit(self, fn, file_path, start, stop, max_chars):
+        from concurrent.futures import Future
+        from concurrent.futures.process import BrokenProcessPool
+        if self.broken:
+            raise BrokenProcessPool("worker died")
+        self.submitted.append((start, stop, max_chars))
+        future = Future()
+        future.set_result(fn(file_path, start, stop, max_chars))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+def test_char_cap_stops_submitting_ranges(monkeypatch):
+    pool = _RecordingPool()
+    monkeypatch.setattr(pdf_extraction, "_pool", pool)
+    monkeypatch.setattr(pdf_extraction, "PDF_EXTRACT_WORKERS", 2)
+    monkeypatch.setattr(pdf_extraction, "extract_page_range",
+                        lambda path, start, stop, max_chars: ["x" * 100] * (stop - start))
+    texts = pdf_extraction._extract_parallel("resume.pdf", 32, max_chars=250)
+    assert sum(len(text) for text in texts) >= 250
+    # Only the ranges in flight when the cap was reached were started, not all four
+    assert pool.submitted == [(0, 8, 250), (8, 16, 250)]
+
+def test_broken_pool_is_shut_down(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "portfolio.pdf")
+        write_pdf(path, [f"Project {i}" for i in range(20)])
+        pool = _RecordingPool(broken=True)
+        monkeypatch.setattr(pdf_extraction, "_pool", pool)
+        monkeypatch.setattr(pdf_extraction, "PDF_PARALLEL_MIN_PAGES", 16)
+        monkeypatch.setattr(pdf_extraction, "PDF_EXTRACT_WORKERS", 2)
+        assert "Project 19" in extract_pdf_text(path)
+        assert pool.shut_down and pdf_extraction._pool is None
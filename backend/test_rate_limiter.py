@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from app import rate_limiter
+from app.rate_limiter import DomainRateLimiter, domain_of, is_block_page, is_limited, parse_retry_after
+
+URL = "https://www.example.com/jobs?q=python"
+
+@pytest.fixture
+def limiter(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_INITIAL_RPS", 1.0)
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_BURST", 2.0)
+    return DomainRateLimiter(path=str(tmp_path / "rate_limits.sqlite3"))
+
+def test_bucket_allows_burst_then_spaces_requests(limiter, tmp_path):
+    assert limiter.reserve(URL) == 0
+    assert limiter.reserve("https://example.com/other") == 0
+    # The bucket is shared by every process using the same file
+    other_worker = DomainRateLimiter(path=str(tmp_path / "rate_limits.sqlite3"))
+    third = other_worker.reserve(URL)
+    fourth = limiter.reserve(URL)
+    assert 0.9 < third <= 1.0
+    assert 1.9 < fourth <= 2.0
+    assert limiter.reserve("https://jobs.other.org/") == 0
+    assert limiter.reserve("http://127.0.0.1:8000/a") == 0 and limiter.state("http://127.0.0.1:8000/a") is None
+
+def test_rate_increases_additively_and_decreases_multiplicatively(limiter):
+    for _ in range(5):
+        limiter.record(URL, 200, 0.3)
+    assert limiter.state(URL)["rate"] == pytest.approx(1.5)
+    # Slow or non-2xx responses leave the rate alone
+    limiter.record(URL, 200, 10.0)
+    limiter.record(URL, 404, 0.1)
+    assert limiter.state(URL)["rate"] == pytest.approx(1.5)
+
+    limiter.record(URL, 429, 0.1)
+    assert limiter.state(URL)["rate"] == pytest.approx(0.75)
+    limiter.record(URL, 200, 0.5, blocked=True)
+    assert limiter.state(URL)["rate"] == pytest.approx(0.375)
+    assert limiter.state(URL)["tokens"] <= 0
+
+def test_retry_after_blocks_domain(limiter):
+    limiter.record(URL, 503, 0.1, retry_after=30)
+    assert limiter.reserve(URL) > 29
+    assert limiter.state(URL)["blocked_until"] > time.time() + 29
+
+def test_rate_bounds_per_domain(limiter):
+    for _ in range(20):
+        limiter.record("https://uk.indeed.com/jobs", 200, 0.1)
+    assert limiter.state("https://uk.indeed.com/jobs")["rate"] == pytest.approx(0.5)
+    for _ in range(20):
+        limiter.record(URL, 503, 0.1)
+    assert limiter.state(URL)["rate"] == pytest.approx(rate_limiter.RATE_LIMIT_MIN_RPS)
+
+def test_helpers():
+    assert domain_of("https://WWW.Indeed.com/jobs") == "indeed.com"
+    assert is_block_page('<div id="cf-chl-captcha-container"></div>')
+    assert is_block_page("<html><head><TITLE>Just a moment...</TITLE></head></html>")
+    assert is_block_page('<div id="px-captcha"></div>')
+    assert not is_block_page("<div>jobs</div>")
+    assert not is_block_page(None)
+    assert is_limited("https://www.indeed.com/jobs")
+    assert not is_limited("http://127.0.0.1:8000/jobs")
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+def test_wait_for_render_returns_once_page_settles():
+    from app.scraper_no_retry import _wait_for_render
+
+    class FakeDriver:
+        sources = ["<html>", "<html><body>", "<html><body>jobs</body></html>"]
+
+        def __init__(self):
+            self.polls = 0
+
+        def execute_script(self, script):
+            return "complete"
+
+        @property
+        def page_source(self):
+            self.polls += 1
+            return self.sources[min(self.polls, len(self.sources)) - 1]
+
+    driver = FakeDriver()
+    start = time.monotonic()
+    _wait_for_render(driver, timeout=5, poll=0.01)
+    assert time.monotonic() - start < 1
+    assert driver.polls == 4
+
+def test_browser_block_pages_are_recorded_as_throttled(limiter):
+    from app import scraper_no_retry
+
+    class FakeDriver:
+        page_source = "<html><head><title>Just a moment...</title></head></html>"
+
+        def execute_script(self, script):
+            return 403 if "navigation" in script else "complete"
+
+    assert scraper_no_retry._navigation_status(FakeDriver()) == 403
+    limiter.record(URL, 200, 0.1)
+    before = limiter.state(URL)["rate"]
+    limiter.record(URL, scraper_no_retry._navigation_status(FakeDriver()), 0.1,
+                   blocked=is_block_page(FakeDriver.page_source))
+    assert limiter.state(URL)["rate"] == pytest.approx(before * rate_limiter.RATE_LIMIT_DECREASE)
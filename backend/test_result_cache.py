@@ -0,0 +1,57 @@
+import sqlite3
+import time
+
+from app.result_cache import ResultCache, result_key
+
+def test_result_key_normalizes_url_and_includes_version():
+    key = result_key("abc", "https://Example.com/jobs/?q=python&utm_source=x", "1")
+    assert key == result_key("abc", "https://example.com/jobs?q=python", "1")
+    assert key != result_key("abc", "https://example.com/jobs?q=python", "2")
+    assert key != result_key("abd", "https://example.com/jobs?q=python", "1")
+
+def test_in_flight_then_completed_results_are_reused(tmp_path):
+    path = str(tmp_path / "result_cache.sqlite3")
+    cache = ResultCache(path=path, ttl=60)
+    assert cache.lookup("k") is None
+
+    assert cache.begin("k", "task-1") == "task-1"
+    assert cache.lookup("k") == "task-1"
+    cache.finish("k", "task-1", completed=True)
+    assert cache.lookup("k") == "task-1"
+
+    # Running and completed tasks are seen by every worker, and a second worker starting the
+    # same request is pointed to the running task
+    cache.begin("other", "task-2")
+    other_worker = ResultCache(path=path, ttl=60)
+    assert other_worker.lookup("k") == "task-1"
+    assert other_worker.lookup("other") == "task-2"
+    assert other_worker.begin("other", "task-3") == "task-2"
+
+    # An entry pointing to another task than the one found stale is kept
+    other_worker.invalidate("k", "task-9")
+    assert cache.lookup("k") == "task-1"
+    other_worker.invalidate("k", "task-1")
+    assert cache.lookup("k") is None
+
+def _age(path, seconds):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE results SET updated = ?", (time.time() - seconds,))
+    conn.close()
+
+def test_failed_and_expired_results_are_not_reused(tmp_path):
+    path = str(tmp_path / "result_cache.sqlite3")
+    cache = ResultCache(path=path, ttl=60, max_run_seconds=600)
+    cache.begin("k", "task-1")
+    cache.finish("k", "task-1", completed=False)
+    assert cache.lookup("k") is None
+
+    cache.finish("k", "task-2", completed=True)
+    _age(path, 61)
+    assert cache.lookup("k") is None
+
+    # A task whose worker crashed is not waited for forever
+    cache.begin("k", "task-3")
+    _age(path, 601)
+    assert cache.lookup("k") is None
+    assert cache.begin("k", "task-4") == "task-4"
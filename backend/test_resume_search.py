@@ -0,0 +1,75 @@
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.ann_index import VectorIndex
+from app.resume_store import ResumeStore, resume_text_hash
+from app.matcher import extract_structured_resume
+
+def test_vector_index_matches_exhaustive_search():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16))
+    index = VectorIndex()
+    index.add(list(range(200)), vectors)
+    query = rng.normal(size=16)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = list(np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5])
+    assert [item_id for item_id, _ in index.search(query, 5)] == expected
+
+    # Replacing and removing ids keeps the index consistent
+    index.add([expected[0]], -vectors[expected[0]:expected[0] + 1])
+    index.remove([expected[1]])
+    hits = [item_id for item_id, _ in index.search(query, 3)]
+    assert expected[0] not in hits and expected[1] not in hits
+    assert len(index) == 199
+
+def test_resume_store_search_and_reload(tmp_path):
+    path = str(tmp_path / "resumes.sqlite3")
+    store = ResumeStore(path=path, legacy_file=None)
+    resumes = [
+        "Junior Python developer, new grad, Flask and SQL projects",
+        "Senior Java architect with 12 years of distributed systems experience",
+    ]
+    for i, text in enumerate(resumes):
+        store.add(resume_text_hash(text), text, extract_structured_resume(text), np.eye(4)[i], {"filename": f"resume_{i}.pdf"})
+
+    reloaded = ResumeStore(path=path, legacy_file=None)
+    assert len(reloaded.index) == 2
+    assert np.allclose(reloaded.get_embedding(resume_text_hash(resumes[1])), np.eye(4)[1])
+
+    results = reloaded.index.search(np.eye(4)[1], 1)
+    assert results[0][0] == resume_text_hash(resumes[1])
+
+def test_resume_store_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "resumes.sqlite3")
+    worker_a = ResumeStore(path=path, legacy_file=None)
+    worker_b = ResumeStore(path=path, legacy_file=None)
+    text = "Data engineer with Spark and Airflow"
+    resume_hash = resume_text_hash(text)
+    worker_a.add(resume_hash, text, extract_structured_resume(text), np.ones(4), {"file_sha256": "abc"})
+
+    # Another worker sees the upload, by resume hash and by uploaded file hash
+    assert worker_b.find_by_file_hash("abc") == resume_hash
+    assert worker_b.get(resume_hash)["text"] == text
+    assert np.allclose(worker_b.get_embedding(resume_hash), np.ones(4) / 2)
+
+    # Re-adding the resume from a different file moves the file hash mapping
+    worker_b.add(resume_hash, text, extract_structured_resume(text), np.ones(4), {"file_sha256": "def"})
+    assert worker_a.find_by_file_hash("def") == resume_hash
+    assert worker_a.find_by_file_hash("abc") is None
+
+def test_resume_store_imports_legacy_json(tmp_path):
+    import json
+    legacy_file = tmp_path / "resume_store.json"
+    text = "Frontend developer with React"
+    legacy_file.write_text(json.dumps({
+        "h1": {"text": text, "data": extract_structured_resume(text), "has_embedding": True, "file_sha256": "f1"}
+    }))
+    np.save(tmp_path / "resume_store_embeddings.npy", np.eye(4)[:1])
+    store = ResumeStore(path=str(tmp_path / "resumes.sqlite3"), legacy_file=str(legacy_file))
+    assert store.find_by_file_hash("f1") == "h1"
+    assert np.allclose(store.get_embedding("h1"), np.eye(4)[0])
@@ -0,0 +1,124 @@
+import sys
+import os
+import time
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.saved_searches import SavedSearchStore, apply_filters
+
+def test_apply_filters():
+    jobs = [
+        {"title": "Python Engineer", "description": "Django APIs", "location": "Remote"},
+        {"title": "Java Engineer", "description": "Spring", "location": "Austin, TX"},
+        {"title": "Senior Python Manager", "description": "People management", "location": "Remote"},
+    ]
+    assert len(apply_filters(jobs, {})) == 3
+    filtered = apply_filters(jobs, {"keywords": ["python"], "exclude_keywords": ["manager"], "location": "remote"})
+    assert [job["title"] for job in filtered] == ["Python Engineer"]
+
+def test_saved_search_runs_and_deltas(tmp_path):
+    path = str(tmp_path / "saved_searches.sqlite3")
+    store = SavedSearchStore(path, legacy_file=None)
+    store.add("s1", "hash1", ["https://example.com/jobs"], {"min_score": 0.5}, interval_minutes=60)
+    assert store.due() == ["s1"]
+
+    seen = {"https://example.com/jobs": {"https://example.com/jobs/1": "abc"}}
+    delta = store.record_run("s1", seen, [{"title": "Python Engineer", "match_score": 0.8}])
+    assert delta["matches"][0]["title"] == "Python Engineer"
+    assert store.due() == []
+    assert store.due(now=time.time() + 3601) == ["s1"]
+
+    # Runs without new matches don't add deltas
+    assert store.record_run("s1", seen, []) is None
+    # Another worker's store sees the runs recorded by this one
+    reloaded = SavedSearchStore(path, legacy_file=None)
+    assert reloaded.get("s1")["seen"] == seen
+    assert len(reloaded.deltas("s1")) == 1
+    assert reloaded.deltas("s1", since=delta["run_at"]) == []
+    assert reloaded.delete("s1") and not reloaded.get("s1")
+
+def test_a_claimed_search_is_run_once(tmp_path):
+    path = str(tmp_path / "saved_searches.sqlite3")
+    store = SavedSearchStore(path, legacy_file=None)
+    other_worker = SavedSearchStore(path, legacy_file=None)
+    store.add("s1", "hash1", ["https://example.com/jobs"], interval_minutes=60)
+
+    claimed = store.claim("s1")
+    assert claimed["id"] == "s1" and store.running("s1")
+    # Neither the scheduler nor another worker can start it while the run holds the claim
+    assert other_worker.due() == [] and other_worker.claim("s1") is None
+    store.record_run("s1", {"https://example.com/jobs": {"k": "h"}}, [])
+    assert not other_worker.running("s1")
+    assert other_worker.claim("s1")["seen"] == {"https://example.com/jobs": {"k": "h"}}
+
+    # A claim lost with a crashed worker expires
+    expiring = SavedSearchStore(path, legacy_file=None, claim_seconds=-1)
+    expiring.add("s2", "hash1", ["https://example.com/jobs"])
+    assert expiring.claim("s2") and expiring.claim("s2")
+
+def test_legacy_json_store_is_imported(tmp_path):
+    import json
+    legacy_file = tmp_path / "saved_searches.json"
+    legacy = SavedSearchStore(str(tmp_path / "old.sqlite3"), legacy_file=None)
+    search = legacy.add("s1", "hash1", ["https://example.com/jobs"], interval_minutes=60)
+    legacy_file.write_text(json.dumps({"s1": search}))
+
+    store = SavedSearchStore(str(tmp_path / "saved_searches.sqlite3"), legacy_file=str(legacy_file))
+    assert store.get("s1")["job_urls"] == ["https://example.com/jobs"]
+    assert store.due() == ["s1"]
+
+def test_webhook_urls_must_be_public(monkeypatch):
+    import socket
+    from app.utils import is_public_url
+
+    resolved = {"hooks.example.com": "93.184.216.34", "intranet.example.com": "10.0.0.5"}
+    monkeypatch.setattr(socket, "getaddrinfo", lambda host, *args, **kwargs: [
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", (resolved.get(host, host), 443))
+    ])
+    assert is_public_url("https://hooks.example.com/notify")
+    assert not is_public_url("https://intranet.example.com/notify")
+    assert not is_public_url("http://127.0.0.1:8000/admin")
+    assert not is_public_url("http://169.254.169.254/latest/meta-data")
+    assert not is_public_url("ftp://hooks.example.com/notify")
+    assert not is_public_url("file:///etc/passwd")
+
+def test_listings_are_seen_only_once_scored(tmp_path, monkeypatch):
+    import types
+    import numpy as np
+    import app.main as main
+    from app.feature_store import JobFeatureStore
+    from app.matcher import extract_structured_resume
+    from app.resume_store import ResumeStore
+
+    resume = "Python developer with Django and SQL experience"
+    resume_store = ResumeStore(path=str(tmp_path / "resumes.sqlite3"), legacy_file=None)
+    resume_store.add("r1", resume, extract_structured_resume(resume), np.ones(4))
+    store = SavedSearchStore(str(tmp_path / "saved_searches.sqlite3"), legacy_file=None)
+    store.add("s1", "r1", ["https://example.com/jobs"], {}, interval_minutes=60)
+    job = {"title": "Python Developer", "description": "Django and SQL", "url": "https://example.com/jobs/1"}
+    embeddings = [np.array([])]
+
+    monkeypatch.setattr(main, "saved_searches", store)
+    monkeypatch.setattr(main, "resume_store", resume_store)
+    monkeypatch.setattr(main, "feature_store", JobFeatureStore(path=str(tmp_path / "features.sqlite3")))
+    monkeypatch.setattr(main, "scrape_coordinator", types.SimpleNamespace(scrape=lambda url: [dict(job)]))
+    monkeypatch.setattr(main, "dedup_index", types.SimpleNamespace(
+        deduplicate=lambda jobs, url: [dict(j, dedup_id="d1") for j in jobs]))
+    monkeypatch.setattr(main, "record_board_scrape", lambda *args: None)
+    monkeypatch.setattr(main, "embed_board_listings", lambda *args: embeddings[0])
+
+    # A search claimed by another run is skipped without scraping
+    store.claim("s1")
+    monkeypatch.setattr(main, "scrape_coordinator", types.SimpleNamespace(scrape=lambda url: 1 / 0))
+    assert main.run_saved_search("s1") is None
+    store.record_run("s1", {}, [])
+    monkeypatch.setattr(main, "scrape_coordinator", types.SimpleNamespace(scrape=lambda url: [dict(job)]))
+
+    # Embedding failed: the listing is not marked as seen and is scored on the next run
+    assert main.run_saved_search("s1") is None
+    assert store.get("s1")["seen"] == {}
+    embeddings[0] = np.ones((1, 4))
+    delta = main.run_saved_search("s1")
+    assert [match["title"] for match in delta["matches"]] == ["Python Developer"]
+    assert store.get("s1")["seen"]
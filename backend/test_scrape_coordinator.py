@@ -0,0 +1,149 @@
+import threading
+import time
+
+from app.scrape_coordinator import ScrapeCoordinator
+
+def test_concurrent_scrapes_of_one_url_share_a_single_scrape(tmp_path):
+    calls = []
+    started = threading.Event()
+
+    def scrape(url):
+        calls.append(url)
+        started.set()
+        time.sleep(0.2)
+        return [{"title": "Engineer", "url": url + "/1"}]
+
+    coordinator = ScrapeCoordinator(scrape, lease_path=str(tmp_path / "leases.sqlite3"))
+    results = []
+
+    def run(url):
+        results.append(coordinator.scrape(url))
+
+    leader = threading.Thread(target=run, args=("https://example.com/jobs?q=python",))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=run, args=("https://EXAMPLE.com/jobs/?q=python&utm_source=x",)) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader] + followers:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1 and len(results) == 5
+    assert all(result == results[0] for result in results)
+    # Callers get their own listing dicts
+    results[0][0]["match_score"] = 1.0
+    assert "match_score" not in results[1][0]
+    assert coordinator.stats() == {"scrapes": 1, "shared": 4, "waited": 0}
+
+    # A later scrape runs again
+    coordinator.scrape("https://example.com/jobs?q=python")
+    assert len(calls) == 2
+
+def test_scrapes_with_other_options_are_not_shared():
+    calls = []
+    started = threading.Event()
+
+    def scrape(url, bypass_cache=False):
+        calls.append(bypass_cache)
+        started.set()
+        time.sleep(0.2)
+        return [{"title": "Engineer", "fresh": bypass_cache}]
+
+    coordinator = ScrapeCoordinator(scrape, lease_path=None)
+    results = {}
+    leader = threading.Thread(target=lambda: results.update(cached=coordinator.scrape("https://example.com/jobs")))
+    leader.start()
+    started.wait(timeout=5)
+    results["fresh"] = coordinator.scrape("https://example.com/jobs", bypass_cache=True)
+    leader.join(timeout=5)
+
+    assert sorted(calls) == [False, True]
+    assert results["fresh"][0]["fresh"] and not results["cached"][0]["fresh"]
+    assert coordinator.stats()["shared"] == 0
+
+def test_errors_reach_followers():
+    started = threading.Event()
+
+    def scrape(url):
+        started.set()
+        time.sleep(0.2)
+        raise RuntimeError("browser crashed")
+
+    coordinator = ScrapeCoordinator(scrape, lease_path=None)
+    errors = []
+
+    def run():
+        try:
+            coordinator.scrape("https://example.com/jobs")
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=run)]
+    threads[0].start()
+    started.wait(timeout=5)
+    threads.append(threading.Thread(target=run))
+    threads[1].start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert errors == ["browser crashed", "browser crashed"]
+
+def test_waits_for_lease_held_by_another_worker(tmp_path):
+    lease_path = str(tmp_path / "leases.sqlite3")
+    calls = []
+    other_worker = ScrapeCoordinator(lambda url: [], lease_path=lease_path)
+    coordinator = ScrapeCoordinator(lambda url: calls.append(time.monotonic()) or [], lease_path=lease_path, poll_seconds=0.05)
+
+    assert other_worker._try_lease("https://example.com/jobs")
+    threading.Timer(0.3, other_worker._release_lease, args=("https://example.com/jobs",)).start()
+    start = time.monotonic()
+    coordinator.scrape("https://example.com/jobs")
+    assert calls and calls[0] - start >= 0.25
+    assert coordinator.stats()["waited"] == 1
+
+    # An expired lease does not block
+    expired = ScrapeCoordinator(lambda url: [], lease_path=lease_path, lease_seconds=-1)
+    assert expired._try_lease("https://example.com/other")
+    coordinator.scrape("https://example.com/other")
+    assert len(calls) == 2
+
+def test_lease_is_renewed_while_scraping(tmp_path):
+    lease_path = str(tmp_path / "leases.sqlite3")
+    started = threading.Event()
+
+    def slow_scrape(url):
+        started.set()
+        time.sleep(0.8)
+        return []
+
+    leader = ScrapeCoordinator(slow_scrape, lease_path=lease_path, lease_seconds=0.3)
+    other_worker = ScrapeCoordinator(lambda url: [], lease_path=lease_path)
+    thread = threading.Thread(target=leader.scrape, args=("https://example.com/jobs",))
+    thread.start()
+    started.wait(timeout=5)
+    time.sleep(0.5)
+    # Without renewal the 0.3s lease would have expired by now
+    assert not other_worker._try_lease("https://example.com/jobs")
+    thread.join(timeout=5)
+    assert other_worker._try_lease("https://example.com/jobs")
+
+def test_other_workers_get_the_published_outcome(tmp_path):
+    lease_path = str(tmp_path / "leases.sqlite3")
+    started = threading.Event()
+    follower_calls = []
+
+    def empty_board(url):
+        started.set()
+        time.sleep(0.3)
+        return []
+
+    leader = ScrapeCoordinator(empty_board, lease_path=lease_path)
+    follower = ScrapeCoordinator(lambda url: follower_calls.append(url) or [{"title": "stale"}],
+                                 lease_path=lease_path, poll_seconds=0.05)
+    thread = threading.Thread(target=leader.scrape, args=("https://example.com/jobs",))
+    thread.start()
+    started.wait(timeout=5)
+    # An empty result is an outcome too: the follower does not scrape again
+    assert follower.scrape("https://example.com/jobs") == []
+    thread.join(timeout=5)
+    assert follower_calls == []
+    assert follower.stats() == {"scrapes": 0, "shared": 0, "waited": 1}
@@ -0,0 +1,26 @@
+import json
+
+from app.task_storage import TaskStorage
+
+def test_tasks_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / "tasks.sqlite3")
+    tasks = TaskStorage(path, legacy_file=None)
+    other_worker = TaskStorage(path, legacy_file=None)
+
+    tasks.add("t1", {"status": "processing", "results": None})
+    assert "t1" in other_worker and other_worker["t1"]["status"] == "processing"
+
+    task_data = other_worker["t1"]
+    task_data["status"] = "completed"
+    other_worker.add("t1", task_data)
+    assert tasks["t1"]["status"] == "completed"
+    assert len(tasks) == 1 and dict(tasks.items()) == {"t1": task_data}
+
+    assert tasks.get("missing") is None and "missing" not in tasks
+    assert other_worker.delete("t1") and "t1" not in tasks
+
+def test_legacy_json_store_is_imported(tmp_path):
+    legacy_file = tmp_path / "task_storage.json"
+    legacy_file.write_text(json.dumps({"t1": {"status": "completed"}}))
+    tasks = TaskStorage(str(tmp_path / "tasks.sqlite3"), legacy_file=str(legacy_file))
+    assert tasks["t1"] == {"status": "completed"}
@@ -0,0 +1,72 @@
+import io
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.upload_store import save_upload, find_upload, UploadTooLargeError, RequestSizeLimitMiddleware
+
+class FakeUpload:
+    """Minimal stand-in for an UploadFile: a filename and an async read(size)"""
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.file = io.BytesIO(data)
+
+    async def read(self, size=-1):
+        return self.file.read(size)
+
+def test_upload_is_hashed_and_stored_once():
+    data = b"%PDF-1.4 resume " * 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        first = asyncio.run(save_upload(FakeUpload("CV.PDF", data), Path(tmp), chunk_size=1024))
+        second = asyncio.run(save_upload(FakeUpload("copy.pdf", data), Path(tmp), chunk_size=1024))
+
+        assert first["sha256"] == hashlib.sha256(data).hexdigest()
+        assert first["size"] == len(data)
+        assert Path(first["path"]).name == f"{first['sha256']}.pdf"
+        assert Path(first["path"]).read_bytes() == data
+        assert not first["duplicate"] and second["duplicate"]
+        assert second["path"] == first["path"]
+        assert [p.name for p in Path(tmp).iterdir()] == [Path(first["path"]).name]
+        assert find_upload(Path(tmp), first["sha256"]) == Path(first["path"])
+
+def test_oversized_upload_is_rejected_without_leftovers():
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(UploadTooLargeError):
+            asyncio.run(save_upload(FakeUpload("big.pdf", b"x" * 5000), Path(tmp), max_bytes=4096, chunk_size=1024))
+        assert list(Path(tmp).iterdir()) == []
+
+def test_find_upload_rejects_paths():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert find_upload(Path(tmp), "../secret") is None
+        assert find_upload(Path(tmp), "") is None
+        assert find_upload(Path(tmp), "missing") is None
+
+def test_oversized_request_is_rejected_while_received():
+    from fastapi import FastAPI, File, UploadFile
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, limits={"/upload": 1000})
+    received = []
+
+    @app.post("/upload")
+    async def upload(resume: UploadFile = File(...)):
+        received.append(await resume.read())
+        return {"size": len(received[-1])}
+
+    client = TestClient(app)
+    assert client.post("/upload", files={"resume": ("cv.pdf", b"x" * 500)}).json() == {"size": 500}
+    assert client.post("/upload", files={"resume": ("cv.pdf", b"x" * 5000)}).status_code == 413
+
+    # Without a Content-Length the body is counted as it arrives
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 500
+
+    response = client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert len(received) == 1